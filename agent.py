@@ -1,21 +1,39 @@
 ﻿from __future__ import annotations
 
 # LangChain Agent 3종(프롬프트 빌더/본문 작성/댓글 작성)을 구성하고 실행합니다.
+import asyncio
+import concurrent.futures
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Generator, Iterator, Optional
 
 from langchain.agents import create_agent
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk
 from langchain_core.tools import tool
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from config import AppConfig, TEST_STYLE_FILES
+from context_cache import ContextCacheStats
+from llm_cache import ResponseCache, get_response_cache, response_key
+from metrics import Span, get_tracer
+from progress import ProgressLog, emit_progress, progress_emitter, progress_listener
+from rate_limit import GeminiScheduler, get_gemini_scheduler
 from prompt import (
     BLOG_WRITER_SYSTEM,
     COMMENT_WRITER_SYSTEM,
     PROMPT_BUILDER_SYSTEM,
     BlogInput,
+    FactsCompaction,
+    compact_user_facts,
     format_user_facts,
 )
+from text_budget import estimate_tokens
 
 
 def _read_style_corpus(paths: list[Path]) -> str:
@@ -31,6 +49,19 @@ def _read_style_corpus(paths: list[Path]) -> str:
     return "\n\n".join(chunks)
 
 
+def build_style_prefix(style_corpus: str) -> str:
+    """문체 레퍼런스를 시스템 컨텍스트 맨 앞에 둘 고정 prefix로 만듭니다.
+
+    prefix가 요청마다 바이트 단위로 같아야 provider 캐시에 적중하므로, 가변 내용은 넣지 않습니다.
+    """
+    return (
+        "[문체 레퍼런스]\n"
+        "아래는 작성 문체를 맞추기 위한 참고 글이다. 내용(사실)은 가져오지 말고 말투, 문장 길이, 구성만 참고한다.\n\n"
+        f"{style_corpus}\n"
+        "[/문체 레퍼런스]\n\n"
+    )
+
+
 def _content_to_text(content: Any) -> str:
     """LangChain 메시지 content를 문자열로 정규화합니다."""
     if isinstance(content, str):
@@ -58,15 +89,195 @@ def _extract_text_from_state(state: Dict[str, Any]) -> str:
     return ""
 
 
+def _record_usage(span: Span, usage: Optional[dict[str, Any]]) -> None:
+    if usage:
+        span.add("input_tokens", int(usage.get("input_tokens") or 0))
+        span.add("output_tokens", int(usage.get("output_tokens") or 0))
+
+
+def _request_tokens(request: Any) -> int:
+    parts = [getattr(request.system_message, "content", "") or ""] if request.system_message else []
+    for msg in request.messages:
+        content = getattr(msg, "content", "")
+        parts.append(content if isinstance(content, str) else str(content))
+    return estimate_tokens("\n".join(str(p) for p in parts))
+
+
+def _response_tokens(response: Any) -> Optional[int]:
+    messages = getattr(response, "result", None) or ([response] if hasattr(response, "usage_metadata") else [])
+    total = 0
+    found = False
+    for msg in messages:
+        usage = getattr(msg, "usage_metadata", None)
+        if usage:
+            total += int(usage.get("total_tokens") or 0)
+            found = True
+    return total if found else None
+
+
+class SchedulerMiddleware(AgentMiddleware):
+    """create_agent의 모든 모델 호출을 GeminiScheduler를 거쳐 실행하는 미들웨어입니다.
+
+    rate_limit은 LangChain 없이 가져올 수 있도록(앱 첫 화면이 가볍도록) 연결부는 여기에 둡니다.
+    """
+
+    def __init__(self, scheduler: GeminiScheduler) -> None:
+        super().__init__()
+        self.scheduler = scheduler
+
+    def wrap_model_call(self, request, handler):
+        return self.scheduler.call(lambda: handler(request), tokens=_request_tokens(request), usage=_response_tokens)
+
+    async def awrap_model_call(self, request, handler):
+        return await self.scheduler.acall(
+            lambda: handler(request), tokens=_request_tokens(request), usage=_response_tokens
+        )
+
+
+class ProgressMiddleware(AgentMiddleware):
+    """Agent의 모델 호출(agent_step)과 도구 호출(tool_call)을 진행 이벤트로 내보내는 미들웨어입니다.
+
+    파이프라인은 세션 간에 공유되므로 listener는 호출 시점의 컨텍스트에서 찾습니다.
+    """
+
+    def __init__(self, agent_name: str) -> None:
+        super().__init__()
+        self.agent_name = agent_name
+
+    def wrap_model_call(self, request, handler):
+        emit_progress(self.agent_name, "agent_step")
+        return handler(request)
+
+    async def awrap_model_call(self, request, handler):
+        emit_progress(self.agent_name, "agent_step")
+        return await handler(request)
+
+    def wrap_tool_call(self, request, handler):
+        emit_progress(self.agent_name, "tool_call", request.tool_call["name"])
+        return handler(request)
+
+    async def awrap_tool_call(self, request, handler):
+        emit_progress(self.agent_name, "tool_call", request.tool_call["name"])
+        return await handler(request)
+
+
+# 도구 호출 앞에 붙는 텍스트는 "먼저 확인하겠습니다" 같은 한 줄이므로, 이보다 길어지거나 줄이 바뀐 메시지는 답변으로 봅니다.
+_PREAMBLE_MAX_CHARS = 120
+
+
+def _stream_agent_text(
+    agent: Any,
+    content: str,
+    stats: Optional[ContextCacheStats] = None,
+    span: Optional[Span] = None,
+    *,
+    hold_messages: bool = True,
+) -> Generator[str, None, str]:
+    """Agent를 stream_mode=["messages", "values"]로 실행하며 최종 답변 텍스트 조각을 yield하고,
+    마지막 상태의 AI 메시지 텍스트를 반환합니다(_extract_text_from_state와 같은 값).
+
+    모델은 도구 호출과 같은 메시지에 텍스트("먼저 확인하겠습니다" 등)를 붙일 수 있으므로,
+    hold_messages=True(도구가 연결된 Agent)이면 메시지 텍스트가 아직 그런 머리말일 수 있는 동안
+    (한 줄이고 _PREAMBLE_MAX_CHARS 미만)만 모아 둡니다. 그사이 도구 호출 조각이 오면 모은 텍스트를 버리고,
+    줄이 바뀌거나 길어지면 답변으로 보고 모은 텍스트를 내보낸 뒤 이후 조각은 도착하는 대로 내보냅니다.
+    짧은 답변은 모델 호출이 끝난 상태에서 도구 호출이 없을 때 내보냅니다.
+    반환값(캐시에 저장되는 값)은 항상 마지막 상태에서 읽으므로, 드물게 긴 머리말 뒤에 도구 호출이 와도 결과에는 섞이지 않습니다.
+    도구가 없는 Agent는 도구 호출을 낼 수 없으므로 조각을 도착하는 대로 내보냅니다.
+    내보내는 조각마다 tokens 진행 이벤트(글자수)를 보냅니다.
+    """
+    emit = progress_emitter(agent.name)
+    message_ids: set[str] = set()
+    pending: list[str] = []
+    # 답변으로 판단해 조각을 바로 내보내는 중인 메시지 id
+    answering: set[str] = set()
+    state: Dict[str, Any] = {}
+    started = time.perf_counter()
+    first_chunk = True
+
+    def release(text: str) -> str:
+        nonlocal first_chunk
+        if first_chunk and span is not None:
+            span.set(first_token_ms=round((time.perf_counter() - started) * 1000, 1))
+        first_chunk = False
+        emit("tokens", chars=len(text))
+        return text
+
+    for mode, payload in agent.stream(
+        {"messages": [{"role": "user", "content": content}]}, stream_mode=["messages", "values"]
+    ):
+        if mode == "values":
+            state = payload
+            last = (payload.get("messages") or [None])[-1]
+            if pending and getattr(last, "type", "") == "ai":
+                # 모델 호출 하나가 끝났습니다. 도구 호출이 붙었으면 모은 텍스트는 답변이 아닙니다.
+                if not getattr(last, "tool_calls", None):
+                    yield release("".join(pending))
+                pending.clear()
+            continue
+        chunk, _metadata = payload
+        if not isinstance(chunk, AIMessageChunk):
+            continue
+        if stats is not None:
+            stats.record_usage(chunk.usage_metadata)
+        if span is not None:
+            _record_usage(span, chunk.usage_metadata)
+            if chunk.id and chunk.id not in message_ids:
+                message_ids.add(chunk.id)
+                span.add("agent_steps", 1)
+            # 도구 호출은 이름이 실린 첫 조각에서만 셉니다.
+            span.add("tool_calls", sum(1 for tc in chunk.tool_call_chunks if tc.get("name")))
+        if chunk.tool_call_chunks:
+            pending.clear()
+            continue
+        text = chunk.text
+        if not text:
+            continue
+        if not hold_messages or chunk.id in answering:
+            yield release(text)
+            continue
+        pending.append(text)
+        held = "".join(pending)
+        if "\n" in held.strip() or len(held) >= _PREAMBLE_MAX_CHARS:
+            # 머리말로 보기에는 길어졌으므로 답변입니다. 같은 메시지의 나머지 조각은 모으지 않습니다.
+            if chunk.id:
+                answering.add(chunk.id)
+            pending.clear()
+            yield release(held)
+    return _extract_text_from_state(state)
+
+
 class BlogAgentPipeline:
-    def __init__(self, config: AppConfig) -> None:
+    """프롬프트 빌더/본문 작성/댓글 작성 Agent를 묶은 파이프라인입니다.
+
+    요청별 상태를 두지 않으므로(Agent는 체크포인터 없이 매 호출마다 새 메시지로 실행, 캐시 통계는 락으로 보호)
+    여러 세션/스레드에서 같은 인스턴스를 공유해도 안전합니다. 공유 인스턴스는 get_pipeline으로 얻습니다.
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        *,
+        llm: Optional[BaseChatModel] = None,
+        response_cache: Optional[ResponseCache] = None,
+        scheduler: Optional[GeminiScheduler] = None,
+    ) -> None:
         self.config = config
-        self.llm = ChatGoogleGenerativeAI(
+        self.response_cache = response_cache or get_response_cache()
+        # 모든 모델 호출은 프로세스 전역 스케줄러(RPM/TPM, 재시도, 세션별 공정성)를 거칩니다.
+        self.scheduler = scheduler or get_gemini_scheduler()
+        # Agent 이름 -> (시스템 프롬프트, 도구 구성). 응답 캐시 키에 쓰입니다.
+        self._agent_specs: dict[str, dict[str, Any]] = {}
+        # llm을 주입하면(오프라인 벤치마크의 가짜 모델 등) Gemini 클라이언트를 만들지 않습니다.
+        self.llm = llm or ChatGoogleGenerativeAI(
             model=config.google_model,
             google_api_key=config.google_api_key,
             temperature=config.temperature,
+            # 429 재시도는 스케줄러가 맡아 동시성 조정에 반영하므로 클라이언트 자체 재시도는 끕니다(시도 1회).
+            max_retries=1,
         )
         self.style_corpus = _read_style_corpus(TEST_STYLE_FILES)
+        self.style_prefix = build_style_prefix(self.style_corpus)
+        self.context_cache = ContextCacheStats()
 
         self.style_tool = self._build_style_tool()
         self.format_guard_tool = self._build_format_guard_tool()
@@ -95,89 +306,465 @@ class BlogAgentPipeline:
 
         return format_guard
 
-    def _build_prompt_builder_agent(self):
+    def _style_agent_options(self, system_prompt: str) -> dict[str, Any]:
+        """문체 레퍼런스를 쓰는 Agent의 tools/system_prompt를 style_mode에 맞게 구성합니다.
+
+        context 모드에서는 레퍼런스를 시스템 컨텍스트의 고정 prefix로 넣어 도구 호출 왕복을 없애고,
+        프롬프트 빌더/본문 작성 Agent가 같은 prefix를 공유해 provider 캐시에 적중하도록 합니다.
+        """
+        if self.config.style_mode == "tool":
+            return {"tools": [self.style_tool], "system_prompt": system_prompt}
+        return {"tools": [], "system_prompt": self.style_prefix + system_prompt}
+
+    def _tool_signature(self, t: Any) -> dict[str, str]:
+        signature = {"name": t.name, "description": t.description}
+        if t is self.style_tool:
+            # 도구 결과(코퍼스)가 바뀌면 응답도 달라지므로 내용 해시를 포함합니다.
+            signature["content"] = hashlib.sha256(self.style_corpus.encode("utf-8")).hexdigest()[:16]
+        return signature
+
+    def _create_agent(self, name: str, *, tools: list[Any], system_prompt: str):
+        self._agent_specs[name] = {
+            "system_prompt": system_prompt,
+            "tools": [self._tool_signature(t) for t in tools],
+        }
         return create_agent(
             model=self.llm,
-            tools=[self.style_tool],
-            system_prompt=PROMPT_BUILDER_SYSTEM,
-            name="prompt_builder_agent",
+            tools=tools,
+            system_prompt=system_prompt,
+            middleware=[SchedulerMiddleware(self.scheduler), ProgressMiddleware(name)],
+            name=name,
         )
 
+    def _build_prompt_builder_agent(self):
+        return self._create_agent("prompt_builder_agent", **self._style_agent_options(PROMPT_BUILDER_SYSTEM))
+
     def _build_blog_writer_agent(self):
-        return create_agent(
-            model=self.llm,
-            tools=[self.style_tool],
-            system_prompt=BLOG_WRITER_SYSTEM,
-            name="blog_writer_agent",
-        )
+        return self._create_agent("blog_writer_agent", **self._style_agent_options(BLOG_WRITER_SYSTEM))
 
     def _build_comment_writer_agent(self):
-        return create_agent(
-            model=self.llm,
-            tools=[self.format_guard_tool],
-            system_prompt=COMMENT_WRITER_SYSTEM,
-            name="comment_writer_agent",
-        )
-
-    def build_user_prompt(self, user_input: BlogInput) -> str:
-        """1단계: 사용자 메모를 전문 작성용 프롬프트로 변환합니다."""
-        facts = format_user_facts(user_input)
-        prompt_state = self.prompt_builder.invoke(
-            {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": (
-                            "다음 사용자 메모를 바탕으로, 블로그 본문이 아닌 '작성용 프롬프트'만 작성해라.\n\n"
-                            f"{facts}\n\n"
-                            "출력은 프롬프트 원문만 제공하고, 블로그 본문/예시 문단은 쓰지 마라."
-                        ),
-                    }
-                ]
-            }
-        )
-        return _extract_text_from_state(prompt_state)
-
-    def write_blog(self, final_prompt: str) -> str:
+        return self._create_agent(
+            "comment_writer_agent", tools=[self.format_guard_tool], system_prompt=COMMENT_WRITER_SYSTEM
+        )
+
+    def _prompt_builder_request(
+        self, user_input: BlogInput, on_facts: Optional[Callable[[FactsCompaction], None]] = None
+    ) -> str:
+        payload, compaction = compact_user_facts(user_input, max_tokens=self.config.facts_token_budget)
+        if on_facts is not None:
+            on_facts(compaction)
+        facts = format_user_facts(payload)
+        return (
+            "다음 사용자 메모를 바탕으로, 블로그 본문이 아닌 '작성용 프롬프트'만 작성해라.\n\n"
+            f"{facts}\n\n"
+            "출력은 프롬프트 원문만 제공하고, 블로그 본문/예시 문단은 쓰지 마라."
+        )
+
+    @staticmethod
+    def _blog_writer_request(final_prompt: str, tone: Optional[str] = None) -> str:
+        # 톤 지시는 프롬프트 뒤에 붙여, 같은 1단계 프롬프트로 톤만 바꾼 초안을 만들 수 있게 합니다.
+        tone_line = f"글 톤은 '{tone}'으로 작성하고, 프롬프트의 톤 지시와 다르면 이 지시를 따른다.\n" if tone else ""
+        return (
+            "아래 프롬프트를 기준으로 고품질 블로그 본문을 Markdown으로 작성해라.\n\n"
+            f"{final_prompt}\n\n"
+            f"{tone_line}"
+            "최종 블로그 본문만 출력해라."
+        )
+
+    @staticmethod
+    def _comment_writer_request(blog_markdown: str) -> str:
+        return (
+            "다음 블로그 글을 읽고 자연스러운 댓글 5개를 생성해라.\n\n"
+            f"{blog_markdown}"
+        )
+
+    def _cache_key(self, agent: Any, content: str) -> str:
+        spec = self._agent_specs[agent.name]
+        return response_key(
+            model=self.config.google_model,
+            temperature=self.config.temperature,
+            system_prompt=spec["system_prompt"],
+            tools=spec["tools"],
+            user_message=content,
+        )
+
+    def _span(self, agent: Any, *, stream: bool = False):
+        return get_tracer().span(
+            "llm",
+            activate=not stream,
+            stage=agent.name,
+            model=self.config.google_model,
+            style_mode=self.config.style_mode,
+            stream=stream,
+        )
+
+    @contextmanager
+    def _stage_progress(self, agent: Any) -> Iterator[Callable[..., None]]:
+        """stage_started/stage_finished(elapsed_ms) 진행 이벤트로 Agent 실행 하나를 감쌉니다."""
+        emit = progress_emitter(agent.name)
+        emit("stage_started")
+        started = time.perf_counter()
+        try:
+            yield emit
+        finally:
+            emit("stage_finished", elapsed_ms=round((time.perf_counter() - started) * 1000))
+
+    def _record_state(self, span: Span, state: Dict[str, Any]) -> None:
+        """Agent 결과 state의 AI 메시지로 토큰/단계 수/도구 호출 수를 기록합니다."""
+        for msg in state.get("messages", []):
+            if getattr(msg, "type", "") != "ai":
+                continue
+            usage = getattr(msg, "usage_metadata", None)
+            self.context_cache.record_usage(usage)
+            _record_usage(span, usage)
+            span.add("agent_steps", 1)
+            span.add("tool_calls", len(getattr(msg, "tool_calls", None) or []))
+
+    def _invoke(self, agent: Any, content: str, *, styled: bool, use_cache: bool) -> str:
+        with self._span(agent) as span, self._stage_progress(agent) as emit:
+            key = self._cache_key(agent, content)
+            if use_cache:
+                cached = self.response_cache.get(key)
+                span.set(cache_hit=cached is not None)
+                if cached is not None:
+                    emit("cache_hit", chars=len(cached))
+                    return cached
+            if styled and self.config.style_mode == "context":
+                span.set(prefix_cache_hit=self.context_cache.observe(self.style_prefix))
+            state = agent.invoke({"messages": [{"role": "user", "content": content}]})
+            self._record_state(span, state)
+            text = _extract_text_from_state(state)
+            emit("tokens", chars=len(text))
+            # 캐시를 건너뛴 호출도 결과는 저장해, 다음 같은 입력은 캐시로 응답합니다.
+            self.response_cache.put(key, text, stage=agent.name)
+            return text
+
+    async def _ainvoke(self, agent: Any, content: str, *, styled: bool, use_cache: bool) -> str:
+        """_invoke의 async 버전입니다(agent.ainvoke 사용)."""
+        with self._span(agent) as span, self._stage_progress(agent) as emit:
+            key = self._cache_key(agent, content)
+            if use_cache:
+                cached = self.response_cache.get(key)
+                span.set(cache_hit=cached is not None)
+                if cached is not None:
+                    emit("cache_hit", chars=len(cached))
+                    return cached
+            if styled and self.config.style_mode == "context":
+                span.set(prefix_cache_hit=self.context_cache.observe(self.style_prefix))
+            state = await agent.ainvoke({"messages": [{"role": "user", "content": content}]})
+            self._record_state(span, state)
+            text = _extract_text_from_state(state)
+            emit("tokens", chars=len(text))
+            self.response_cache.put(key, text, stage=agent.name)
+            return text
+
+    def _stream(self, agent: Any, content: str, *, styled: bool, use_cache: bool) -> Generator[str, None, str]:
+        """응답 조각을 yield하고 최종 답변 텍스트를 반환합니다(StopIteration.value)."""
+        with self._span(agent, stream=True) as span, self._stage_progress(agent) as emit:
+            key = self._cache_key(agent, content)
+            if use_cache:
+                cached = self.response_cache.get(key)
+                span.set(cache_hit=cached is not None)
+                if cached is not None:
+                    emit("cache_hit", chars=len(cached))
+                    yield cached
+                    return cached
+            if styled and self.config.style_mode == "context":
+                span.set(prefix_cache_hit=self.context_cache.observe(self.style_prefix))
+            text = yield from _stream_agent_text(
+                agent, content, self.context_cache, span, hold_messages=bool(self._agent_specs[agent.name]["tools"])
+            )
+            # 끝까지 받은 응답만 저장합니다(소비자가 중간에 멈추면 여기까지 오지 않음).
+            # 조각을 이어 붙이지 않고 마지막 AI 메시지를 저장해 _invoke와 같은 키에 같은 값이 들어가게 합니다.
+            self.response_cache.put(key, text, stage=agent.name)
+            return text
+
+    def build_user_prompt(self, user_input: BlogInput, *, use_cache: bool = True) -> str:
+        """1단계: 사용자 메모를 전문 작성용 프롬프트로 변환합니다.
+
+        use_cache=False이면 응답 캐시를 건너뛰고 다시 생성합니다(write_blog/write_comments 및 stream_*도 동일).
+        """
+        return self._invoke(
+            self.prompt_builder, self._prompt_builder_request(user_input), styled=True, use_cache=use_cache
+        )
+
+    def write_blog(self, final_prompt: str, *, use_cache: bool = True) -> str:
         """2단계: 생성된 프롬프트로 블로그 본문을 작성합니다."""
-        blog_state = self.blog_writer.invoke(
-            {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": (
-                            "아래 프롬프트를 기준으로 고품질 블로그 본문을 Markdown으로 작성해라.\n\n"
-                            f"{final_prompt}\n\n"
-                            "최종 블로그 본문만 출력해라."
-                        ),
-                    }
-                ]
-            }
-        )
-        return _extract_text_from_state(blog_state)
-
-    def write_comments(self, blog_markdown: str) -> str:
+        return self._invoke(self.blog_writer, self._blog_writer_request(final_prompt), styled=True, use_cache=use_cache)
+
+    def write_comments(self, blog_markdown: str, *, use_cache: bool = True) -> str:
         """3단계: 블로그 본문 기반 댓글을 생성합니다."""
-        comment_state = self.comment_writer.invoke(
-            {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": (
-                            "다음 블로그 글을 읽고 자연스러운 댓글 5개를 생성해라.\n\n"
-                            f"{blog_markdown}"
-                        ),
-                    }
-                ]
-            }
-        )
-        return _extract_text_from_state(comment_state)
-
-    def run(self, user_input: BlogInput) -> Dict[str, str]:
+        return self._invoke(
+            self.comment_writer, self._comment_writer_request(blog_markdown), styled=False, use_cache=use_cache
+        )
+
+    def stream_user_prompt(
+        self,
+        user_input: BlogInput,
+        *,
+        use_cache: bool = True,
+        on_facts: Optional[Callable[[FactsCompaction], None]] = None,
+    ) -> Generator[str, None, str]:
+        """build_user_prompt의 스트리밍 버전입니다. 생성되는 텍스트 조각을 순서대로 yield하고 최종 텍스트를 반환합니다.
+
+        on_facts를 주면 입력 예산에 맞춰 수집 정보를 줄인 내역(FactsCompaction)을 요청 전에 넘겨줍니다.
+        """
+        return self._stream(
+            self.prompt_builder, self._prompt_builder_request(user_input, on_facts), styled=True, use_cache=use_cache
+        )
+
+    def stream_blog(self, final_prompt: str, *, use_cache: bool = True) -> Generator[str, None, str]:
+        """write_blog의 스트리밍 버전입니다. 캐시 적중 시 전체 본문을 한 조각으로 yield합니다."""
+        return self._stream(self.blog_writer, self._blog_writer_request(final_prompt), styled=True, use_cache=use_cache)
+
+    def stream_comments(self, blog_markdown: str, *, use_cache: bool = True) -> Generator[str, None, str]:
+        """write_comments의 스트리밍 버전입니다."""
+        return self._stream(
+            self.comment_writer, self._comment_writer_request(blog_markdown), styled=False, use_cache=use_cache
+        )
+
+    async def abuild_user_prompt(self, user_input: BlogInput, *, use_cache: bool = True) -> str:
+        return await self._ainvoke(
+            self.prompt_builder, self._prompt_builder_request(user_input), styled=True, use_cache=use_cache
+        )
+
+    async def awrite_blog(self, final_prompt: str, *, use_cache: bool = True) -> str:
+        return await self._ainvoke(
+            self.blog_writer, self._blog_writer_request(final_prompt), styled=True, use_cache=use_cache
+        )
+
+    async def awrite_blog_variants(
+        self, final_prompt: str, tones: list[str], *, use_cache: bool = True
+    ) -> tuple[Dict[str, str], Dict[str, str]]:
+        """같은 1단계 프롬프트로 톤별 본문 초안을 동시에 생성합니다.
+
+        모든 초안이 같은 문체 prefix를 공유하므로 provider 캐시도 함께 적중합니다.
+        (톤 -> 본문, 톤 -> 오류 메시지)를 반환하며, 일부 톤이 실패해도 나머지 결과는 돌려줍니다.
+        """
+        tones = list(dict.fromkeys(tones))
+        results = await asyncio.gather(
+            *(
+                self._ainvoke(
+                    self.blog_writer, self._blog_writer_request(final_prompt, tone), styled=True, use_cache=use_cache
+                )
+                for tone in tones
+            ),
+            return_exceptions=True,
+        )
+        drafts: Dict[str, str] = {}
+        errors: Dict[str, str] = {}
+        for tone, result in zip(tones, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, BaseException):
+                errors[tone] = f"{type(result).__name__}: {result}"
+            else:
+                drafts[tone] = result
+        return drafts, errors
+
+    def write_blog_variants(
+        self,
+        final_prompt: str,
+        tones: list[str],
+        *,
+        use_cache: bool = True,
+        check_cancelled: Optional[Callable[[], None]] = None,
+    ) -> tuple[Dict[str, str], Dict[str, str]]:
+        """awrite_blog_variants를 프로세스 전역 이벤트 루프(get_llm_loop)에서 실행하고 결과를 기다립니다.
+
+        호출마다 새 루프를 만들면 공유 LLM 클라이언트의 async 연결이 죽은 루프에 묶이므로 루프를 재사용합니다.
+        check_cancelled(취소 시 예외를 내는 함수)를 주면 기다리는 동안 확인하고, 예외가 나면 생성을 취소한 뒤 다시 냅니다.
+        """
+        future = submit_async(self.awrite_blog_variants(final_prompt, tones, use_cache=use_cache))
+        while True:
+            try:
+                return future.result(timeout=0.25)
+            except concurrent.futures.TimeoutError:
+                pass
+            if check_cancelled is not None:
+                try:
+                    check_cancelled()
+                except BaseException:
+                    future.cancel()
+                    raise
+
+    async def awrite_comments(self, blog_markdown: str, *, use_cache: bool = True) -> str:
+        return await self._ainvoke(
+            self.comment_writer, self._comment_writer_request(blog_markdown), styled=False, use_cache=use_cache
+        )
+
+    async def arun_fused(
+        self,
+        user_input: BlogInput,
+        *,
+        use_cache: bool = True,
+        on_stage: Optional[Callable[[str, str], None]] = None,
+    ) -> Dict[str, str]:
+        """1~3단계를 사용자 확인 없이 이어서 실행합니다.
+
+        각 단계는 앞 단계의 완성된 결과 전체를 입력으로 쓰므로(댓글은 본문 전체로 캐시 키도 만듭니다)
+        단계끼리 겹쳐 돌리지 않고 차례로 실행합니다. 줄어드는 것은 단계 사이의 사용자 확인과 화면 재실행 대기입니다.
+        on_stage(단계 이름, 결과)는 "user_prompt"/"blog_markdown"/"comments"가 끝날 때마다 호출됩니다.
+        중간에 태스크가 취소되면 진행 중인 LLM 호출도 함께 취소됩니다.
+        """
+        result: Dict[str, str] = {}
+        result["user_prompt"] = await self.abuild_user_prompt(user_input, use_cache=use_cache)
+        if on_stage is not None:
+            on_stage("user_prompt", result["user_prompt"])
+        result["blog_markdown"] = await self.awrite_blog(result["user_prompt"], use_cache=use_cache)
+        if on_stage is not None:
+            on_stage("blog_markdown", result["blog_markdown"])
+        result["comments"] = await self.awrite_comments(result["blog_markdown"], use_cache=use_cache)
+        if on_stage is not None:
+            on_stage("comments", result["comments"])
+        return result
+
+    def run(self, user_input: BlogInput, *, use_cache: bool = True) -> Dict[str, str]:
         """1~2단계만 실행합니다(댓글 제외)."""
-        final_prompt = self.build_user_prompt(user_input)
-        blog_markdown = self.write_blog(final_prompt)
+        final_prompt = self.build_user_prompt(user_input, use_cache=use_cache)
+        blog_markdown = self.write_blog(final_prompt, use_cache=use_cache)
         return {
             "user_prompt": final_prompt,
             "blog_markdown": blog_markdown,
         }
+
+
+_shared_loop: Optional[asyncio.AbstractEventLoop] = None
+_shared_loop_lock = threading.Lock()
+
+
+def get_llm_loop() -> asyncio.AbstractEventLoop:
+    """async LLM 호출을 실행하는 프로세스 전역 이벤트 루프를 반환합니다(데몬 스레드에서 계속 실행).
+
+    공유 파이프라인의 ChatGoogleGenerativeAI는 async HTTP 클라이언트를 처음 쓴 루프에 묶으므로,
+    모든 async 실행(톤별 비교, 원클릭 실행)을 이 루프 하나에서 돌립니다.
+    """
+    global _shared_loop
+    with _shared_loop_lock:
+        if _shared_loop is None:
+            _shared_loop = asyncio.new_event_loop()
+            threading.Thread(target=_shared_loop.run_forever, name="llm-loop", daemon=True).start()
+        return _shared_loop
+
+
+def submit_async(coro) -> concurrent.futures.Future:
+    """코루틴을 get_llm_loop()에서 실행합니다. 호출한 스레드의 contextvars(스케줄러 세션, 진행 listener)가 이어집니다."""
+    return asyncio.run_coroutine_threadsafe(coro, get_llm_loop())
+
+
+class FusedRun:
+    """arun_fused를 프로세스 전역 이벤트 루프(get_llm_loop)에서 실행하고, 단계별 결과를 다른 스레드(Streamlit)에 공유합니다.
+
+    Streamlit 스크립트는 위젯 조작 때마다 중단/재실행되므로, 생성 작업은 세션 상태에 보관한
+    이 객체가 계속 진행하고 화면은 실행마다 results를 확인하거나 wait()로 짧게 기다립니다. 사용자가 1단계 프롬프트를 수정하면
+    cancel()로 사용자 확인 없이 이어 가던 이후 단계(2/3단계)를 취소합니다.
+    진행 이벤트(Agent 단계, 도구 호출, 생성 글자수)는 progress(ProgressLog)에 모입니다.
+    """
+
+    STAGES = ("user_prompt", "blog_markdown", "comments")
+
+    def __init__(self, pipeline: BlogAgentPipeline, user_input: BlogInput, *, use_cache: bool = True) -> None:
+        self.results: Dict[str, str] = {}
+        self.error = ""
+        self._cond = threading.Condition()
+        self._done = False
+        self.progress = ProgressLog()
+        # 코루틴 태스크는 제출 시점의 컨텍스트를 복사하므로 listener가 이벤트 루프 스레드까지 이어집니다.
+        with progress_listener(self.progress):
+            self._future = submit_async(pipeline.arun_fused(user_input, use_cache=use_cache, on_stage=self._on_stage))
+        self._future.add_done_callback(self._on_done)
+
+    def _on_stage(self, stage: str, text: str) -> None:
+        with self._cond:
+            self.results[stage] = text
+            self._cond.notify_all()
+
+    def _on_done(self, future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            exc = future.exception()
+            self.error = f"{type(exc).__name__}: {exc}"
+        with self._cond:
+            self._done = True
+            self._cond.notify_all()
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    @property
+    def cancelled(self) -> bool:
+        return self._future.cancelled()
+
+    def result(self, stage: str) -> Optional[str]:
+        """기다리지 않고 stage 결과를 반환합니다(아직 없으면 None)."""
+        with self._cond:
+            return self.results.get(stage)
+
+    def wait(self, stage: str, timeout: Optional[float] = None) -> Optional[str]:
+        """stage 결과가 나올 때까지(또는 실행이 끝날 때까지) 기다립니다. 결과가 없으면 None."""
+        with self._cond:
+            self._cond.wait_for(lambda: stage in self.results or self._done, timeout=timeout)
+            return self.results.get(stage)
+
+    def cancel(self) -> None:
+        self._future.cancel()
+
+
+def style_corpus_fingerprint(paths: list[Path]) -> str:
+    """스타일 파일들의 (이름, 크기, 수정 시각)으로 코퍼스 버전 해시를 만듭니다.
+
+    파일을 읽지 않고 stat만 하므로 버튼을 누를 때마다 호출해도 비용이 거의 없습니다.
+    """
+    digest = hashlib.sha256()
+    for p in paths:
+        try:
+            st = p.stat()
+            digest.update(f"{p}:{st.st_size}:{st.st_mtime_ns}\n".encode("utf-8"))
+        except FileNotFoundError:
+            digest.update(f"{p}:missing\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+_PIPELINE_CACHE_SIZE = 4
+_pipelines: "OrderedDict[tuple[str, float, str, str, str], BlogAgentPipeline]" = OrderedDict()
+_pipelines_lock = threading.Lock()
+
+
+def _pipeline_key(config: AppConfig) -> tuple[str, float, str, str, str]:
+    # API 키가 다르면 클라이언트를 공유하지 않도록 키 해시도 포함합니다(원문은 보관하지 않음).
+    key_hash = hashlib.sha256(config.google_api_key.encode("utf-8")).hexdigest()[:16]
+    return (
+        config.google_model,
+        config.temperature,
+        style_corpus_fingerprint(TEST_STYLE_FILES),
+        key_hash,
+        config.style_mode,
+    )
+
+
+def get_pipeline(config: AppConfig) -> BlogAgentPipeline:
+    """(모델, temperature, 스타일 코퍼스 해시, API 키, style_mode)별로 프로세스 전역에서 공유하는 파이프라인을 반환합니다.
+
+    같은 설정이면 LLM 클라이언트와 Agent 3종을 다시 만들지 않습니다. 스타일 파일이 바뀌면 키가 달라져
+    새 파이프라인을 만들고, 캐시는 최근 사용한 _PIPELINE_CACHE_SIZE개만 유지합니다.
+    """
+    key = _pipeline_key(config)
+    with _pipelines_lock:
+        pipeline = _pipelines.get(key)
+        if pipeline is not None:
+            _pipelines.move_to_end(key)
+            return pipeline
+        pipeline = BlogAgentPipeline(config)
+        _pipelines[key] = pipeline
+        while len(_pipelines) > _PIPELINE_CACHE_SIZE:
+            _pipelines.popitem(last=False)
+        return pipeline
+
+
+def invalidate_pipelines(model: Optional[str] = None) -> int:
+    """캐시된 파이프라인을 지웁니다(model을 주면 해당 모델만). 지운 개수를 반환합니다."""
+    with _pipelines_lock:
+        keys = [k for k in _pipelines if model is None or k[0] == model]
+        for k in keys:
+            del _pipelines[k]
+        return len(keys)
@@ -2,19 +2,34 @@
 import os
 import re
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
-from agent import BlogAgentPipeline
 from config import load_config
-from naver_map import crawl_place_tabs, merge_blog_input_with_crawl
-from prompt import BlogInput
+# agent(LangChain)/naver_map(Playwright)은 처음 쓸 때 가져와 첫 화면을 가볍게 유지합니다.
+from facades import crawl_and_compact, get_pipeline, merge_blog_input_with_crawl, start_fused_run, start_warmup
+from prompt import TONES, BlogInput
+from rate_limit import set_scheduler_session
 from ui import (
+    JOB_LABELS,
+    active_job,
     apply_custom_style,
+    apply_fused_results,
+    clear_fused,
+    finished_jobs,
     init_session_state,
+    render_blog_variants,
     render_form,
-    run_blog_with_progress,
-    run_comments_with_progress,
-    run_prompt_with_progress,
+    render_job_status,
+    render_fused_status,
+    render_job_timings,
     render_sidebar,
+    start_blog_job,
+    start_comments_job,
+    start_fused,
+    start_prompt_job,
+    start_variants_job,
+    submit_job,
+    wait_for_jobs,
 )
 
 
@@ -25,10 +40,113 @@ def _count_chars(text: str) -> tuple[int, int]:
     return total, non_space
 
 
+def _apply_crawl_result(map_url: str, crawled, compaction) -> None:
+    st.session_state.crawled_removed_chars = sum(r["removed_chars"] for r in compaction.values())
+    st.session_state.crawled_place_id = crawled.place_id
+    st.session_state.crawled_home_text = crawled.home_text
+    st.session_state.crawled_menu_text = crawled.menu_text
+    st.session_state.crawled_info_text = crawled.info_text
+    st.session_state.crawled_news_text = crawled.news_text
+
+    # 자동 입력은 하지 않고, 사용자 입력용 placeholder 예시만 갱신합니다.
+    base = {
+        "map_url": map_url,
+        "place_name": "",
+        "business_hours": "",
+        "location_info": "",
+        "home_tab_info": "",
+        "menu_tab_info": "",
+        "info_tab_info": "",
+        "news_tab_info": "",
+        "parking_or_tips": "",
+        "interior_and_menu": "",
+        "signature_taste": "",
+        "tone": "정보형",
+        "target_keyword": "",
+    }
+    examples = merge_blog_input_with_crawl(base, crawled)
+    st.session_state.example_place_name = examples.get("place_name", "")
+    st.session_state.example_business_hours = examples.get("business_hours", "")
+    st.session_state.example_location_info = examples.get("location_info", "")
+    st.session_state.example_parking_or_tips = examples.get("parking_or_tips", "")
+    st.session_state.example_target_keyword = examples.get("target_keyword", "")
+    st.session_state.crawled_tab_errors = dict(crawled.tab_errors)
+
+
+_JOB_ERROR_MESSAGES = {
+    "crawl": "네이버 지도 정보 수집 실패",
+    "prompt": "실행 중 오류가 발생했습니다",
+    "blog": "블로그 생성 중 오류가 발생했습니다",
+    "comments": "댓글 생성 중 오류가 발생했습니다",
+    "variants": "톤별 비교 생성 중 오류가 발생했습니다",
+}
+
+
+def _apply_job_result(kind: str, job) -> None:
+    """끝난 작업의 결과를 세션 상태에 반영합니다. 결과가 위젯 값이므로 위젯을 그리기 전에 호출합니다."""
+    if job.status == "cancelled":
+        st.info(f"{JOB_LABELS[kind]} 작업을 취소했습니다.")
+        return
+    if job.status == "failed":
+        st.warning(f"{_JOB_ERROR_MESSAGES[kind]}: {job.error}")
+        return
+    if kind == "crawl":
+        map_url, crawled, compaction = job.result
+        _apply_crawl_result(map_url, crawled, compaction)
+        st.success(f"탭 크롤링 완료: placeId {crawled.place_id}")
+    elif kind == "prompt":
+        st.session_state.user_prompt = job.result
+        st.session_state.editable_user_prompt = job.result
+        # 재실행 후에도 보이도록 줄인 내역을 세션에 남깁니다(화면 표시는 프롬프트 결과 영역).
+        st.session_state.facts_compaction = job.get_partial("facts_compaction", "")
+    elif kind == "blog":
+        st.session_state.blog_markdown = job.result
+        st.session_state.comments = ""
+    elif kind == "comments":
+        st.session_state.comments = job.result
+    elif kind == "variants":
+        st.session_state.blog_variants, st.session_state.blog_variant_errors = job.result
+
+
+def _crawl_job(map_url: str):
+    # 크롤링은 LLM을 쓰지 않으므로 API 키 없이 예산 설정만 읽습니다.
+    tab_char_budget = load_config(require_api_key=False).tab_char_budget
+
+    def work(job):
+        job.check_cancelled()
+        # 중첩 섹션 중복/버튼 문구를 걷어내고 탭별 글자수 예산을 적용한 뒤 프롬프트 입력으로 씁니다.
+        crawled, compaction = crawl_and_compact(
+            map_url, max_chars_per_tab=tab_char_budget, check_cancelled=job.check_cancelled
+        )
+        job.check_cancelled()
+        return map_url, crawled, compaction
+
+    return work
+
+
 def main() -> None:
     st.set_page_config(page_title="블로그 자동생성 AI Agent", page_icon="📝", layout="wide")
     apply_custom_style()
     init_session_state()
+    ctx = get_script_run_ctx()
+    # 세션별로 Gemini 호출 슬롯을 공정하게 나누도록 현재 Streamlit 세션을 스케줄러에 알립니다.
+    set_scheduler_session(f"ui:{ctx.session_id}" if ctx is not None else "ui")
+
+    # 크롤링/생성은 백그라운드 작업으로 실행되므로, 끝난 작업의 결과를 위젯보다 먼저 반영합니다.
+    for kind, job in finished_jobs().items():
+        _apply_job_result(kind, job)
+
+    fused = st.session_state.fused_run
+    if fused is not None and (
+        st.session_state.fused_prompt is not None
+        and st.session_state.editable_user_prompt != st.session_state.fused_prompt
+    ):
+        # 사용자가 생성된 프롬프트를 고쳤으므로 그 프롬프트로 미리 시작한 2/3단계를 버립니다.
+        fused.cancel()
+        clear_fused()
+        st.info("프롬프트가 수정되어 원클릭 실행의 이후 단계를 취소했습니다. 2단계를 다시 실행하세요.")
+    # 원클릭 실행도 백그라운드에서 진행되므로, 끝난 단계 결과를 위젯보다 먼저 반영합니다.
+    apply_fused_results()
 
     total_chars, non_space_chars = _count_chars(st.session_state.blog_markdown)
 
@@ -45,60 +163,41 @@ def main() -> None:
         st.write("구체적인 메뉴, 위치 키워드, 체감 포인트를 넣을수록 결과 품질이 좋아집니다.")
 
     if run_crawl:
-        try:
-            if not user_input.map_url.strip():
-                st.warning("먼저 네이버 지도 URL을 입력해주세요.")
-            else:
-                crawled = crawl_place_tabs(user_input.map_url)
-                st.session_state.crawled_place_id = crawled.place_id
-                st.session_state.crawled_home_text = crawled.home_text
-                st.session_state.crawled_menu_text = crawled.menu_text
-                st.session_state.crawled_info_text = crawled.info_text
-                st.session_state.crawled_news_text = crawled.news_text
-
-                # 자동 입력은 하지 않고, 사용자 입력용 placeholder 예시만 갱신합니다.
-                base = {
-                    "map_url": user_input.map_url,
-                    "place_name": "",
-                    "business_hours": "",
-                    "location_info": "",
-                    "home_tab_info": "",
-                    "menu_tab_info": "",
-                    "info_tab_info": "",
-                    "news_tab_info": "",
-                    "parking_or_tips": "",
-                    "interior_and_menu": "",
-                    "signature_taste": "",
-                    "tone": "정보형",
-                    "target_keyword": "",
-                }
-                examples = merge_blog_input_with_crawl(base, crawled)
-                st.session_state.example_place_name = examples.get("place_name", "")
-                st.session_state.example_business_hours = examples.get("business_hours", "")
-                st.session_state.example_location_info = examples.get("location_info", "")
-                st.session_state.example_parking_or_tips = examples.get("parking_or_tips", "")
-                st.session_state.example_target_keyword = examples.get("target_keyword", "")
-                st.success(f"탭 크롤링 완료: placeId {crawled.place_id}")
-                st.rerun()
-        except Exception as map_error:
-            st.warning(f"네이버 지도 정보 수집 실패: {map_error}")
-
-    action_col1, action_col2 = st.columns(2)
+        if not user_input.map_url.strip():
+            st.warning("먼저 네이버 지도 URL을 입력해주세요.")
+        else:
+            submit_job("crawl", _crawl_job(user_input.map_url))
+
+    action_col1, action_col2, action_col3 = st.columns(3)
     with action_col1:
         run_prompt = st.button("1단계 실행 (프롬프트 생성)", type="primary", use_container_width=True)
     with action_col2:
         run_blog = st.button("2단계 실행 (블로그 생성)", use_container_width=True)
+    with action_col3:
+        run_all = st.button("원클릭 실행 (1→2→3단계)", use_container_width=True)
+    # 진행 중인 작업의 진행률/취소 버튼과 최근 실행 소요 시간은 스크립트 끝에서 이 자리에 그립니다.
+    job_status_area = st.container()
+
+    if run_all:
+        try:
+            os.environ["GOOGLE_TEMPERATURE"] = str(temperature)
+            os.environ["GOOGLE_MODEL"] = model
+            config = load_config()
+            start_fused(
+                start_fused_run(
+                    get_pipeline(config), BlogInput(**user_input.__dict__), use_cache=st.session_state.use_llm_cache
+                )
+            )
+        except Exception as e:
+            st.error(f"실행 중 오류가 발생했습니다: {e}")
 
     if run_prompt:
         try:
             os.environ["GOOGLE_TEMPERATURE"] = str(temperature)
             os.environ["GOOGLE_MODEL"] = model
             config = load_config()
-            pipeline = BlogAgentPipeline(config)
-            prompt_result = run_prompt_with_progress(pipeline, BlogInput(**user_input.__dict__))
-            st.session_state.user_prompt = prompt_result
-            st.session_state.editable_user_prompt = prompt_result
-            st.rerun()
+            pipeline = get_pipeline(config)
+            start_prompt_job(pipeline, BlogInput(**user_input.__dict__), use_cache=st.session_state.use_llm_cache)
         except Exception as e:
             st.error(f"실행 중 오류가 발생했습니다: {e}")
 
@@ -110,18 +209,48 @@ def main() -> None:
                 os.environ["GOOGLE_TEMPERATURE"] = str(temperature)
                 os.environ["GOOGLE_MODEL"] = model
                 config = load_config()
-                pipeline = BlogAgentPipeline(config)
-                st.session_state.blog_markdown = run_blog_with_progress(
-                    pipeline, st.session_state.editable_user_prompt
+                pipeline = get_pipeline(config)
+                start_blog_job(
+                    pipeline, st.session_state.editable_user_prompt, use_cache=st.session_state.use_llm_cache
                 )
-                st.session_state.comments = ""
-                st.rerun()
             except Exception as e:
                 st.error(f"블로그 생성 중 오류가 발생했습니다: {e}")
 
+    with st.expander("톤별 비교 생성 (2단계)", expanded=False):
+        variant_tones = st.multiselect("비교할 톤", list(TONES), default=list(TONES), key="variant_tones")
+        run_variants = st.button("선택한 톤으로 동시에 생성", use_container_width=True)
+
+    if run_variants:
+        if not st.session_state.editable_user_prompt.strip():
+            st.warning("먼저 1단계를 실행해 프롬프트를 생성해주세요.")
+        elif not variant_tones:
+            st.warning("비교할 톤을 하나 이상 선택해주세요.")
+        else:
+            try:
+                os.environ["GOOGLE_TEMPERATURE"] = str(temperature)
+                os.environ["GOOGLE_MODEL"] = model
+                config = load_config()
+                pipeline = get_pipeline(config)
+                start_variants_job(
+                    pipeline,
+                    st.session_state.editable_user_prompt,
+                    variant_tones,
+                    target_keyword=user_input.target_keyword,
+                    use_cache=st.session_state.use_llm_cache,
+                )
+            except Exception as e:
+                st.error(f"톤별 비교 생성 중 오류가 발생했습니다: {e}")
+
+    render_blog_variants()
+
+    placeholders = {}
     result_col1, result_col2 = st.columns(2)
     with result_col1:
         st.subheader("프롬프트 결과 (수정 가능)")
+        if st.session_state.facts_compaction:
+            st.caption(f"입력 예산 초과로 수집 정보를 줄였습니다: {st.session_state.facts_compaction}")
+        if active_job("prompt") is not None:
+            placeholders["prompt"] = st.empty()
         st.text_area(
             "2단계 실행 전 프롬프트를 직접 수정하세요.",
             key="editable_user_prompt",
@@ -130,7 +259,10 @@ def main() -> None:
         )
     with result_col2:
         st.subheader("블로그 결과")
-        if st.session_state.blog_markdown:
+        if active_job("blog") is not None:
+            placeholders["blog"] = st.empty()
+            placeholders["blog"].info("블로그를 생성하고 있습니다.")
+        elif st.session_state.blog_markdown:
             st.markdown(st.session_state.blog_markdown)
         else:
             st.info("아직 생성되지 않았습니다.")
@@ -146,15 +278,24 @@ def main() -> None:
                 os.environ["GOOGLE_TEMPERATURE"] = str(temperature)
                 os.environ["GOOGLE_MODEL"] = model
                 config = load_config()
-                pipeline = BlogAgentPipeline(config)
-                st.session_state.comments = run_comments_with_progress(
-                    pipeline, st.session_state.blog_markdown
-                )
-                st.rerun()
+                pipeline = get_pipeline(config)
+                start_comments_job(pipeline, st.session_state.blog_markdown, use_cache=st.session_state.use_llm_cache)
             except Exception as e:
                 st.sidebar.error(f"댓글 생성 중 오류가 발생했습니다: {e}")
 
-    st.sidebar.markdown(st.session_state.comments or "아직 댓글이 생성되지 않았습니다.")
+    placeholders["comments"] = st.sidebar.empty()
+    placeholders["comments"].markdown(st.session_state.comments or "아직 댓글이 생성되지 않았습니다.")
+
+    # 화면을 다 그린 뒤 LLM/크롤러 모듈을 백그라운드에서 미리 가져와 첫 클릭 지연을 줄입니다.
+    start_warmup()
+
+    with job_status_area:
+        fused_bar = render_fused_status()
+        bars = render_job_status()
+        render_job_timings()
+    # 끝날 때까지 부분 결과를 그리다가, 작업이 하나라도 끝나거나 원클릭 실행의 단계가 끝나면 재실행해 결과를 반영합니다.
+    if wait_for_jobs(bars, placeholders, fused_bar):
+        st.rerun()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+# BlogInput 레코드(JSONL/CSV)를 받아 크롤링 + 3단계 생성을 UI 없이 일괄 실행하는 CLI입니다.
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import statistics
+import sys
+import time
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Optional
+
+from agent import BlogAgentPipeline, get_pipeline
+from config import load_config
+from crawl_cache import cached_crawl_place_tabs
+from naver_map import compact_crawled_data, merge_blog_input_with_crawl
+from prompt import BlogInput
+from rate_limit import scheduler_session
+
+
+BLOG_INPUT_FIELDS = [f.name for f in fields(BlogInput)]
+
+
+def read_records(path: Path) -> list[dict[str, str]]:
+    """JSONL 또는 CSV(헤더 = BlogInput 필드명)를 읽습니다. 없는 필드는 빈 문자열로 채웁니다."""
+    if path.suffix.lower() == ".csv":
+        with path.open(encoding="utf-8-sig", newline="") as f:
+            rows: list[dict[str, Any]] = list(csv.DictReader(f))
+    else:
+        rows = [json.loads(line) for line in path.read_text(encoding="utf-8-sig").splitlines() if line.strip()]
+    records = []
+    for row in rows:
+        record = {name: str(row.get(name) or "") for name in BLOG_INPUT_FIELDS}
+        if not record["tone"]:
+            record["tone"] = "정보형"
+        if row.get("id"):
+            record["id"] = str(row["id"])
+        records.append(record)
+    return records
+
+
+def record_key(record: dict[str, str]) -> str:
+    """체크포인트 키. id 필드가 있으면 그대로, 없으면 입력 내용 해시를 씁니다."""
+    if record.get("id"):
+        return record["id"]
+    payload = json.dumps({k: record[k] for k in BLOG_INPUT_FIELDS}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def load_checkpoint(path: Path) -> set[str]:
+    if not path.exists():
+        return set()
+    return {line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()}
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self.stage_ms: dict[str, list[float]] = {}
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def add(self, stage: str, ms: float) -> None:
+        self.stage_ms.setdefault(stage, []).append(ms)
+
+    def report(self, wall_s: float) -> str:
+        lines = [
+            f"완료 {self.done}건, 실패 {self.failed}건, 건너뜀(완료·중복) {self.skipped}건, 소요 {wall_s:.1f}s",
+            f"처리량 {self.done / wall_s * 60 if wall_s else 0:.2f}건/분",
+        ]
+        for stage, values in self.stage_ms.items():
+            ordered = sorted(values)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            lines.append(
+                f"  {stage:<14} n={len(values):<4} avg={statistics.fmean(values):8.0f}ms "
+                f"p50={statistics.median(values):8.0f}ms p95={p95:8.0f}ms max={ordered[-1]:8.0f}ms"
+            )
+        return "\n".join(lines)
+
+
+async def _generate_one(
+    pipeline: BlogAgentPipeline,
+    record: dict[str, str],
+    stats: _Stats,
+    *,
+    crawl: bool,
+    comments: bool,
+    use_cache: bool,
+) -> dict[str, Any]:
+    payload = {k: record[k] for k in BLOG_INPUT_FIELDS}
+    timings: dict[str, float] = {}
+
+    async def timed(stage: str, awaitable):
+        started = time.perf_counter()
+        value = await awaitable
+        timings[stage] = round((time.perf_counter() - started) * 1000, 1)
+        stats.add(stage, timings[stage])
+        return value
+
+    tab_errors: dict[str, str] = {}
+    if crawl and payload["map_url"].strip():
+        # 크롤러는 동기 API(브라우저 풀 포함)이므로 스레드에서 실행합니다.
+        crawled = await timed("crawl", asyncio.to_thread(cached_crawl_place_tabs, payload["map_url"]))
+        crawled, _ = compact_crawled_data(crawled, max_chars_per_tab=pipeline.config.tab_char_budget)
+        tab_errors = dict(crawled.tab_errors)
+        payload = merge_blog_input_with_crawl(payload, crawled)
+
+    blog_input = BlogInput(**payload)
+    user_prompt = await timed("user_prompt", pipeline.abuild_user_prompt(blog_input, use_cache=use_cache))
+    blog_markdown = await timed("blog_markdown", pipeline.awrite_blog(user_prompt, use_cache=use_cache))
+    result: dict[str, Any] = {"user_prompt": user_prompt, "blog_markdown": blog_markdown}
+    if comments:
+        result["comments"] = await timed("comments", pipeline.awrite_comments(blog_markdown, use_cache=use_cache))
+    result["timings_ms"] = timings
+    if tab_errors:
+        result["tab_errors"] = tab_errors
+    return result
+
+
+async def run_batch(
+    records: list[dict[str, str]],
+    out_path: Path,
+    checkpoint_path: Path,
+    *,
+    concurrency: int = 4,
+    crawl: bool = True,
+    comments: bool = True,
+    use_cache: bool = True,
+    pipeline: Optional[BlogAgentPipeline] = None,
+) -> _Stats:
+    """레코드를 concurrency개씩 동시에 처리하고, 끝나는 순서대로 결과/체크포인트를 기록합니다.
+
+    결과는 out_path(JSONL)에 한 줄씩 추가되고, 성공한 레코드 키만 checkpoint_path에 남습니다.
+    실패한 레코드는 error와 함께 결과 파일에 기록되며 다음 실행에서 다시 시도됩니다.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency는 1 이상이어야 합니다.")
+    pipeline = pipeline or get_pipeline(load_config())
+    stats = _Stats()
+    finished = load_checkpoint(checkpoint_path)
+    pending = []
+    for record in records:
+        key = record_key(record)
+        if key in finished:
+            stats.skipped += 1
+        else:
+            finished.add(key)  # 같은 입력이 파일에 두 번 있으면 한 번만 생성합니다.
+            pending.append((key, record))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    async def worker(key: str, record: dict[str, str]) -> tuple[str, dict[str, Any]]:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await _generate_one(
+                    pipeline, record, stats, crawl=crawl, comments=comments, use_cache=use_cache
+                )
+            except Exception as e:
+                return key, {"key": key, "input": record, "error": f"{type(e).__name__}: {e}"}
+            stats.add("total", (time.perf_counter() - started) * 1000)
+            return key, {"key": key, "input": record, **result}
+
+    # 배치 호출은 하나의 세션으로 묶여, 같은 프로세스의 대화형 세션보다 먼저 슬롯을 독점하지 못합니다.
+    with scheduler_session("batch"), out_path.open("a", encoding="utf-8") as out, checkpoint_path.open(
+        "a", encoding="utf-8"
+    ) as ckpt:
+        for finished_task in asyncio.as_completed([worker(key, record) for key, record in pending]):
+            key, row = await finished_task
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            out.flush()
+            if "error" in row:
+                stats.failed += 1
+                print(f"[실패] {key}: {row['error']}", file=sys.stderr)
+                continue
+            # 결과를 먼저 쓰고 체크포인트를 남겨, 중단되어도 결과 없이 완료 처리되는 일이 없게 합니다.
+            ckpt.write(key + "\n")
+            ckpt.flush()
+            stats.done += 1
+            print(f"[완료] {key} ({stats.done}/{len(pending)})", file=sys.stderr)
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BlogInput 레코드로 블로그 글을 일괄 생성합니다.")
+    parser.add_argument("input", help="BlogInput 레코드 파일(.jsonl 또는 .csv)")
+    parser.add_argument("--out", default="batch_results.jsonl", help="결과 JSONL 경로")
+    parser.add_argument("--checkpoint", default=None, help="체크포인트 경로(기본: <out>.done)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--no-crawl", action="store_true", help="네이버 지도 크롤링을 건너뜁니다.")
+    parser.add_argument("--no-comments", action="store_true", help="3단계 댓글 생성을 건너뜁니다.")
+    parser.add_argument("--no-cache", action="store_true", help="LLM 응답 캐시를 건너뜁니다.")
+    args = parser.parse_args()
+
+    out_path = Path(args.out)
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else out_path.with_name(out_path.name + ".done")
+    records = read_records(Path(args.input))
+
+    started = time.perf_counter()
+    stats = asyncio.run(
+        run_batch(
+            records,
+            out_path,
+            checkpoint_path,
+            concurrency=args.concurrency,
+            crawl=not args.no_crawl,
+            comments=not args.no_comments,
+            use_cache=not args.no_cache,
+        )
+    )
+    print(stats.report(time.perf_counter() - started))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+# 가짜 채팅 모델로 BlogAgentPipeline의 자체 오버헤드(지연/메모리 할당/처리량)를 오프라인 측정합니다.
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+from agent import BlogAgentPipeline
+from config import CACHE_DIR, AppConfig
+from fake_llm import DEFAULT_RESPONSES, ScriptedChatModel
+from llm_cache import ResponseCache
+from prompt import BlogInput
+from rate_limit import GeminiScheduler
+
+
+OPERATIONS = ("build_user_prompt", "write_blog", "write_comments", "run")
+# 기준선은 측정한 머신에 묶이므로 저장소가 아닌 로컬 캐시 폴더에 둡니다.
+DEFAULT_BASELINE = CACHE_DIR / "bench_pipeline_baseline.json"
+
+SAMPLE_INPUT = BlogInput(
+    map_url="https://map.naver.com/p/entry/place/1234567890",
+    place_name="가평 숲속 카페",
+    business_hours="매일 09:00-20:00",
+    location_info="설악 IC에서 가평역 방향 10분",
+    home_tab_info="통창 뷰, 반려동물 동반 가능\n" * 20,
+    menu_tab_info="시그니처 라떼 6,500원\n수제 케이크 7,000원\n" * 30,
+    info_tab_info="주차 20대 가능, 무선 인터넷\n" * 20,
+    news_tab_info="가을 시즌 메뉴 출시\n" * 10,
+    parking_or_tips="매장 앞 전용 주차장",
+    interior_and_menu="통창 좌석, 라떼와 케이크",
+    signature_taste="라떼의 고소함",
+    tone="정보형",
+    target_keyword="가평 카페 추천",
+)
+
+
+def build_bench_pipeline(
+    model: ScriptedChatModel, cache_dir: Path, *, style_mode: str = "context"
+) -> BlogAgentPipeline:
+    """가짜 모델, 임시 응답 캐시, 한도를 사실상 없앤 스케줄러로 파이프라인을 만듭니다."""
+    # 벤치마크용 span이 실제 지표 파일에 섞이지 않게 합니다(get_tracer 첫 호출 전에 적용).
+    os.environ.setdefault("METRICS_JSONL", "")
+    return BlogAgentPipeline(
+        AppConfig(google_api_key="offline-bench", style_mode=style_mode),
+        llm=model,
+        response_cache=ResponseCache(cache_dir / "llm_responses.sqlite3"),
+        scheduler=GeminiScheduler(rpm=10**9, tpm=10**12, max_concurrency=1024),
+    )
+
+
+def _operation(pipeline: BlogAgentPipeline, name: str) -> Callable[[], Any]:
+    # 응답 캐시를 건너뛰어 매번 Agent와 가짜 모델까지 실행합니다(응답 저장 비용은 포함).
+    if name == "build_user_prompt":
+        return lambda: pipeline.build_user_prompt(SAMPLE_INPUT, use_cache=False)
+    if name == "write_blog":
+        return lambda: pipeline.write_blog(DEFAULT_RESPONSES["prompt_builder_agent"], use_cache=False)
+    if name == "write_comments":
+        return lambda: pipeline.write_comments(DEFAULT_RESPONSES["blog_writer_agent"], use_cache=False)
+    if name == "run":
+        return lambda: pipeline.run(SAMPLE_INPUT, use_cache=False)
+    raise ValueError(f"알 수 없는 작업입니다: {name}")
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def measure_latency(fn: Callable[[], Any], *, concurrency: int, iterations: int) -> dict[str, float]:
+    """iterations번 호출을 concurrency개 스레드로 나눠 실행하고 호출별 지연과 처리량을 잽니다."""
+
+    def timed() -> float:
+        started = time.perf_counter()
+        fn()
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(lambda _: timed(), range(iterations)))
+    wall = time.perf_counter() - started
+    return {
+        "p50_ms": round(_percentile(latencies, 0.5), 2),
+        "p95_ms": round(_percentile(latencies, 0.95), 2),
+        "max_ms": round(max(latencies), 2),
+        "throughput_per_s": round(iterations / wall, 2),
+    }
+
+
+def measure_allocations(fn: Callable[[], Any], *, repeat: int = 10) -> dict[str, float]:
+    """한 호출이 잡는 Python 메모리(최대치)와 호출 뒤 남는 메모리(순증가)를 tracemalloc으로 잽니다."""
+    tracemalloc.start()
+    try:
+        peaks: list[int] = []
+        nets: list[int] = []
+        for _ in range(repeat):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn()
+            after, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            nets.append(after - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        "alloc_peak_kb": round(sum(peaks) / len(peaks) / 1024, 1),
+        "alloc_net_kb": round(sum(nets) / len(nets) / 1024, 1),
+    }
+
+
+def run_benchmark(
+    *,
+    operations: tuple[str, ...] = OPERATIONS,
+    concurrency_levels: tuple[int, ...] = (1, 4, 16),
+    iterations: int = 50,
+    latency: float = 0.0,
+    style_mode: str = "context",
+) -> dict[str, Any]:
+    model = ScriptedChatModel(latency=latency)
+    with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as tmp:
+        pipeline = build_bench_pipeline(model, Path(tmp), style_mode=style_mode)
+        results: dict[str, Any] = {}
+        for name in operations:
+            fn = _operation(pipeline, name)
+            fn()  # 첫 호출(그래프 컴파일, SQLite 연결 등)은 측정에서 뺍니다.
+            row: dict[str, Any] = measure_allocations(fn)
+            for concurrency in concurrency_levels:
+                row[f"c{concurrency}"] = measure_latency(fn, concurrency=concurrency, iterations=iterations)
+            results[name] = row
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "latency_s": latency,
+            "style_mode": style_mode,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], *, max_regression: float) -> tuple[list[str], bool]:
+    """p50/p95가 max_regression(비율)보다 늘거나 처리량이 그만큼 줄면 회귀로 표시합니다."""
+    lines: list[str] = []
+    regressed = False
+    for name, row in current["results"].items():
+        base_row = baseline.get("results", {}).get(name)
+        if base_row is None:
+            continue
+        for level, stats in row.items():
+            base = base_row.get(level)
+            if not isinstance(stats, dict) or not isinstance(base, dict):
+                continue
+            for metric in ("p50_ms", "p95_ms", "throughput_per_s"):
+                if not base.get(metric):
+                    continue
+                change = stats[metric] / base[metric] - 1
+                worse = -change if metric == "throughput_per_s" else change
+                flag = worse > max_regression
+                regressed = regressed or flag
+                lines.append(
+                    f"{'!!' if flag else '  '} {name:<18} {level:<4} {metric:<17} "
+                    f"{base[metric]:>10} -> {stats[metric]:>10} ({change:+.1%})"
+                )
+    return lines, regressed
+
+
+def format_report(report: dict[str, Any]) -> str:
+    lines = [f"python {report['meta']['python']} / latency {report['meta']['latency_s']}s / n={report['meta']['iterations']}"]
+    for name, row in report["results"].items():
+        lines.append(f"{name}: alloc peak {row['alloc_peak_kb']}KB, net {row['alloc_net_kb']}KB per call")
+        for level, stats in row.items():
+            if isinstance(stats, dict):
+                lines.append(
+                    f"  {level:<4} p50={stats['p50_ms']:8.2f}ms p95={stats['p95_ms']:8.2f}ms "
+                    f"max={stats['max_ms']:8.2f}ms {stats['throughput_per_s']:8.2f}/s"
+                )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="가짜 채팅 모델로 BlogAgentPipeline 오버헤드를 측정합니다(네트워크 불필요).")
+    parser.add_argument("--ops", default=",".join(OPERATIONS), help="측정할 작업(쉼표 구분)")
+    parser.add_argument("--concurrency", default="1,4,16", help="동시 실행 수 목록(쉼표 구분)")
+    parser.add_argument("--iterations", type=int, default=50, help="동시 실행 수별 호출 횟수")
+    parser.add_argument("--latency", type=float, default=0.0, help="가짜 모델의 호출당 지연(초)")
+    parser.add_argument("--style-mode", choices=("context", "tool"), default="context")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="기준선 JSON 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준선으로 저장합니다.")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="회귀로 볼 악화 비율(기본 20%%)")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        operations=tuple(op.strip() for op in args.ops.split(",") if op.strip()),
+        concurrency_levels=tuple(int(c) for c in args.concurrency.split(",")),
+        iterations=args.iterations,
+        latency=args.latency,
+        style_mode=args.style_mode,
+    )
+    print(format_report(report))
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"기준선을 저장했습니다: {baseline_path}")
+    elif baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        mismatched = [
+            key for key in ("latency_s", "style_mode", "iterations") if baseline["meta"].get(key) != report["meta"][key]
+        ]
+        lines, regressed = compare(report, baseline, max_regression=args.max_regression)
+        print("\n기준선 대비:")
+        print("\n".join(lines))
+        if mismatched:
+            # 측정 조건이 다르면 수치 비교만 보여주고 회귀 판정은 하지 않습니다.
+            print(f"\n기준선과 측정 조건이 다릅니다({', '.join(mismatched)}). 회귀 판정을 건너뜁니다.", file=sys.stderr)
+        elif regressed:
+            print(f"\n기준선보다 {args.max_regression:.0%} 넘게 느려진 항목이 있습니다.", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
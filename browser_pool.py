@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+# 프로세스 전역에서 재사용하는 Chromium 브라우저 풀을 제공합니다.
+import atexit
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+try:
+    from playwright.sync_api import sync_playwright
+except Exception:  # pragma: no cover - runtime optional dependency
+    sync_playwright = None
+
+
+T = TypeVar("T")
+
+# Playwright 드라이버 프로세스를 식별하기 위해 기동 구간을 직렬화합니다.
+_LAUNCH_LOCK = threading.Lock()
+
+
+def _child_pids(pid: int) -> set[int]:
+    """/proc를 읽어 pid의 직계 자식 프로세스를 반환합니다(리눅스 외 환경에서는 빈 집합)."""
+    children: set[int] = set()
+    proc = Path("/proc")
+    if not proc.is_dir():
+        return children
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # comm 필드에 공백/괄호가 있을 수 있어 마지막 ')' 뒤에서 ppid를 읽습니다.
+        fields = stat[stat.rfind(")") + 2 :].split()
+        if len(fields) > 1 and fields[1] == str(pid):
+            children.add(int(entry.name))
+    return children
+
+
+def _tree_rss_mb(root_pids: set[int]) -> Optional[float]:
+    """root_pids와 그 하위 프로세스 전체의 RSS 합계(MB)를 구합니다. 측정할 수 없으면 None."""
+    if not root_pids or not Path("/proc").is_dir():
+        return None
+    total_kb = 0
+    seen: set[int] = set()
+    stack = list(root_pids)
+    while stack:
+        pid = stack.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        try:
+            for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total_kb += int(line.split()[1])
+                    break
+        except (OSError, ValueError):
+            continue
+        stack.extend(_child_pids(pid))
+    return total_kb / 1024
+
+
+class _BrowserSlot(threading.Thread):
+    """Playwright 인스턴스와 브라우저 하나를 소유하는 작업 스레드입니다.
+
+    sync API 객체는 생성한 스레드에서만 사용할 수 있으므로, 브라우저 조작은 모두 이 스레드에서 실행됩니다.
+    """
+
+    def __init__(self, pool: "BrowserPool", index: int) -> None:
+        super().__init__(name=f"browser-pool-{index}", daemon=True)
+        self.pool = pool
+        self.index = index
+        self._playwright = None
+        self._browser = None
+        self._spare_context = None
+        self._driver_pids: set[int] = set()
+        self.uses = 0
+        self.launches = 0
+        self.last_memory_mb: Optional[float] = None
+
+    # ---- 브라우저 수명 관리 -------------------------------------------------
+    def _launch(self) -> None:
+        with _LAUNCH_LOCK:
+            before = _child_pids(os.getpid())
+            self._playwright = sync_playwright().start()
+            self._driver_pids = _child_pids(os.getpid()) - before
+        self._browser = self._playwright.chromium.launch(headless=True, **self.pool.launch_options)
+        self.uses = 0
+        self.launches += 1
+
+    def _shutdown(self) -> None:
+        for closer in (
+            lambda: self._spare_context and self._spare_context.close(),
+            lambda: self._browser and self._browser.close(),
+            lambda: self._playwright and self._playwright.stop(),
+        ):
+            try:
+                closer()
+            except Exception:
+                pass
+        self._spare_context = None
+        self._browser = None
+        self._playwright = None
+        self._driver_pids = set()
+
+    def _healthy(self) -> bool:
+        try:
+            return self._browser is not None and self._browser.is_connected()
+        except Exception:
+            return False
+
+    def _needs_recycle(self) -> bool:
+        if self.uses >= self.pool.max_uses:
+            return True
+        self.last_memory_mb = _tree_rss_mb(self._driver_pids)
+        return self.last_memory_mb is not None and self.last_memory_mb > self.pool.max_memory_mb
+
+    def _take_context(self):
+        if self._spare_context is not None:
+            context, self._spare_context = self._spare_context, None
+            return context
+        return self._browser.new_context(**self.pool.context_options)
+
+    def _prepare_spare_context(self) -> None:
+        try:
+            self._spare_context = self._browser.new_context(**self.pool.context_options)
+        except Exception:
+            self._spare_context = None
+
+    # ---- 작업 루프 ---------------------------------------------------------
+    def run(self) -> None:
+        # 첫 요청이 기동 비용을 내지 않도록 미리 띄워 둡니다. 실패하면 첫 요청에서 다시 시도합니다.
+        try:
+            self._launch()
+            self._prepare_spare_context()
+        except Exception:
+            self._shutdown()
+        while True:
+            item = self.pool._tasks.get()
+            if item is None:
+                self._shutdown()
+                return
+            fn, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if not self._healthy():
+                    self._shutdown()
+                    self._launch()
+                context = self._take_context()
+                try:
+                    future.set_result(fn(context))
+                finally:
+                    try:
+                        context.close()
+                    except Exception:
+                        pass
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self.uses += 1
+                if self._browser is not None:
+                    if not self._healthy() or self._needs_recycle():
+                        self._shutdown()
+                    else:
+                        # 다음 요청이 바로 쓸 수 있도록 새 컨텍스트를 미리 만들어 둡니다.
+                        self._prepare_spare_context()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "slot": self.index,
+            "alive": self._browser is not None,
+            "uses": self.uses,
+            "launches": self.launches,
+            "memory_mb": self.last_memory_mb,
+        }
+
+
+class BrowserPool:
+    """웜 상태의 headless Chromium을 여러 크롤 요청이 나눠 쓰도록 관리합니다.
+
+    - 요청마다 새 BrowserContext를 건네고, 작업이 끝나면 닫습니다.
+    - 브라우저 연결이 끊기면 다음 요청 전에 다시 띄웁니다.
+    - max_uses회 사용했거나 브라우저 프로세스 트리 메모리가 max_memory_mb를 넘으면 재시작합니다.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        *,
+        max_uses: int = 50,
+        max_memory_mb: float = 1024,
+        context_options: Optional[dict[str, Any]] = None,
+        launch_options: Optional[dict[str, Any]] = None,
+    ) -> None:
+        if sync_playwright is None:
+            raise RuntimeError(
+                "playwright가 설치되어 있지 않습니다. "
+                "`pip install playwright && playwright install chromium` 를 먼저 실행하세요."
+            )
+        if size < 1:
+            raise ValueError("브라우저 풀 크기는 1 이상이어야 합니다.")
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.context_options = dict(context_options or {})
+        self.launch_options = dict(launch_options or {})
+        self._tasks: "queue.Queue[Optional[tuple[Callable[[Any], Any], Future]]]" = queue.Queue()
+        self._slots = [_BrowserSlot(self, i) for i in range(size)]
+        self._closed = False
+        for slot in self._slots:
+            slot.start()
+
+    def run(self, fn: Callable[[Any], T], *, timeout: Optional[float] = None) -> T:
+        """새 컨텍스트로 fn(context)를 풀 스레드에서 실행하고 결과를 돌려줍니다."""
+        if self._closed:
+            raise RuntimeError("이미 종료된 브라우저 풀입니다.")
+        future: Future = Future()
+        self._tasks.put((fn, future))
+        return future.result(timeout=timeout)
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [slot.stats() for slot in self._slots]
+
+    def close(self, *, wait: float = 10.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._slots:
+            self._tasks.put(None)
+        deadline = time.monotonic() + wait
+        for slot in self._slots:
+            slot.join(max(0.0, deadline - time.monotonic()))
+
+
+_shared_pool: Optional[BrowserPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_browser_pool(*, context_options: Optional[dict[str, Any]] = None) -> BrowserPool:
+    """프로세스 전역 브라우저 풀을 반환합니다. 처음 호출할 때 환경변수 설정으로 생성합니다."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = BrowserPool(
+                size=int(os.getenv("BROWSER_POOL_SIZE", "2")),
+                max_uses=int(os.getenv("BROWSER_POOL_MAX_USES", "50")),
+                max_memory_mb=float(os.getenv("BROWSER_POOL_MAX_MEMORY_MB", "1024")),
+                context_options=context_options,
+            )
+            atexit.register(_shared_pool.close)
+        return _shared_pool
+
+
+def shutdown_browser_pool() -> None:
+    """전역 브라우저 풀을 종료합니다. 다음 get_browser_pool 호출 때 새로 만듭니다."""
+    global _shared_pool
+    with _shared_pool_lock:
+        pool, _shared_pool = _shared_pool, None
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+# 작업 취소 예외를 따로 둡니다. metrics 같은 하위 모듈이 작업 관리자(jobs)를 가져오지 않고도 취소를 구분하기 위함입니다.
+
+
+class JobCancelled(Exception):
+    """작업 함수가 취소 요청을 확인하고 중단할 때 냅니다."""
@@ -9,7 +9,9 @@ from dotenv import dotenv_values, load_dotenv
 
 
 BASE_DIR = Path(__file__).resolve().parent
+CACHE_DIR = BASE_DIR / ".cache"
 TEST_STYLE_FILES = [BASE_DIR / "test" / "Test1.md", BASE_DIR / "test" / "Test2.md"]
+STYLE_MODES = ("context", "tool")
 
 
 @dataclass(frozen=True)
@@ -17,10 +19,19 @@ class AppConfig:
     google_api_key: str
     google_model: str = "gemini-2.5-flash-lite"
     temperature: float = 0.5
+    # "context": 문체 레퍼런스를 시스템 컨텍스트 고정 prefix로 전달, "tool": style_reference_reader 도구로 전달
+    style_mode: str = "context"
+    # 1단계 facts 블록의 추정 토큰 예산(크롤링 필드만 줄임)
+    facts_token_budget: int = 3000
+    # 크롤링 탭 하나의 글자수 예산(중복/상투 문구 제거 뒤 이 이하로 자름)
+    tab_char_budget: int = 2500
 
 
-def load_config() -> AppConfig:
-    """.env를 읽고 필수 설정을 검증한 뒤 AppConfig를 반환합니다."""
+def load_config(*, require_api_key: bool = True) -> AppConfig:
+    """.env를 읽고 필수 설정을 검증한 뒤 AppConfig를 반환합니다.
+
+    require_api_key=False이면 API 키 없이도 반환합니다(크롤링처럼 LLM을 쓰지 않는 작업이 예산 설정만 읽을 때).
+    """
     env_path = BASE_DIR / ".env"
 
     # 기본 로딩(프로세스 환경변수 포함)
@@ -30,22 +41,39 @@ def load_config() -> AppConfig:
         # .env 값에 공백/따옴표가 섞여 있어도 안전하게 정리합니다.
         return value.strip().strip('"').strip("'")
 
-    # 일반 키 로딩
-    api_key = _clean(os.getenv("GOOGLE_API_KEY", ""))
-    model = _clean(os.getenv("GOOGLE_MODEL", "gemini-2.5-flash-lite"))
-    temp_raw = _clean(os.getenv("GOOGLE_TEMPERATURE", "0.5"))
-
-    # BOM(\ufeff)으로 깨진 키 대응
-    if not api_key and env_path.exists():
+    # BOM(\ufeff)으로 깨진 키 대응: 첫 줄의 키 이름 앞에 BOM이 붙으면 환경변수로는 읽히지 않으므로,
+    # .env를 직접 파싱한 값을 환경변수에 없는 설정의 대체값으로 씁니다(어느 키가 첫 줄이든 같은 규칙).
+    parsed: dict[str, str] = {}
+    if env_path.exists():
         parsed = {k.lstrip("\ufeff"): (v or "") for k, v in dotenv_values(env_path).items()}
-        api_key = _clean(parsed.get("GOOGLE_API_KEY", ""))
-        model = _clean(parsed.get("GOOGLE_MODEL", model))
-        temp_raw = _clean(parsed.get("GOOGLE_TEMPERATURE", temp_raw))
 
-    if not api_key:
+    def _setting(name: str, default: str) -> str:
+        value = _clean(os.getenv(name, ""))
+        if not value:
+            value = _clean(parsed.get(name, ""))
+        return value or default
+
+    api_key = _setting("GOOGLE_API_KEY", "")
+    model = _setting("GOOGLE_MODEL", "gemini-2.5-flash-lite")
+    temp_raw = _setting("GOOGLE_TEMPERATURE", "0.5")
+    style_mode = _setting("STYLE_CORPUS_MODE", "context")
+    facts_budget_raw = _setting("FACTS_TOKEN_BUDGET", "3000")
+    tab_budget_raw = _setting("TAB_CHAR_BUDGET", "2500")
+
+    if not api_key and require_api_key:
         raise ValueError(
             "GOOGLE_API_KEY.env 파일 또는 환경변수를 확인하세요."
         )
 
+    if style_mode not in STYLE_MODES:
+        raise ValueError(f"STYLE_CORPUS_MODE는 {', '.join(STYLE_MODES)} 중 하나여야 합니다: {style_mode}")
+
     temperature = float(temp_raw or "0.5")
-    return AppConfig(google_api_key=api_key, google_model=model, temperature=temperature)
+    return AppConfig(
+        google_api_key=api_key,
+        google_model=model,
+        temperature=temperature,
+        style_mode=style_mode,
+        facts_token_budget=int(facts_budget_raw or "3000"),
+        tab_char_budget=int(tab_budget_raw or "2500"),
+    )
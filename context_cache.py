@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+# 시스템 컨텍스트의 고정 prefix(문체 레퍼런스)가 provider 캐시에 적중하는지 추적합니다.
+import hashlib
+import threading
+import time
+from typing import Any, Optional
+
+
+def prefix_fingerprint(prefix: str) -> str:
+    return hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16]
+
+
+class ContextCacheStats:
+    """고정 prefix 요청의 캐시 적중을 집계합니다.
+
+    - provider 기준: 응답 usage_metadata의 input_token_details.cache_read 토큰을 합산합니다.
+      (Gemini 2.5 모델은 같은 prefix로 시작하는 요청을 암시적으로 캐시합니다.)
+    - 로컬 대체 기준: 같은 prefix가 ttl_seconds 안에 다시 보내지면 hit로 셉니다. 네트워크 없이도
+      "매 요청의 prefix가 바이트 단위로 동일한지"를 검증할 수 있게 해 주는 오프라인 모형입니다.
+    """
+
+    def __init__(self, *, ttl_seconds: float = 300) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.local_hits = 0
+        self.local_misses = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self._seen: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, prefix: str, *, now: Optional[float] = None) -> bool:
+        """prefix를 보내기 직전에 호출합니다. 로컬 캐시 기준 적중 여부를 반환합니다."""
+        now = time.time() if now is None else now
+        key = prefix_fingerprint(prefix)
+        with self._lock:
+            seen_at = self._seen.get(key)
+            hit = seen_at is not None and now - seen_at <= self.ttl_seconds
+            # provider 캐시는 마지막 사용 시점부터 만료되므로 적중 시에도 시각을 갱신합니다.
+            self._seen[key] = now
+            if hit:
+                self.local_hits += 1
+            else:
+                self.local_misses += 1
+        return hit
+
+    def record_usage(self, usage: Optional[dict[str, Any]]) -> None:
+        """LangChain usage_metadata에서 입력/캐시 적중 토큰을 누적합니다."""
+        if not usage:
+            return
+        details = usage.get("input_token_details") or {}
+        with self._lock:
+            self.input_tokens += int(usage.get("input_tokens") or 0)
+            self.cached_tokens += int(details.get("cache_read") or 0)
+
+    def as_dict(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "local_hits": self.local_hits,
+                "local_misses": self.local_misses,
+                "input_tokens": self.input_tokens,
+                "cached_tokens": self.cached_tokens,
+                "cached_ratio": round(self.cached_tokens / self.input_tokens, 4) if self.input_tokens else 0.0,
+            }
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+# placeId 기준 크롤링 결과를 디스크(SQLite)에 캐시하고, 탭별 TTL/stale-while-revalidate를 적용합니다.
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from config import CACHE_DIR
+from metrics import get_tracer
+from naver_map import TAB_LABELS, CrawledPlaceData, crawl_place_tabs, extract_place_id
+
+
+# 탭별 신선도 유지 시간(초). 소식은 자주 바뀌고 홈/정보는 거의 바뀌지 않습니다.
+DEFAULT_TAB_TTLS: dict[str, float] = {
+    "home": 7 * 24 * 3600,
+    "menu": 24 * 3600,
+    "info": 7 * 24 * 3600,
+    "news": 3600,
+}
+
+_TAB_FIELDS = {"home": "home_text", "menu": "menu_text", "info": "info_text", "news": "news_text"}
+
+
+class CrawlCache:
+    """CrawledPlaceData를 placeId/탭 단위로 저장하는 SQLite 캐시입니다.
+
+    - TTL 이내: fresh, 그대로 반환
+    - TTL 초과 ~ TTL + stale_seconds: stale, 반환은 하되 백그라운드에서 다시 수집
+    - 그 이후: expired, 해당 탭을 동기적으로 다시 수집
+    저장된 장소 수가 max_places를 넘으면 가장 오래 조회되지 않은 장소부터 지웁니다.
+    clock은 저장/조회 시각을 재는 함수로, 테스트에서는 가짜 시계를 넣습니다.
+    """
+
+    def __init__(
+        self,
+        path: Path | str = CACHE_DIR / "crawl_cache.sqlite3",
+        *,
+        tab_ttls: Optional[dict[str, float]] = None,
+        stale_seconds: float = 24 * 3600,
+        max_places: int = 500,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.tab_ttls = {**DEFAULT_TAB_TTLS, **(tab_ttls or {})}
+        self.stale_seconds = stale_seconds
+        self.max_places = max_places
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS crawl_places (
+                    place_id TEXT PRIMARY KEY,
+                    source_url TEXT NOT NULL,
+                    accessed_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS crawl_tabs (
+                    place_id TEXT NOT NULL,
+                    tab TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (place_id, tab)
+                );
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def load(self, place_id: str) -> tuple[Optional[str], dict[str, tuple[str, float]]]:
+        """저장된 (source_url, {탭: (텍스트, 경과 초)})를 반환하고 조회 시각을 갱신합니다."""
+        now = self.clock()
+        with self._lock, closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT source_url FROM crawl_places WHERE place_id = ?", (place_id,)
+            ).fetchone()
+            if row is None:
+                return None, {}
+            conn.execute("UPDATE crawl_places SET accessed_at = ? WHERE place_id = ?", (now, place_id))
+            tabs = {
+                tab: (text, now - fetched_at)
+                for tab, text, fetched_at in conn.execute(
+                    "SELECT tab, text, fetched_at FROM crawl_tabs WHERE place_id = ?", (place_id,)
+                )
+            }
+        return row[0], tabs
+
+    def store(self, data: CrawledPlaceData, tabs: Optional[set[str]] = None) -> None:
+        """수집 결과를 저장합니다. 수집에 실패한 탭(tab_errors)은 저장하지 않습니다."""
+        now = self.clock()
+        keys = set(TAB_LABELS.values()) if tabs is None else set(tabs)
+        keys -= set(data.tab_errors)
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO crawl_places (place_id, source_url, accessed_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(place_id) DO UPDATE SET source_url = excluded.source_url, "
+                "accessed_at = excluded.accessed_at",
+                (data.place_id, data.source_url, now),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO crawl_tabs (place_id, tab, text, fetched_at) VALUES (?, ?, ?, ?)",
+                [(data.place_id, key, getattr(data, _TAB_FIELDS[key]), now) for key in sorted(keys)],
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        stale_ids = [
+            row[0]
+            for row in conn.execute(
+                "SELECT place_id FROM crawl_places ORDER BY accessed_at DESC LIMIT -1 OFFSET ?",
+                (self.max_places,),
+            )
+        ]
+        if stale_ids:
+            conn.executemany("DELETE FROM crawl_tabs WHERE place_id = ?", [(pid,) for pid in stale_ids])
+            conn.executemany("DELETE FROM crawl_places WHERE place_id = ?", [(pid,) for pid in stale_ids])
+
+    def invalidate(self, place_id: Optional[str] = None) -> None:
+        """특정 장소(또는 전체)의 캐시를 지웁니다."""
+        with self._lock, closing(self._connect()) as conn, conn:
+            if place_id is None:
+                conn.execute("DELETE FROM crawl_tabs")
+                conn.execute("DELETE FROM crawl_places")
+            else:
+                conn.execute("DELETE FROM crawl_tabs WHERE place_id = ?", (place_id,))
+                conn.execute("DELETE FROM crawl_places WHERE place_id = ?", (place_id,))
+
+    def classify(self, tabs: dict[str, tuple[str, float]]) -> tuple[set[str], set[str]]:
+        """(stale 탭, 다시 수집해야 하는 탭)을 구분합니다. 나머지는 fresh입니다."""
+        stale: set[str] = set()
+        expired: set[str] = set()
+        for key in TAB_LABELS.values():
+            if key not in tabs:
+                expired.add(key)
+                continue
+            age = tabs[key][1]
+            ttl = self.tab_ttls[key]
+            if age > ttl + self.stale_seconds:
+                expired.add(key)
+            elif age > ttl:
+                stale.add(key)
+        return stale, expired
+
+    def refresh_in_background(
+        self,
+        map_url: str,
+        place_id: str,
+        tabs: set[str],
+        *,
+        crawl: Optional[Callable[..., CrawledPlaceData]] = None,
+        **crawl_kwargs: Any,
+    ) -> Optional[threading.Thread]:
+        """stale 탭을 백그라운드 스레드에서 다시 수집하고 그 스레드를 반환합니다.
+
+        같은 장소의 갱신은 한 번만 진행하며, 이미 진행 중이면 None을 반환합니다.
+        crawl을 주지 않으면 crawl_place_tabs로 수집합니다.
+        """
+        crawl = crawl or crawl_place_tabs
+        with self._lock:
+            if place_id in self._refreshing:
+                return None
+            self._refreshing.add(place_id)
+
+        def worker() -> None:
+            try:
+                self.store(crawl(map_url, tabs=tabs, **crawl_kwargs), tabs)
+            except Exception:
+                # 갱신 실패 시 기존 stale 값을 유지하고, 다음 조회에서 다시 시도합니다.
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(place_id)
+
+        thread = threading.Thread(target=worker, name=f"crawl-refresh-{place_id}", daemon=True)
+        thread.start()
+        return thread
+
+
+def _compose(place_id: str, source_url: str, tabs: dict[str, str], tab_errors: dict[str, str]) -> CrawledPlaceData:
+    return CrawledPlaceData(
+        place_id=place_id,
+        source_url=source_url,
+        home_text=tabs.get("home", ""),
+        menu_text=tabs.get("menu", ""),
+        info_text=tabs.get("info", ""),
+        news_text=tabs.get("news", ""),
+        tab_errors=tab_errors,
+    )
+
+
+_shared_cache: Optional[CrawlCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_crawl_cache() -> CrawlCache:
+    """프로세스 전역 크롤 캐시를 반환합니다."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = CrawlCache()
+        return _shared_cache
+
+
+def cached_crawl_place_tabs(
+    map_url: str,
+    *,
+    cache: Optional[CrawlCache] = None,
+    refresh: bool = False,
+    crawl: Optional[Callable[..., CrawledPlaceData]] = None,
+    **crawl_kwargs: Any,
+) -> CrawledPlaceData:
+    """캐시를 우선 사용하는 crawl_place_tabs입니다.
+
+    만료된 탭만 다시 수집해 캐시 값과 합치고, stale 탭은 캐시 값을 즉시 반환한 뒤 백그라운드에서 갱신합니다.
+    refresh=True이면 캐시를 무시하고 모든 탭을 다시 수집합니다.
+    crawl은 crawl_place_tabs와 같은 시그니처의 수집 함수로, 주지 않으면 crawl_place_tabs를 씁니다.
+    """
+    cache = cache or get_crawl_cache()
+    crawl = crawl or crawl_place_tabs
+    with get_tracer().span("crawl.cache", map_url=map_url) as span:
+        place_id = extract_place_id(map_url)
+        source_url, cached = (None, {}) if refresh else cache.load(place_id)
+        stale, expired = cache.classify(cached)
+        span.set(place_id=place_id, stale_tabs=len(stale), expired_tabs=len(expired))
+
+        if not expired and source_url is not None:
+            cache.hits += 1
+            span.set(cache_hit=True)
+            if stale:
+                cache.refresh_in_background(map_url, place_id, stale, crawl=crawl, **crawl_kwargs)
+            return _compose(place_id, source_url, {k: v[0] for k, v in cached.items()}, {})
+
+        cache.misses += 1
+        span.set(cache_hit=False)
+        # 어차피 브라우저를 띄우므로 stale 탭도 함께 다시 수집합니다.
+        recrawl = expired | stale
+        crawled = crawl(map_url, tabs=recrawl, **crawl_kwargs)
+        cache.store(crawled, recrawl)
+
+    texts = {k: v[0] for k, v in cached.items()}
+    for key in recrawl:
+        if key not in crawled.tab_errors:
+            texts[key] = getattr(crawled, _TAB_FIELDS[key])
+    return _compose(place_id, crawled.source_url, texts, dict(crawled.tab_errors))
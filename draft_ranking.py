@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+# 톤별 블로그 초안을 LLM 호출 없이 로컬 규칙(글자수/키워드/구조)으로 채점하고 순위를 매깁니다.
+import re
+from dataclasses import dataclass
+
+
+TARGET_BLOG_CHARS = 2000
+
+# 점수 가중치(합계 1.0)
+_LENGTH_WEIGHT = 0.4
+_KEYWORD_WEIGHT = 0.3
+_STRUCTURE_WEIGHT = 0.3
+
+# BLOG_WRITER_SYSTEM의 구조 규칙에서 본문에 드러나야 하는 정보 구역
+_REQUIRED_SECTIONS = {
+    "영업시간": ("영업시간", "영업 시간", "운영시간"),
+    "주차": ("주차",),
+    "메뉴": ("메뉴",),
+}
+_MAX_EXCLAMATIONS = 3
+
+
+@dataclass(frozen=True)
+class DraftScore:
+    tone: str
+    chars: int
+    non_space_chars: int
+    length_score: float
+    keyword_score: float
+    structure_score: float
+    issues: tuple[str, ...]
+
+    @property
+    def total(self) -> float:
+        """0~100점"""
+        return round(
+            100
+            * (
+                _LENGTH_WEIGHT * self.length_score
+                + _KEYWORD_WEIGHT * self.keyword_score
+                + _STRUCTURE_WEIGHT * self.structure_score
+            ),
+            1,
+        )
+
+
+def _length_score(chars: int, target_chars: int) -> float:
+    """목표 글자수에서 벗어난 비율만큼 감점합니다(목표의 2배 이상 벗어나면 0점)."""
+    if target_chars <= 0:
+        return 1.0
+    return max(0.0, 1.0 - abs(chars - target_chars) / target_chars)
+
+
+def _keyword_score(text: str, target_keyword: str) -> tuple[float, list[str]]:
+    """핵심 키워드 문구가 그대로 있으면 만점, 없으면 포함된 단어 비율로 점수를 줍니다."""
+    keyword = target_keyword.strip()
+    if not keyword:
+        return 1.0, []
+    compact_text = re.sub(r"\s+", "", text)
+    if re.sub(r"\s+", "", keyword) in compact_text:
+        return 1.0, []
+    words = keyword.split()
+    missing = [w for w in words if w not in text]
+    return (len(words) - len(missing)) / len(words), [f"키워드 누락: {', '.join(missing)}"]
+
+
+def _structure_score(text: str) -> tuple[float, list[str]]:
+    """인사로 시작, 필수 정보 구역, 느낌표 남용, 줄바꿈(문단 구분) 규칙을 점검합니다."""
+    issues: list[str] = []
+    checks = 0
+    passed = 0
+
+    checks += 1
+    first_line = next((line.strip().lstrip("#").strip() for line in text.splitlines() if line.strip()), "")
+    if first_line.startswith("안녕하세요"):
+        passed += 1
+    else:
+        issues.append("인사로 시작하지 않음")
+
+    for section, markers in _REQUIRED_SECTIONS.items():
+        checks += 1
+        if any(marker in text for marker in markers):
+            passed += 1
+        else:
+            issues.append(f"{section} 정보 없음")
+
+    checks += 1
+    exclamations = text.count("!")
+    if exclamations <= _MAX_EXCLAMATIONS:
+        passed += 1
+    else:
+        issues.append(f"느낌표 {exclamations}개")
+
+    checks += 1
+    paragraphs = [p for p in re.split(r"\n\s*\n", text) if p.strip()]
+    if len(paragraphs) >= 5:
+        passed += 1
+    else:
+        issues.append(f"문단 {len(paragraphs)}개")
+
+    return passed / checks, issues
+
+
+def score_draft(
+    text: str, *, tone: str = "", target_keyword: str = "", target_chars: int = TARGET_BLOG_CHARS
+) -> DraftScore:
+    chars = len(text)
+    keyword_score, keyword_issues = _keyword_score(text, target_keyword)
+    structure_score, structure_issues = _structure_score(text)
+    issues = []
+    if chars < target_chars * 0.8 or chars > target_chars * 1.2:
+        issues.append(f"글자수 {chars:,}자(목표 {target_chars:,}자)")
+    return DraftScore(
+        tone=tone,
+        chars=chars,
+        non_space_chars=len(re.sub(r"\s+", "", text)),
+        length_score=round(_length_score(chars, target_chars), 3),
+        keyword_score=round(keyword_score, 3),
+        structure_score=round(structure_score, 3),
+        issues=tuple(issues + keyword_issues + structure_issues),
+    )
+
+
+def rank_drafts(
+    drafts: dict[str, str], *, target_keyword: str = "", target_chars: int = TARGET_BLOG_CHARS
+) -> list[DraftScore]:
+    """{톤: 초안}을 채점해 점수가 높은 순으로 반환합니다(동점이면 입력 순서 유지)."""
+    scores = [
+        score_draft(text, tone=tone, target_keyword=target_keyword, target_chars=target_chars)
+        for tone, text in drafts.items()
+    ]
+    return sorted(scores, key=lambda s: s.total, reverse=True)
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+# 무거운 하위 시스템(LLM 스택: agent, 브라우저 크롤러: naver_map/crawl_cache)을 처음 쓸 때 가져오는 얇은 진입점입니다.
+# app.py는 이 모듈만 가져오므로 첫 화면(폼)이 LangChain/Playwright import를 기다리지 않습니다.
+import argparse
+import importlib
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional
+
+from config import AppConfig
+from prompt import BlogInput
+
+
+# 백그라운드 예열(warm-up) 대상. crawl_cache는 naver_map을 함께 가져옵니다.
+WARMUP_MODULES = ("agent", "crawl_cache")
+# import 비용 보고서의 기본 대상(app은 첫 화면까지의 전체 비용)
+REPORT_MODULES = ("app", "ui", "agent", "crawl_cache", "naver_map", "rate_limit", "metrics")
+
+
+# ---- 지연 로딩 진입점 ------------------------------------------------------------
+
+def get_pipeline(config: AppConfig):
+    """agent.get_pipeline을 처음 호출할 때 LLM 스택을 가져옵니다."""
+    from agent import get_pipeline as _get_pipeline
+
+    return _get_pipeline(config)
+
+
+def start_fused_run(pipeline, user_input: BlogInput, *, use_cache: bool = True):
+    """원클릭 실행(agent.FusedRun)을 시작합니다."""
+    from agent import FusedRun
+
+    return FusedRun(pipeline, user_input, use_cache=use_cache)
+
+
+def crawl_and_compact(
+    map_url: str,
+    *,
+    max_chars_per_tab: Optional[int] = None,
+    check_cancelled: Optional[Callable[[], None]] = None,
+):
+    """캐시 우선으로 지도 탭을 수집하고, 프롬프트 입력용으로 줄인 (결과, 탭별 줄인 내역)을 반환합니다.
+
+    max_chars_per_tab을 주지 않으면 naver_map.DEFAULT_TAB_CHAR_BUDGET을 씁니다.
+    check_cancelled(취소 시 예외를 내는 함수)를 주면 수집과 정리 사이에 호출합니다.
+    """
+    from crawl_cache import cached_crawl_place_tabs
+    from naver_map import DEFAULT_TAB_CHAR_BUDGET, compact_crawled_data
+
+    crawled = cached_crawl_place_tabs(map_url)
+    if check_cancelled is not None:
+        check_cancelled()
+    budget = DEFAULT_TAB_CHAR_BUDGET if max_chars_per_tab is None else max_chars_per_tab
+    return compact_crawled_data(crawled, max_chars_per_tab=budget)
+
+
+def merge_blog_input_with_crawl(input_dict: dict[str, str], crawled) -> dict[str, str]:
+    from naver_map import merge_blog_input_with_crawl as _merge
+
+    return _merge(input_dict, crawled)
+
+
+# ---- 백그라운드 예열 -------------------------------------------------------------
+
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_lock = threading.Lock()
+_warmup_timings: dict[str, float] = {}
+
+
+def _warm(modules: tuple[str, ...]) -> None:
+    logger = logging.getLogger("blog_agent.warmup")
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception:
+            # 예열 실패는 무시합니다. 실제로 쓸 때 같은 오류가 사용자에게 보입니다.
+            logger.exception("%s 예열 실패", name)
+            continue
+        _warmup_timings[name] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("예열 완료: %s", _warmup_timings)
+
+
+def start_warmup(modules: Iterable[str] = WARMUP_MODULES) -> bool:
+    """무거운 모듈을 데몬 스레드에서 미리 가져옵니다. 프로세스당 한 번만 시작하며, 시작했으면 True.
+
+    APP_WARMUP=0이면 끕니다(메모리를 아끼거나 import 시간을 따로 잴 때). 예열 중에 사용자가 먼저 누르면
+    같은 모듈 import 잠금을 기다리므로, 두 번 가져오지 않고 남은 시간만 기다립니다.
+    """
+    global _warmup_thread
+    if os.getenv("APP_WARMUP", "1") == "0":
+        return False
+    with _warmup_lock:
+        if _warmup_thread is not None:
+            return False
+        _warmup_thread = threading.Thread(target=_warm, args=(tuple(modules),), name="warmup", daemon=True)
+        _warmup_thread.start()
+        return True
+
+
+def warmup_timings() -> dict[str, float]:
+    """예열로 가져온 모듈별 소요 시간(ms)입니다. 이미 가져온 모듈은 0에 가깝게 나옵니다."""
+    return dict(_warmup_timings)
+
+
+# ---- import 비용 보고서 ----------------------------------------------------------
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _parse_importtime(stderr: str) -> list[tuple[int, int, int, str]]:
+    """`-X importtime` 출력을 (self_us, cumulative_us, 깊이, 모듈) 목록으로 바꿉니다."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(self_us), int(cumulative_us), (len(indent) - 1) // 2, name))
+    return rows
+
+
+def measure_import(module: str, *, preload: Iterable[str] = ("streamlit",), top: int = 5) -> dict[str, Any]:
+    """새 인터프리터에서 module을 가져오는 비용과, 그 안에서 비싼 직속 import top개를 잽니다.
+
+    preload는 먼저 가져와 비용에서 빼는 모듈입니다(기본: Streamlit 앱이면 항상 로드된 streamlit).
+    """
+    statements = [f"import {name}" for name in preload] + [f"import {module}"]
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "; ".join(statements)],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env={**os.environ, "APP_WARMUP": "0"},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} import 실패: {proc.stderr.strip().splitlines()[-1:]}")
+    rows = _parse_importtime(proc.stderr)
+    matches = [i for i, row in enumerate(rows) if row[3] == module and row[2] == 0]
+    if not matches:
+        # preload가 이미 가져온 모듈입니다.
+        return {"module": module, "cumulative_ms": 0.0, "heaviest": []}
+    index = matches[-1]
+    cumulative_us = rows[index][1]
+    # 출력은 자식이 부모보다 먼저 나오므로, 부모 줄 바로 앞의 한 단계 깊은 줄들이 직속 import입니다.
+    children = []
+    for _self_us, child_us, depth, name in reversed(rows[:index]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children.append((name, round(child_us / 1000, 1)))
+    children.sort(key=lambda item: item[1], reverse=True)
+    return {"module": module, "cumulative_ms": round(cumulative_us / 1000, 1), "heaviest": children[:top]}
+
+
+def import_report(modules: Iterable[str] = REPORT_MODULES, **kwargs: Any) -> list[dict[str, Any]]:
+    return [measure_import(module, **kwargs) for module in modules]
+
+
+def format_import_report(report: list[dict[str, Any]]) -> str:
+    lines = []
+    for item in report:
+        lines.append(f"{item['module']:<12} {item['cumulative_ms']:>8.1f}ms")
+        for name, ms in item["heaviest"]:
+            lines.append(f"    {name:<40} {ms:>8.1f}ms")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="모듈별 import 비용(새 인터프리터 기준)을 보고합니다.")
+    parser.add_argument("modules", nargs="*", default=list(REPORT_MODULES), help="측정할 모듈")
+    parser.add_argument("--preload", default="streamlit", help="미리 가져와 비용에서 뺄 모듈(쉼표 구분)")
+    parser.add_argument("--top", type=int, default=5, help="모듈별로 보여줄 비싼 직속 import 수")
+    args = parser.parse_args()
+    preload = tuple(m.strip() for m in args.preload.split(",") if m.strip())
+    print(format_import_report(import_report(args.modules, preload=preload, top=args.top)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+# 네트워크 없이 파이프라인을 실행하기 위한 결정적(deterministic) 가짜 채팅 모델입니다.
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import Field
+
+from prompt import BLOG_WRITER_SYSTEM, COMMENT_WRITER_SYSTEM, PROMPT_BUILDER_SYSTEM
+from text_budget import estimate_tokens
+
+
+# 시스템 프롬프트로 어느 Agent의 호출인지 구분합니다(context 모드의 문체 prefix가 앞에 붙어도 동작).
+_STAGE_SYSTEMS = {
+    "prompt_builder_agent": PROMPT_BUILDER_SYSTEM,
+    "blog_writer_agent": BLOG_WRITER_SYSTEM,
+    "comment_writer_agent": COMMENT_WRITER_SYSTEM,
+}
+
+DEFAULT_RESPONSES = {
+    "prompt_builder_agent": (
+        "가족 외식 후기를 정보 전달형 톤으로 작성하라. 제공된 정보 범위 내에서만 작성할 것.\n"
+        "영업시간, 주차, 메뉴 정보를 표로 정리하고, 음식의 식감과 온도, 간을 구체적으로 묘사하라.\n"
+        "확인되지 않은 사실, 과장, 추측성 서술은 쓰지 말 것.\n" * 6
+    ).strip(),
+    "blog_writer_agent": "\n\n".join(
+        [
+            "안녕하세요? MD우쿤입니다.",
+            "주말에 가족과 함께 가평 카페를 다녀왔답니다. " * 8,
+            "⏰ 영업시간은 매일 09:00-20:00이고, 🅿️ 주차는 매장 앞 전용 주차장을 이용할 수 있었는데요.",
+            "매장 내부는 통창으로 햇살이 잘 들어와 아이들과 머물기 편안했답니다. " * 8,
+            "메뉴는 시그니처 라떼와 수제 케이크가 대표적이었는데요. " * 8,
+            "라떼는 고소함이 먼저 느껴지고 끝맛이 깔끔해서 자꾸 손이 가는 맛이었답니다. " * 10,
+            "부모님과 아이 모두 만족한 곳이라 다음에도 다시 방문하고 싶답니다.",
+        ]
+    ),
+    "comment_writer_agent": "\n".join(
+        [
+            "1. 사진만 봐도 분위기가 느껴지네요.",
+            "2. 주차 정보가 있어서 가족끼리 가기 좋겠어요.",
+            "3. 라떼 설명 보니 꼭 마셔보고 싶어요.",
+            "4. 아이랑 가기 좋은 곳 찾고 있었는데 감사합니다.",
+            "5. 다음 주말에 부모님 모시고 가봐야겠어요.",
+        ]
+    ),
+}
+
+
+def detect_stage(messages: list[BaseMessage]) -> str:
+    system = next((str(m.content) for m in messages if m.type == "system"), "")
+    for stage, marker in _STAGE_SYSTEMS.items():
+        if marker in system:
+            return stage
+    return "unknown"
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Agent별로 정해 둔 응답을 돌려주는 가짜 모델입니다. BlogAgentPipeline(llm=...)으로 주입합니다.
+
+    - responses: Agent 이름 -> 최종 응답(없으면 DEFAULT_RESPONSES)
+    - call_tools: 도구가 연결된 Agent는 첫 호출에서 연결된 도구를 모두 호출한 뒤, 도구 결과를 받고 응답합니다.
+    - latency: 호출마다 기다리는 시간(초). 스트리밍이면 첫 조각 전에 기다립니다.
+    - usage_metadata는 text_budget.estimate_tokens로 추정해 채웁니다.
+    """
+
+    responses: dict[str, str] = Field(default_factory=dict)
+    call_tools: bool = True
+    latency: float = 0.0
+    stream_chunk_chars: int = 40
+    tool_names: list[str] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self.model_copy(update={"tool_names": [convert_to_openai_tool(t)["function"]["name"] for t in tools]})
+
+    def _reply(self, messages: list[BaseMessage]) -> AIMessage:
+        stage = detect_stage(messages)
+        input_tokens = estimate_tokens("\n".join(str(m.content) for m in messages))
+        if self.call_tools and self.tool_names and not any(m.type == "tool" for m in messages):
+            tool_calls = [
+                {"name": name, "args": {"query": stage}, "id": f"call_{stage}_{i}", "type": "tool_call"}
+                for i, name in enumerate(self.tool_names)
+            ]
+            usage = {"input_tokens": input_tokens, "output_tokens": 10, "total_tokens": input_tokens + 10}
+            return AIMessage(content="", tool_calls=tool_calls, usage_metadata=usage)
+        text = self.responses.get(stage) or DEFAULT_RESPONSES.get(stage, "ok")
+        output_tokens = estimate_tokens(text)
+        usage = {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+        return AIMessage(content=text, usage_metadata=usage)
+
+    def _chunks(self, message: AIMessage) -> Iterator[ChatGenerationChunk]:
+        if message.tool_calls:
+            tool_call_chunks = [
+                {"name": tc["name"], "args": json.dumps(tc["args"]), "id": tc["id"], "index": i}
+                for i, tc in enumerate(message.tool_calls)
+            ]
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content="", tool_call_chunks=tool_call_chunks, usage_metadata=message.usage_metadata
+                )
+            )
+            return
+        text = str(message.content)
+        step = max(1, self.stream_chunk_chars)
+        for start in range(0, len(text), step):
+            last = start + step >= len(text)
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content=text[start : start + step], usage_metadata=message.usage_metadata if last else None
+                )
+            )
+
+    def _generate(
+        self, messages: list[BaseMessage], stop: Optional[list[str]] = None, run_manager=None, **kwargs: Any
+    ) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+    async def _agenerate(
+        self, messages: list[BaseMessage], stop: Optional[list[str]] = None, run_manager=None, **kwargs: Any
+    ) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+    def _stream(
+        self, messages: list[BaseMessage], stop: Optional[list[str]] = None, run_manager=None, **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        if self.latency:
+            time.sleep(self.latency)
+        for chunk in self._chunks(self._reply(messages)):
+            if run_manager is not None:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self, messages: list[BaseMessage], stop: Optional[list[str]] = None, run_manager=None, **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        for chunk in self._chunks(self._reply(messages)):
+            if run_manager is not None:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+# 크롤링/LLM 생성을 Streamlit 스크립트 밖의 스레드 풀에서 실행하는 작업(Job) 관리자입니다.
+import contextvars
+import hmac
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from cancellation import JobCancelled
+
+
+class Job:
+    """제출된 작업 하나의 상태(status), 부분 결과(partial), 최종 결과(result)를 담습니다.
+
+    status: pending -> running -> done | failed | cancelled
+    작업 함수는 job.append/update로 부분 결과를 남기고, 긴 루프나 단계 사이에서는 job.check_cancelled()를 호출합니다.
+    취소가 요청된 뒤 끝난 작업은 결과와 상관없이 cancelled로 끝납니다.
+    """
+
+    def __init__(self, kind: str, owner: str = "", owner_token: str = "") -> None:
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.owner = owner
+        self.owner_token = owner_token
+        self.status = "pending"
+        self.partial: dict[str, Any] = {}
+        self.result: Any = None
+        self.error = ""
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+        self._future: Optional[Future] = None
+
+    @property
+    def done(self) -> bool:
+        return self._finished.is_set()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def update(self, **values: Any) -> None:
+        with self._lock:
+            self.partial.update(values)
+
+    def append(self, key: str, text: str) -> None:
+        with self._lock:
+            self.partial[key] = self.partial.get(key, "") + text
+
+    def get_partial(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self.partial.get(key, default)
+
+    def check_cancelled(self) -> None:
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def cancel(self) -> None:
+        """취소를 요청합니다. 대기 중이면 바로 취소되고, 실행 중이면 작업 함수가 다음 확인 시점에 멈춥니다."""
+        self._cancel.set()
+        if self._future is not None and self._future.cancel():
+            self._finish("cancelled")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """끝날 때까지(또는 timeout초) 기다리고, 끝났으면 True를 반환합니다."""
+        return self._finished.wait(timeout)
+
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def _run(self, fn: Callable[["Job"], Any]) -> None:
+        if self._cancel.is_set():
+            self._finish("cancelled")
+            return
+        self.status = "running"
+        self.started_at = time.time()
+        try:
+            result = fn(self)
+        except JobCancelled:
+            self._finish("cancelled")
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self._finish("failed")
+        else:
+            if self._cancel.is_set():
+                # 취소 확인 시점 없이 끝난 작업도 취소 요청이 있었으면 결과를 버립니다.
+                self._finish("cancelled")
+                return
+            self.result = result
+            self._finish("done")
+
+    def _finish(self, status: str) -> None:
+        self.status = status
+        self.finished_at = time.time()
+        self._finished.set()
+
+
+class JobManager:
+    """작업을 스레드 풀에서 실행하고 ID로 다시 찾을 수 있게 보관합니다.
+
+    Playwright sync 객체와 LangChain 클라이언트는 프로세스 간에 넘길 수 없으므로 프로세스 풀이 아닌
+    스레드 풀을 씁니다(대기 시간 대부분이 네트워크/브라우저 I/O라 GIL 영향이 작음).
+    끝난 작업은 ttl_seconds 동안 남겨 두어, 새로고침 등으로 세션이 바뀌어도 ID로 결과를 가져갈 수 있습니다.
+    """
+
+    def __init__(self, max_workers: int = 8, *, ttl_seconds: float = 3600) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers는 1 이상이어야 합니다.")
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn: Callable[[Job], Any], *, owner: str = "", owner_token: str = "") -> Job:
+        """fn(job)을 백그라운드에서 실행합니다.
+
+        제출한 스레드의 contextvars(스케줄러 세션 등)를 그대로 이어받아, 작업 안의 Gemini 호출도
+        제출한 세션 몫으로 스케줄링되고 지표도 그 세션에 기록됩니다.
+        owner_token을 주면 get(job_id, owner_token=...)으로 같은 토큰을 낸 쪽만 작업을 다시 찾을 수 있습니다.
+        """
+        job = Job(kind, owner, owner_token)
+        ctx = contextvars.copy_context()
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        job._future = self._executor.submit(ctx.run, job._run, fn)
+        return job
+
+    def get(self, job_id: str, *, owner_token: Optional[str] = None) -> Optional[Job]:
+        """ID로 작업을 찾습니다. owner_token을 주면 제출할 때의 토큰과 다를 때 None을 반환합니다."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or owner_token is None:
+            return job
+        if not job.owner_token or not hmac.compare_digest(job.owner_token, owner_token):
+            return None
+        return job
+
+    def jobs(self, owner: Optional[str] = None) -> list[Job]:
+        with self._lock:
+            return [job for job in self._jobs.values() if owner is None or job.owner == owner]
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        for job_id in [j.id for j in self._jobs.values() if j.finished_at is not None and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def shutdown(self, *, cancel: bool = True) -> None:
+        if cancel:
+            for job in self.jobs():
+                job.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=cancel)
+
+
+_shared_manager: Optional[JobManager] = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """프로세스 전역 작업 관리자를 반환합니다. 동시 실행 수는 JOB_WORKERS(기본 8)로 조정합니다."""
+    global _shared_manager
+    with _shared_manager_lock:
+        if _shared_manager is None:
+            _shared_manager = JobManager(
+                max_workers=int(os.getenv("JOB_WORKERS", "8")),
+                ttl_seconds=float(os.getenv("JOB_TTL_SECONDS", "3600")),
+            )
+        return _shared_manager
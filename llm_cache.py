@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+# LLM 응답을 입력 내용 해시 기준으로 디스크(SQLite)에 캐시합니다.
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Optional
+
+from config import CACHE_DIR
+
+
+def response_key(
+    *, model: str, temperature: float, system_prompt: str, tools: list[Any], user_message: str
+) -> str:
+    """(모델, temperature, 시스템 프롬프트, 도구 구성, 사용자 메시지)의 내용 해시를 만듭니다."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "temperature": temperature,
+            "system_prompt": system_prompt,
+            "tools": tools,
+            "user_message": user_message,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """content-addressed LLM 응답 캐시입니다.
+
+    저장된 응답 텍스트의 총 바이트가 max_bytes를 넘으면 가장 오래 조회되지 않은 항목부터 지웁니다.
+    """
+
+    def __init__(
+        self, path: Path | str = CACHE_DIR / "llm_responses.sqlite3", *, max_bytes: int = 64 * 1024 * 1024
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    stage TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock, closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT response FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str, *, stage: str = "") -> None:
+        """빈 응답은 실패로 보고 저장하지 않습니다."""
+        if not response.strip():
+            return
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, stage, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, stage, response, size, now, now),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims: list[tuple[str]] = []
+        for key, size in conn.execute("SELECT key, size FROM llm_responses ORDER BY accessed_at ASC"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM llm_responses WHERE key = ?", victims)
+
+    def clear(self) -> None:
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM llm_responses")
+
+    def stats(self) -> dict[str, int]:
+        with self._lock, closing(self._connect()) as conn:
+            entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": total}
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """프로세스 전역 LLM 응답 캐시를 반환합니다."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+# 단계별 소요 시간/토큰/도구 호출/캐시 적중을 span 단위로 기록하고, 교체 가능한 sink로 내보냅니다.
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterator, Optional, Protocol
+
+from cancellation import JobCancelled
+from config import CACHE_DIR
+from rate_limit import current_scheduler_session
+
+
+# 실패가 아니라 중단으로 기록할 예외: 제너레이터를 끝까지 읽지 않고 닫음, 작업/태스크 취소
+_CANCEL_EXCEPTIONS = (GeneratorExit, JobCancelled, asyncio.CancelledError)
+
+
+class MetricsSink(Protocol):
+    def emit(self, record: dict[str, Any]) -> None: ...
+
+
+class Span:
+    """OpenTelemetry span과 같은 모양(trace_id/span_id/parent_id/시작·종료 시각/attributes)의 기록 단위입니다."""
+
+    def __init__(self, name: str, *, trace_id: str, parent_id: Optional[str], attributes: dict[str, Any]) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "ok"
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration_ms = 0.0
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def add(self, key: str, value: float) -> None:
+        self.attributes[key] = self.attributes.get(key, 0) + value
+
+    def to_record(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class JsonLinesSink:
+    """span 하나를 JSON 한 줄로 파일에 덧붙입니다."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def emit(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock, self.path.open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class LoggingSink:
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:
+        self.logger = logger or logging.getLogger("blog_agent.metrics")
+        self.level = level
+
+    def emit(self, record: dict[str, Any]) -> None:
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, json.dumps(record, ensure_ascii=False, default=str))
+
+
+class SessionSummarySink:
+    """세션별 최근 span을 메모리에 보관하고 사이드바용 요약을 만듭니다."""
+
+    def __init__(self, max_spans_per_session: int = 500, max_sessions: int = 200) -> None:
+        self.max_spans_per_session = max_spans_per_session
+        self.max_sessions = max_sessions
+        self._spans: dict[str, deque[dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, record: dict[str, Any]) -> None:
+        session = record["attributes"].get("session", "default")
+        with self._lock:
+            spans = self._spans.pop(session, None) or deque(maxlen=self.max_spans_per_session)
+            spans.append(record)
+            self._spans[session] = spans  # 최근에 기록된 세션을 뒤로 보냅니다.
+            while len(self._spans) > self.max_sessions:
+                self._spans.pop(next(iter(self._spans)))
+
+    def summary(self, session: str) -> dict[str, dict[str, float]]:
+        """{span 이름(단계): {count, avg_ms, max_ms, input_tokens, output_tokens, tool_calls, cache_hits, errors}}"""
+        with self._lock:
+            spans = list(self._spans.get(session, ()))
+        out: dict[str, dict[str, float]] = {}
+        for record in spans:
+            attrs = record["attributes"]
+            key = attrs.get("stage") or record["name"]
+            row = out.setdefault(
+                key,
+                {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "input_tokens": 0, "output_tokens": 0,
+                 "tool_calls": 0, "cache_hits": 0, "errors": 0},
+            )
+            row["count"] += 1
+            row["total_ms"] += record["duration_ms"]
+            row["max_ms"] = max(row["max_ms"], record["duration_ms"])
+            row["input_tokens"] += attrs.get("input_tokens", 0)
+            row["output_tokens"] += attrs.get("output_tokens", 0)
+            row["tool_calls"] += attrs.get("tool_calls", 0)
+            row["cache_hits"] += 1 if attrs.get("cache_hit") else 0
+            row["errors"] += 1 if record["status"] == "error" else 0
+        for row in out.values():
+            row["avg_ms"] = round(row.pop("total_ms") / row["count"], 1)
+            row["max_ms"] = round(row["max_ms"], 1)
+        return out
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("metrics_span", default=None)
+
+
+class Tracer:
+    def __init__(self, sinks: Optional[list[MetricsSink]] = None) -> None:
+        self.sinks: list[MetricsSink] = list(sinks or [])
+
+    def add_sink(self, sink: MetricsSink) -> None:
+        self.sinks.append(sink)
+
+    @contextmanager
+    def span(self, name: str, *, activate: bool = True, **attributes: Any) -> Iterator[Span]:
+        """블록 실행 시간을 span으로 기록합니다. 예외가 나면 status=error로 남기고 다시 던집니다.
+
+        제너레이터 닫힘(GeneratorExit)과 취소(JobCancelled, asyncio.CancelledError)는 오류로 세지 않고
+        status=cancelled로 남깁니다.
+
+        activate=False이면 하위 span의 부모로 등록하지 않습니다(제너레이터처럼 yield 사이에서
+        컨텍스트가 바뀌는 곳에서 사용).
+        """
+        parent = _current_span.get()
+        attributes.setdefault("session", current_scheduler_session())
+        span = Span(
+            name,
+            trace_id=parent.trace_id if parent is not None else uuid.uuid4().hex,
+            parent_id=parent.span_id if parent is not None else None,
+            attributes=attributes,
+        )
+        token = _current_span.set(span) if activate else None
+        try:
+            yield span
+        except _CANCEL_EXCEPTIONS:
+            span.status = "cancelled"
+            raise
+        except BaseException as e:
+            span.status = "error"
+            span.set(error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            if token is not None:
+                _current_span.reset(token)
+            span.duration_ms = round((time.perf_counter() - span._started) * 1000, 1)
+            record = span.to_record()
+            for sink in self.sinks:
+                try:
+                    sink.emit(record)
+                except Exception:
+                    # 지표 기록 실패가 본 작업을 깨뜨리지 않도록 합니다.
+                    logging.getLogger("blog_agent.metrics").exception("metrics sink 실패")
+
+
+_shared_tracer: Optional[Tracer] = None
+_session_summary = SessionSummarySink()
+_shared_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """프로세스 전역 tracer를 반환합니다.
+
+    기본 sink: 세션 요약(메모리), 로거(blog_agent.metrics), METRICS_JSONL 경로(기본 .cache/metrics.jsonl, 빈 값이면 끔).
+    """
+    global _shared_tracer
+    with _shared_tracer_lock:
+        if _shared_tracer is None:
+            sinks: list[MetricsSink] = [_session_summary, LoggingSink()]
+            path = os.getenv("METRICS_JSONL", str(CACHE_DIR / "metrics.jsonl")).strip()
+            if path:
+                sinks.append(JsonLinesSink(path))
+            _shared_tracer = Tracer(sinks)
+        return _shared_tracer
+
+
+def session_summary(session: Optional[str] = None) -> dict[str, dict[str, float]]:
+    """세션(기본: 현재 스케줄러 세션)의 단계별 지표 요약을 반환합니다."""
+    return _session_summary.summary(session or current_scheduler_session())
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+# 브라우저 없이 pcmap.place.naver.com 페이지를 가져오고 파싱하는 HTTP 경로를 담당합니다.
+import gzip
+import http.client
+import re
+import threading
+import zlib
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Callable
+from urllib.parse import urljoin, urlsplit
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    status: int
+    url: str
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    def text(self) -> str:
+        match = re.search(r"charset=([\w-]+)", self.headers.get("content-type", ""), re.I)
+        return self.body.decode(match.group(1) if match else "utf-8", errors="replace")
+
+
+def _decode_body(body: bytes, encoding: str) -> bytes:
+    """Content-Encoding에 맞춰 본문을 풉니다. 빈 본문(HEAD, 304 등)은 그대로 둡니다.
+
+    deflate는 zlib 헤더가 있는 형식이 표준이지만 헤더 없는 raw deflate를 보내는 서버도 있어 둘 다 받습니다.
+    """
+    if not body:
+        return body
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+            return decoder.decompress(body) + decoder.flush()
+    return body
+
+
+class KeepAliveClient:
+    """호스트별 keep-alive 연결을 스레드마다 재사용하는 최소 HTTP 클라이언트입니다.
+
+    http.client 연결은 스레드 안전하지 않으므로 스레드 로컬에 (scheme, host, port)별로 보관합니다.
+    끊긴 연결은 한 번 새로 맺어 재시도하고, 리다이렉트는 max_redirects까지 직접 따라갑니다.
+    """
+
+    def __init__(self, *, timeout: float = 10, headers: dict[str, str] | None = None, max_redirects: int = 5) -> None:
+        self.timeout = timeout
+        self.headers = {"Accept-Encoding": "gzip, deflate", **(headers or {})}
+        self.max_redirects = max_redirects
+        self._local = threading.local()
+
+    def _connection(self, scheme: str, host: str, port: int | None) -> http.client.HTTPConnection:
+        conns = self._local.__dict__.setdefault("conns", {})
+        key = (scheme, host, port)
+        conn = conns.get(key)
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = cls(host, port, timeout=self.timeout)
+            conns[key] = conn
+        return conn
+
+    def _drop(self, scheme: str, host: str, port: int | None) -> None:
+        conn = self._local.__dict__.get("conns", {}).pop((scheme, host, port), None)
+        if conn is not None:
+            conn.close()
+
+    def _send(self, method: str, url: str, *, read_body: bool) -> HttpResponse:
+        parts = urlsplit(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        for attempt in range(2):
+            conn = self._connection(parts.scheme, parts.hostname or "", parts.port)
+            try:
+                conn.request(method, path, headers=self.headers)
+                resp = conn.getresponse()
+                headers = {k.lower(): v for k, v in resp.getheaders()}
+                if read_body or method == "HEAD" or 300 <= resp.status < 400:
+                    body = resp.read()
+                else:
+                    # 본문이 필요 없으면 연결을 재사용하지 않고 닫아 다운로드를 끊습니다.
+                    body = b""
+                    self._drop(parts.scheme, parts.hostname or "", parts.port)
+                break
+            except (http.client.HTTPException, ConnectionError, OSError):
+                self._drop(parts.scheme, parts.hostname or "", parts.port)
+                if attempt:
+                    raise
+        body = _decode_body(body, headers.get("content-encoding", ""))
+        return HttpResponse(status=resp.status, url=url, headers=headers, body=body)
+
+    def request(self, method: str, url: str, *, read_body: bool = True) -> HttpResponse:
+        """요청을 보내고 리다이렉트를 따라간 최종 응답을 반환합니다."""
+        for _ in range(self.max_redirects + 1):
+            resp = self._send(method, url, read_body=read_body)
+            location = resp.headers.get("location")
+            if 300 <= resp.status < 400 and location:
+                url = urljoin(url, location)
+                continue
+            return resp
+        raise RuntimeError(f"리다이렉트가 너무 많습니다: {url}")
+
+    def resolve(self, url: str, *, until: Callable[[str], bool] | None = None) -> str:
+        """본문을 받지 않고 리다이렉트만 따라가 최종 URL을 반환합니다.
+
+        HEAD를 우선 쓰고, 서버가 HEAD를 거부하면(405/501) 본문을 읽지 않는 GET으로 한 번 더 시도합니다.
+        until(url)이 참이 되는 URL을 만나면 남은 리다이렉트를 따라가지 않고 바로 반환합니다.
+        """
+        method = "HEAD"
+        for _ in range(self.max_redirects + 1):
+            if until is not None and until(url):
+                return url
+            resp = self._send(method, url, read_body=False)
+            if method == "HEAD" and resp.status in (405, 501):
+                method = "GET"
+                resp = self._send(method, url, read_body=False)
+            location = resp.headers.get("location")
+            if 300 <= resp.status < 400 and location:
+                url = urljoin(url, location)
+                continue
+            if resp.status >= 400:
+                raise RuntimeError(f"HTTP {resp.status}: {url}")
+            return url
+        raise RuntimeError(f"리다이렉트가 너무 많습니다: {url}")
+
+    def get_text(self, url: str) -> tuple[str, str]:
+        """GET 후 (최종 URL, 본문 텍스트)를 반환합니다. 2xx가 아니면 RuntimeError."""
+        resp = self.request("GET", url)
+        if not 200 <= resp.status < 300:
+            raise RuntimeError(f"HTTP {resp.status}: {url}")
+        return resp.url, resp.text()
+
+
+# innerText와 비슷하게 줄바꿈을 넣을 블록 요소
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "figcaption", "figure",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+    "ol", "p", "pre", "section", "table", "tr", "ul", "br",
+}
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg"}
+
+
+class _PlaceHTMLParser(HTMLParser):
+    """서버 렌더링된 장소 페이지에서 `.place_section` 블록과 `a[role="tab"]` 링크를 추출합니다.
+
+    브라우저 크롤러의 JS와 같은 규칙(섹션 제목은 h2/h3/.place_section_header/.place_section_title 중
+    첫 요소)을 따르며, 중첩된 섹션은 innerText처럼 바깥 섹션 텍스트에도 포함됩니다.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.blocks: list[dict[str, list[str]]] = []
+        self.tab_links: dict[str, str] = {}
+        self._stack: list[tuple[str, dict[str, object]]] = []
+        self._open_sections: list[dict[str, list[str]]] = []
+        self._title_targets: list[dict[str, list[str]]] = []
+        self._tab_link: tuple[str, list[str]] | None = None
+        self._skip_depth = 0
+
+    def _emit(self, text: str) -> None:
+        for block in self._open_sections:
+            block["parts"].append(text)
+        for block in self._title_targets:
+            block["title"].append(text)
+        if self._tab_link is not None:
+            self._tab_link[1].append(text)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attr = {k: (v or "") for k, v in attrs}
+        classes = set(attr.get("class", "").split())
+        if tag in _BLOCK_TAGS:
+            self._emit("\n")
+        if tag in _VOID_TAGS:
+            return
+
+        marks: dict[str, object] = {}
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+            marks["skip"] = True
+        if "place_section" in classes:
+            block: dict[str, list[str]] = {"title": [], "parts": [], "has_title": []}
+            self.blocks.append(block)
+            self._open_sections.append(block)
+            marks["section"] = block
+        is_title = tag in {"h2", "h3"} or bool(classes & {"place_section_header", "place_section_title"})
+        if is_title:
+            for block in self._open_sections:
+                if not block["has_title"]:
+                    block["has_title"].append("1")
+                    self._title_targets.append(block)
+                    marks.setdefault("titles", []).append(block)  # type: ignore[union-attr]
+        if tag == "a" and attr.get("role") == "tab" and attr.get("href"):
+            self._tab_link = (attr["href"], [])
+            marks["tab"] = True
+        self._stack.append((tag, marks))
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _VOID_TAGS:
+            return
+        # 닫히지 않은 요소가 있어도 가장 가까운 같은 태그까지 정리합니다.
+        if not any(open_tag == tag for open_tag, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, marks = self._stack.pop()
+            self._close(marks)
+            if open_tag == tag:
+                break
+        if tag in _BLOCK_TAGS:
+            self._emit("\n")
+
+    def _close(self, marks: dict[str, object]) -> None:
+        if marks.get("skip"):
+            self._skip_depth -= 1
+        section = marks.get("section")
+        if section is not None:
+            self._open_sections.remove(section)  # type: ignore[arg-type]
+        for block in marks.get("titles", []):  # type: ignore[union-attr]
+            self._title_targets.remove(block)
+        if marks.get("tab") and self._tab_link is not None:
+            href, parts = self._tab_link
+            text = _inner_text(parts)
+            if text:
+                self.tab_links.setdefault(text, href)
+            self._tab_link = None
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        self._emit(re.sub(r"\s+", " ", data))
+
+
+def _inner_text(parts: list[str]) -> str:
+    lines = (line.strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def parse_place_html(html: str) -> tuple[list[dict[str, str]], dict[str, str]]:
+    """장소 페이지 HTML을 ([{title, text}], {탭 라벨: href})로 변환합니다."""
+    parser = _PlaceHTMLParser()
+    parser.feed(html)
+    parser.close()
+    blocks = []
+    for block in parser.blocks:
+        text = _inner_text(block["parts"])
+        if text:
+            blocks.append({"title": _inner_text(block["title"]), "text": text})
+    return blocks, parser.tab_links
@@ -1,23 +1,41 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import re
 import sys
-from dataclasses import dataclass
-from urllib.parse import urljoin
-from urllib.parse import urlparse
-from urllib.request import Request, urlopen
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator
+from urllib.parse import urljoin, urlparse
+
+from browser_pool import BrowserPool, get_browser_pool
+from config import AppConfig
+from metrics import Span, get_tracer
+from naver_http import KeepAliveClient, parse_place_html
+from progress import progress_emitter
+from short_links import ShortLinkResolver, is_short_link, match_place_id
+from text_budget import compact_text
 
 try:
     from playwright.sync_api import sync_playwright
 except Exception:  # pragma: no cover - runtime optional dependency
     sync_playwright = None
 
+try:
+    from playwright.async_api import async_playwright
+except Exception:  # pragma: no cover - runtime optional dependency
+    async_playwright = None
+
 
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
 )
+_CONTEXT_OPTIONS = {"user_agent": USER_AGENT, "locale": "ko-KR"}
 
 
 @dataclass(frozen=True)
@@ -28,32 +46,176 @@ class CrawledPlaceData:
     menu_text: str
     info_text: str
     news_text: str
+    # 동시 수집 모드에서 실패한 탭과 오류 메시지(탭 키 -> 메시지)
+    tab_errors: dict[str, str] = field(default_factory=dict)
+    # 단계별 실제 대기 시간(ms). 부하 상황에서 대기 전략을 조정할 때 참고합니다.
+    wait_timings_ms: dict[str, int] = field(default_factory=dict)
+    # 크롤 프로필의 요청 차단/전송량 집계(요청 수, 바이트)
+    network_stats: dict[str, int] = field(default_factory=dict)
+    # 수집 경로: "http"(브라우저 없이), "browser", "http+browser"(일부 탭만 브라우저로 보완)
+    fetch_mode: str = "browser"
+
+
+TAB_LABELS = {"홈": "home", "메뉴": "menu", "정보": "info", "소식": "news"}
+
+
+@dataclass(frozen=True)
+class CrawlProfile:
+    """크롤링 중 가로챌 요청 규칙입니다.
+
+    텍스트(innerText)만 필요하므로 이미지/폰트/미디어와 분석·광고 호스트 요청을 차단합니다.
+    allowed_hosts에 속한 호스트는 어떤 규칙에도 차단되지 않습니다.
+    호스트 규칙은 정확히 같거나 하위 도메인인 경우에 적용됩니다.
+    """
+
+    blocked_resource_types: frozenset[str] = frozenset({"image", "media", "font"})
+    blocked_hosts: tuple[str, ...] = (
+        "lcs.naver.com",
+        "wcs.naver.net",
+        "tivan.naver.com",
+        "veta.naver.com",
+        "nelo2-col.navercorp.com",
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+    )
+    allowed_hosts: tuple[str, ...] = ()
+    # 차단으로 아낀 바이트 추정치를 계산할 때 쓰는 리소스 유형별 평균 크기(바이트)
+    estimated_sizes: tuple[tuple[str, int], ...] = (
+        ("image", 40_000),
+        ("media", 300_000),
+        ("font", 50_000),
+        ("stylesheet", 20_000),
+        ("script", 30_000),
+    )
+    default_estimated_size: int = 1_000
+
+
+LEAN_PROFILE = CrawlProfile()
+
+
+def _host_matches(host: str, rules: tuple[str, ...]) -> bool:
+    return any(host == rule or host.endswith("." + rule) for rule in rules)
+
+
+class _NetworkStats:
+    """프로필 적용 결과(차단 요청 수, 절약 바이트 추정치, 실제 전송 바이트)를 집계합니다."""
+
+    def __init__(self, profile: CrawlProfile) -> None:
+        self.profile = profile
+        self._sizes = dict(profile.estimated_sizes)
+        self.counts: dict[str, int] = {
+            "allowed_requests": 0,
+            "blocked_requests": 0,
+            "estimated_bytes_saved": 0,
+            "transferred_bytes": 0,
+        }
+
+    def should_block(self, request) -> bool:
+        host = (urlparse(request.url).hostname or "").lower()
+        blocked_by = ""
+        if not _host_matches(host, self.profile.allowed_hosts):
+            if request.resource_type in self.profile.blocked_resource_types:
+                blocked_by = request.resource_type
+            elif _host_matches(host, self.profile.blocked_hosts):
+                blocked_by = "host"
+
+        if not blocked_by:
+            self.counts["allowed_requests"] += 1
+            return False
+        self.counts["blocked_requests"] += 1
+        self.counts[f"blocked:{blocked_by}"] = self.counts.get(f"blocked:{blocked_by}", 0) + 1
+        self.counts["estimated_bytes_saved"] += self._sizes.get(
+            request.resource_type, self.profile.default_estimated_size
+        )
+        return True
+
+    def record_response(self, response) -> None:
+        try:
+            self.counts["transferred_bytes"] += int(response.headers.get("content-length") or 0)
+        except (TypeError, ValueError):
+            pass
+
+
+def _install_profile(context, stats: _NetworkStats) -> None:
+    def handle(route) -> None:
+        if stats.should_block(route.request):
+            route.abort()
+        else:
+            route.fallback()
+
+    context.route("**/*", handle)
+    context.on("response", stats.record_response)
+
+
+async def _ainstall_profile(context, stats: _NetworkStats) -> None:
+    async def handle(route) -> None:
+        if stats.should_block(route.request):
+            await route.abort()
+        else:
+            await route.fallback()
+
+    await context.route("**/*", handle)
+    context.on("response", stats.record_response)
+
+
+_short_link_resolver: ShortLinkResolver | None = None
+_short_link_lock = threading.Lock()
+
+
+def get_short_link_resolver() -> ShortLinkResolver:
+    """프로세스 전역 단축 URL 해석기를 반환합니다(HTTP 경로와 keep-alive 연결을 공유)."""
+    global _short_link_resolver
+    with _short_link_lock:
+        if _short_link_resolver is None:
+            _short_link_resolver = ShortLinkResolver(_HTTP_CLIENT)
+        return _short_link_resolver
 
 
 def extract_place_id(url: str) -> str:
-    """네이버 지도/단축 URL에서 placeId를 추출합니다."""
+    """네이버 지도/단축 URL에서 placeId를 추출합니다.
+
+    naver.me 단축 URL은 본문을 받지 않고 리다이렉트만 따라가며, 해석 결과는 캐시됩니다.
+    """
     if not url.strip():
         raise ValueError("네이버 지도 URL이 비어 있습니다.")
 
     raw = url.strip()
-    parsed = urlparse(raw)
-    host = parsed.netloc.lower()
-    if "naver.me" in host:
-        req = Request(raw, headers={"User-Agent": USER_AGENT})
-        with urlopen(req, timeout=10) as resp:
-            raw = resp.geturl()
-
-    patterns = [
-        r"/entry/place/(\d+)",
-        r"/place/(\d+)",
-        r"placeId=(\d+)",
-    ]
-    for p in patterns:
-        m = re.search(p, raw)
-        if m:
-            return m.group(1)
-
-    raise ValueError("URL에서 placeId를 찾지 못했습니다.")
+    if is_short_link(raw):
+        return get_short_link_resolver().resolve(raw)
+
+    place_id = match_place_id(raw)
+    if place_id is None:
+        raise ValueError("URL에서 placeId를 찾지 못했습니다.")
+    return place_id
+
+
+def resolve_place_ids(urls: Iterable[str], *, max_workers: int = 8) -> tuple[dict[str, str], dict[str, str]]:
+    """여러 URL의 placeId를 한 번에 구해 ({URL: placeId}, {URL: 오류})를 반환합니다.
+
+    일반 지도 URL은 바로 파싱하고, 단축 URL만 모아 병렬로 해석합니다.
+    """
+    resolved: dict[str, str] = {}
+    errors: dict[str, str] = {}
+    short: list[str] = []
+    for url in urls:
+        if is_short_link(url):
+            short.append(url)
+            continue
+        try:
+            resolved[url] = extract_place_id(url)
+        except ValueError as e:
+            errors[url] = f"{type(e).__name__}: {e}"
+    if short:
+        short_resolved, short_errors = get_short_link_resolver().resolve_many(
+            [u.strip() for u in short], max_workers=max_workers
+        )
+        for url in short:
+            if url.strip() in short_resolved:
+                resolved[url] = short_resolved[url.strip()]
+            else:
+                errors[url] = short_errors.get(url.strip(), "")
+    return resolved, errors
 
 
 def _normalize_text(text: str) -> str:
@@ -62,41 +224,15 @@ def _normalize_text(text: str) -> str:
     return text.strip()
 
 
-def _extract_visible_panel_text(frame) -> str:
-    script = """
-() => {
-  const selectors = [
-    '.place_section',
-    '.place_section_content',
-    '#app-root',
-    '#_pcmap_list_scroll_container',
-    '.place_section',
-    '.place_section_content',
-    'body',
-  ];
-  let best = '';
-  for (const sel of selectors) {
-    const nodes = Array.from(document.querySelectorAll(sel));
-    for (const node of nodes) {
-      const txt = (node && node.innerText ? node.innerText.trim() : '');
-      if (txt.length > best.length) best = txt;
-    }
-  }
-  return best || '';
-}
-"""
-    return _normalize_text(frame.evaluate(script))
-
-
-def _get_place_frame(page):
-    for frame in page.frames:
-        if "pcmap.place.naver.com" in frame.url:
-            return frame
-    return None
+# ---- 프레임 안에서 실행하는 JS (sync/async 크롤러가 함께 사용합니다) -------------------
 
+# 패널 전체 텍스트(섹션을 못 찾았을 때의 대체 수집). body의 innerText는 어떤 하위 노드보다 길거나 같으므로
+# 후보 노드마다 innerText를 읽어 비교하지 않고 body를 한 번만 읽습니다.
+_VISIBLE_PANEL_SCRIPT = """
+() => ((document.body && document.body.innerText) || '').trim()
+"""
 
-def _extract_tab_links(frame) -> dict[str, str]:
-    script = """
+_TAB_LINKS_SCRIPT = """
 () => {
   const out = {};
   const links = Array.from(document.querySelectorAll('a[role="tab"]'));
@@ -109,62 +245,95 @@ def _extract_tab_links(frame) -> dict[str, str]:
   return out;
 }
 """
-    return frame.evaluate(script)
 
-
-def _expand_business_hours(frame) -> bool:
-    script = """
-() => {
-  const cands = Array.from(document.querySelectorAll('[aria-expanded="false"], a, button, [role="button"]'));
-  const target = cands.find((el) => {
-    const t = (el.innerText || '').trim();
+# 프레임당 한 번의 evaluate로 (필요 시) 영업시간 블록을 펼치고 변화가 반영될 때까지 기다린 뒤,
+# 섹션/탭 링크/대체 텍스트를 한 번에 반환합니다. 탭 링크는 순차 수집에서 홈 결과와 함께 쓰며,
+# 탭 로딩을 홈 수집보다 먼저 걸어야 하는 동시 수집은 _TAB_LINKS_SCRIPT를 따로 호출합니다. 토글 탐색은 레이아웃을 유발하지 않는 textContent로
+# 후보를 거른 뒤 글자가 맞는 요소만 화면에 그려졌는지 확인하고, innerText는 DOM 변경이 끝난 뒤 섹션마다 한 번씩만 읽습니다.
+_EXTRACT_FRAME_SCRIPT = """
+async ({ expandHours, waitMs }) => {
+  const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+  // textContent는 숨은 중복 노드(sr-only 라벨, display:none인 접힌 복사본)도 읽으므로,
+  // 보이지 않는 요소를 눌러 놓고 타임아웃까지 기다리지 않도록 실제로 그려진 요소만 고릅니다.
+  const isRendered = (el) => {
+    const rect = el.getBoundingClientRect();
+    return rect.width > 1 && rect.height > 1 && getComputedStyle(el).visibility !== 'hidden';
+  };
+  const findToggle = () => Array.from(
+    document.querySelectorAll('[aria-expanded="false"], a, button, [role="button"]')
+  ).find((el) => {
+    const t = (el.textContent || '').trim();
     if (!t) return false;
     const hasExpandWord = t.includes('펼쳐보기') || t.includes('더보기');
     const hasTimePattern = /\\b\\d{1,2}:\\d{2}\\b/.test(t) || t.includes('라스트오더');
-    return hasExpandWord && hasTimePattern;
+    return hasExpandWord && hasTimePattern && isRendered(el);
   });
-  if (target) {
-    target.click();
-    return true;
-  }
-  return false;
-}
-"""
-    try:
-        # lazy 렌더링 대응: 스크롤로 영업시간 블록 로드 유도
-        frame.evaluate(
-            """
-() => {
-  const box = document.querySelector('#_pcmap_list_scroll_container') || document.scrollingElement || document.documentElement;
-  if (!box) return;
-  const original = box.scrollTop || 0;
-  box.scrollTop = Math.min(500, (box.scrollHeight || 500));
-  box.scrollTop = original;
-}
-"""
-        )
-        return bool(frame.evaluate(script))
-    except Exception:
-        return False
 
+  const hoursStarted = performance.now();
+  let hoursExpanded = false;
+  if (expandHours) {
+    // lazy 렌더링 대응: 스크롤로 영업시간 블록 로드 유도
+    const box = document.querySelector('#_pcmap_list_scroll_container') || document.scrollingElement || document.documentElement;
+    if (box) {
+      const original = box.scrollTop || 0;
+      box.scrollTop = Math.min(500, (box.scrollHeight || 500));
+      box.scrollTop = original;
+    }
+    const deadline = performance.now() + waitMs;
+    let target = findToggle();
+    while (!target && performance.now() < deadline) {
+      await sleep(100);
+      target = findToggle();
+    }
+    if (target) {
+      const block = target.closest('.place_section') || target.parentElement || target;
+      const before = (block.textContent || '').length;
+      target.click();
+      hoursExpanded = true;
+      await new Promise((resolve) => {
+        let observer = null;
+        let timer = null;
+        const done = () => {
+          if (observer) observer.disconnect();
+          clearTimeout(timer);
+          resolve();
+        };
+        const check = () => {
+          if (block.querySelector('[aria-expanded="true"]') || (block.textContent || '').length > before) done();
+        };
+        observer = new MutationObserver(check);
+        observer.observe(block, { childList: true, subtree: true, attributes: true, characterData: true });
+        timer = setTimeout(done, Math.max(0, deadline - performance.now()));
+        check();
+      });
+    }
+  }
+  const hoursWaitMs = Math.round(performance.now() - hoursStarted);
 
-def _extract_tab_sections_text(frame) -> str:
-    script = """
-() => {
-  const blocks = [];
-  const sections = Array.from(document.querySelectorAll('.place_section'));
-  for (const section of sections) {
+  const sections = [];
+  for (const section of document.querySelectorAll('.place_section')) {
     const titleNode = section.querySelector('h2, h3, .place_section_header, .place_section_title');
     const title = (titleNode && titleNode.innerText ? titleNode.innerText : '').trim();
     const text = (section.innerText || '').trim();
     if (!text) continue;
-    blocks.push({ title, text });
+    sections.push({ title, text });
+  }
+
+  const tabLinks = {};
+  for (const a of document.querySelectorAll('a[role="tab"]')) {
+    const text = (a.innerText || '').trim();
+    const href = a.getAttribute('href') || '';
+    if (text && href) tabLinks[text] = href;
   }
-  return blocks;
+
+  const fallback = sections.length ? '' : ((document.body && document.body.innerText) || '').trim();
+  return { sections, tabLinks, fallback, hoursExpanded, hoursWaitMs };
 }
 """
-    blocks: list[dict[str, str]] = frame.evaluate(script)
 
+
+def _clean_section_blocks(blocks: list[dict[str, str]]) -> str:
+    """`.place_section` 블록 목록에서 버튼성/안내 블록을 걸러 하나의 텍스트로 합칩니다."""
     cleaned: list[str] = []
     for block in blocks:
         raw_title = (block.get("title") or "").strip()
@@ -193,14 +362,280 @@ def _extract_tab_sections_text(frame) -> str:
     return _normalize_text("\n\n".join(cleaned))
 
 
-def crawl_place_tabs(map_url: str, *, timeout_ms: int = 30000, headless: bool = True) -> CrawledPlaceData:
-    """네이버 지도 좌측 패널의 홈/메뉴/정보/소식 탭 텍스트를 브라우저 크롤링으로 수집합니다."""
-    if sync_playwright is None:
-        raise RuntimeError(
-            "playwright가 설치되어 있지 않습니다. "
-            "`pip install playwright && playwright install chromium` 를 먼저 실행하세요."
-        )
+def _get_place_frame(page):
+    for frame in page.frames:
+        if "pcmap.place.naver.com" in frame.url:
+            return frame
+    return None
+
+
+def _extract_tab_links(frame) -> dict[str, str]:
+    return frame.evaluate(_TAB_LINKS_SCRIPT)
+
+
+def _tab_urls(tab_links: dict[str, str], tabs: Iterable[str]) -> dict[str, str]:
+    """탭 이름→href 목록에서 수집할 홈 외 탭의 절대 URL을 고릅니다. 탭 자체가 없는 장소는 빠집니다."""
+    tab_urls: dict[str, str] = {}
+    for label, key in TAB_LABELS.items():
+        href = tab_links.get(label)
+        if key != "home" and key in tabs and href:
+            tab_urls[key] = urljoin("https://pcmap.place.naver.com", href)
+    return tab_urls
+
+
+def _payload_text(payload: dict[str, Any]) -> str | None:
+    """추출 결과에서 정리된 섹션 텍스트(없으면 대체 텍스트)를 고릅니다.
+
+    섹션은 있었지만 정리 후 모두 걸러진 경우에만 None을 반환해 대체 텍스트를 따로 읽게 합니다.
+    """
+    text = _clean_section_blocks(payload.get("sections") or [])
+    if text:
+        return text
+    if payload.get("sections"):
+        return None
+    return _normalize_text(payload.get("fallback") or "")
+
+
+# ---- 브라우저 없는 HTTP 경로 -------------------------------------------------------
+
+_HTTP_CLIENT = KeepAliveClient(
+    headers={
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml",
+        "Accept-Language": "ko-KR,ko;q=0.9",
+        "Referer": "https://map.naver.com/",
+    }
+)
+
+PageFetcher = Callable[[str], tuple[str, str]]
+
+
+def fetch_place_tabs_http(
+    place_id: str, *, tabs: Iterable[str] | None = None, fetch: PageFetcher | None = None
+) -> CrawledPlaceData:
+    """pcmap.place.naver.com의 서버 렌더링 HTML을 HTTP로 가져와 탭 텍스트를 만듭니다.
+
+    fetch(url) -> (최종 URL, HTML)을 바꿔 끼우면 녹화된 fixture로도 실행할 수 있습니다.
+    홈에서 섹션을 찾지 못하면 RuntimeError를 내고, 링크는 있는데 본문이 비어 있는 탭은
+    (클라이언트 렌더링으로 보고) `tab_errors`에 기록해 브라우저 경로가 보완하도록 합니다.
+    """
+    fetch = fetch or _HTTP_CLIENT.get_text
+    wanted = set(TAB_LABELS.values()) if tabs is None else set(tabs)
+    home_url, home_html = fetch(f"https://pcmap.place.naver.com/place/{place_id}/home")
+    home_blocks, tab_links = parse_place_html(home_html)
+    home_text = _clean_section_blocks(home_blocks)
+    if not home_text:
+        raise RuntimeError("서버 렌더링 HTML에서 장소 섹션을 찾지 못했습니다.")
+
+    result: dict[str, str] = {"home": home_text if "home" in wanted else "", "menu": "", "info": "", "news": ""}
+    tab_errors: dict[str, str] = {}
+    tab_urls = {
+        key: urljoin(home_url, tab_links[label])
+        for label, key in TAB_LABELS.items()
+        if key != "home" and key in wanted and tab_links.get(label)
+    }
+    if tab_urls:
+        with ThreadPoolExecutor(max_workers=len(tab_urls)) as executor:
+            futures = {key: executor.submit(fetch, url) for key, url in tab_urls.items()}
+            for key, future in futures.items():
+                try:
+                    text = _clean_section_blocks(parse_place_html(future.result()[1])[0])
+                except Exception as e:
+                    tab_errors[key] = f"{type(e).__name__}: {e}"
+                    continue
+                if text:
+                    result[key] = text
+                else:
+                    tab_errors[key] = "서버 렌더링 HTML에 탭 본문이 없습니다."
+
+    return CrawledPlaceData(
+        place_id=place_id,
+        source_url=f"https://map.naver.com/p/entry/place/{place_id}?placePath=%2Fhome",
+        home_text=result["home"],
+        menu_text=result["menu"],
+        info_text=result["info"],
+        news_text=result["news"],
+        tab_errors=tab_errors,
+        fetch_mode="http",
+    )
+
+
+class _LatencyBudget:
+    """크롤 전체 지연 예산을 관리하고, 단계별로 실제 대기한 시간을 기록합니다.
+
+    만든 시점의 진행 listener를 붙잡아 두므로, 브라우저 풀 스레드에서도 단계/탭 진행 이벤트를
+    "crawl" source로 내보낼 수 있습니다(progress 참고).
+    """
+
+    def __init__(self, budget_ms: int | None) -> None:
+        self._deadline = None if budget_ms is None else time.monotonic() + budget_ms / 1000
+        self.waits_ms: dict[str, int] = {}
+        self.emit = progress_emitter("crawl")
+
+    def remaining_ms(self) -> int | None:
+        if self._deadline is None:
+            return None
+        return int((self._deadline - time.monotonic()) * 1000)
+
+    @property
+    def exhausted(self) -> bool:
+        remaining = self.remaining_ms()
+        return remaining is not None and remaining <= 0
+
+    def cap(self, timeout_ms: int) -> int:
+        """개별 대기 타임아웃을 남은 예산 이내로 줄입니다(Playwright의 0=무제한을 피하려고 최소 1ms)."""
+        remaining = self.remaining_ms()
+        if remaining is None:
+            return timeout_ms
+        return max(1, min(timeout_ms, remaining))
+
+    def record(self, name: str, waited_ms: int) -> None:
+        self.waits_ms[name] = self.waits_ms.get(name, 0) + int(waited_ms)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self.emit("phase_started", name)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed_ms = int((time.monotonic() - started) * 1000)
+            self.record(name, elapsed_ms)
+            self.emit("phase_finished", name, elapsed_ms=elapsed_ms)
+
+    def collected(self, key: str, payload: dict[str, Any], text: str) -> None:
+        """탭 하나의 수집 결과(영업시간 펼침 대기, 본문 글자수)를 기록하고 진행 이벤트로 알립니다."""
+        waited_ms = int(payload.get("hoursWaitMs") or 0)
+        self.record(f"{key}_hours", waited_ms)
+        if payload.get("hoursExpanded"):
+            self.emit("hours_expanded", key, waited_ms=waited_ms)
+        self.emit("tab_finished", key, chars=len(text))
+
+
+# 준비 신호별 최대 대기 시간(ms). 신호가 오면 즉시 다음 단계로 넘어갑니다.
+_PLACE_FRAME_TIMEOUT_MS = 10000
+_SECTION_TIMEOUT_MS = 8000
+_NETWORK_IDLE_TIMEOUT_MS = 1500
+_HOURS_TOGGLE_TIMEOUT_MS = 2000
+
+
+def _wait_for_place_frame(page, budget: _LatencyBudget):
+    """지도 페이지에 pcmap.place.naver.com iframe이 붙을 때까지 짧은 간격으로 확인합니다."""
+    deadline = time.monotonic() + budget.cap(_PLACE_FRAME_TIMEOUT_MS) / 1000
+    with budget.phase("place_frame"):
+        while True:
+            frame = _get_place_frame(page)
+            if frame is not None or time.monotonic() >= deadline:
+                return frame
+            page.wait_for_timeout(100)
+
+
+def _wait_for_sections(frame, budget: _LatencyBudget, phase: str) -> None:
+    """`.place_section` 렌더링과 프레임 네트워크 유휴를 기다립니다. 시간 초과 시 현재 DOM으로 진행합니다."""
+    with budget.phase(phase):
+        try:
+            frame.wait_for_selector(".place_section", state="attached", timeout=budget.cap(_SECTION_TIMEOUT_MS))
+        except Exception:
+            # 섹션이 없는 탭은 패널 전체 텍스트로 대체 수집합니다.
+            return
+        try:
+            frame.wait_for_load_state("networkidle", timeout=budget.cap(_NETWORK_IDLE_TIMEOUT_MS))
+        except Exception:
+            pass
+
+
+def _collect_tab_payload(
+    frame, key: str, budget: _LatencyBudget, *, wait: bool = True
+) -> tuple[str, dict[str, Any]]:
+    """탭 프레임이 준비되면 한 번의 evaluate로 (필요 시 영업시간을 펼친 뒤) 섹션 텍스트를 수집합니다.
 
+    (텍스트, 추출 결과)를 반환하므로 홈을 수집한 호출자는 결과의 tabLinks를 그대로 쓸 수 있습니다.
+    호출자가 이미 섹션 렌더링을 기다렸으면 wait=False로 같은 대기를 건너뜁니다.
+    """
+    if wait:
+        _wait_for_sections(frame, budget, f"{key}_sections")
+    payload = frame.evaluate(
+        _EXTRACT_FRAME_SCRIPT,
+        {"expandHours": key in {"home", "info"}, "waitMs": budget.cap(_HOURS_TOGGLE_TIMEOUT_MS)},
+    )
+    text = _payload_text(payload)
+    if text is None:
+        text = _normalize_text(frame.evaluate(_VISIBLE_PANEL_SCRIPT))
+    budget.collected(key, payload, text)
+    return text, payload
+
+
+def _collect_tab_text(frame, key: str, budget: _LatencyBudget, *, wait: bool = True) -> str:
+    return _collect_tab_payload(frame, key, budget, wait=wait)[0]
+
+
+def _crawl_tabs_sequentially(
+    page, tab_urls: dict[str, str], budget: _LatencyBudget, *, timeout_ms: int
+) -> tuple[dict[str, str], dict[str, str]]:
+    """한 page에서 탭을 차례로 수집합니다. 동시 수집처럼 탭별 오류는 서로 영향을 주지 않고 오류 목록에 남습니다."""
+    texts: dict[str, str] = {}
+    errors: dict[str, str] = {}
+    for key, tab_url in tab_urls.items():
+        try:
+            if budget.exhausted:
+                raise TimeoutError("지연 예산을 모두 사용해 탭 수집을 건너뛰었습니다.")
+            with budget.phase(f"{key}_load"):
+                page.goto(tab_url, wait_until="domcontentloaded", timeout=budget.cap(timeout_ms))
+            tab_frame = _get_place_frame(page) or page.main_frame
+            texts[key] = _collect_tab_text(tab_frame, key, budget)
+        except Exception as e:
+            errors[key] = f"{type(e).__name__}: {e}"
+            budget.emit("tab_failed", key, error=errors[key])
+    return texts, errors
+
+
+def _open_tab_pages(
+    context, tab_urls: dict[str, str], budget: _LatencyBudget, *, tab_timeout_ms: int
+) -> tuple[dict[str, tuple[Any, float]], dict[str, str]]:
+    """탭마다 별도 page를 열고 내비게이션만 시작합니다(commit 시점까지만 대기)."""
+    opened: dict[str, tuple[Any, float]] = {}
+    errors: dict[str, str] = {}
+    for key, tab_url in tab_urls.items():
+        tab_page = context.new_page()
+        tab_page.set_default_timeout(tab_timeout_ms)
+        started = time.monotonic()
+        try:
+            tab_page.goto(tab_url, wait_until="commit", timeout=budget.cap(tab_timeout_ms))
+        except Exception as e:
+            errors[key] = f"{type(e).__name__}: {e}"
+            budget.emit("tab_failed", key, error=errors[key])
+            tab_page.close()
+            continue
+        opened[key] = (tab_page, started)
+    return opened, errors
+
+
+def _collect_tab_pages(
+    opened: dict[str, tuple[Any, float]], budget: _LatencyBudget, *, tab_timeout_ms: int
+) -> tuple[dict[str, str], dict[str, str]]:
+    """병렬로 로딩 중인 탭 page들을 수집합니다. 탭별 타임아웃/오류는 서로 영향을 주지 않습니다."""
+    texts: dict[str, str] = {}
+    errors: dict[str, str] = {}
+    for key, (tab_page, started) in opened.items():
+        try:
+            if budget.exhausted:
+                raise TimeoutError("지연 예산을 모두 사용해 탭 수집을 건너뛰었습니다.")
+            elapsed_ms = int((time.monotonic() - started) * 1000)
+            with budget.phase(f"{key}_load"):
+                tab_page.wait_for_load_state(
+                    "domcontentloaded", timeout=budget.cap(max(1, tab_timeout_ms - elapsed_ms))
+                )
+            tab_frame = _get_place_frame(tab_page) or tab_page.main_frame
+            texts[key] = _collect_tab_text(tab_frame, key, budget)
+        except Exception as e:
+            errors[key] = f"{type(e).__name__}: {e}"
+            budget.emit("tab_failed", key, error=errors[key])
+        finally:
+            tab_page.close()
+    return texts, errors
+
+
+def _ensure_windows_event_loop_policy() -> None:
     # Windows + Streamlit 환경에서 Playwright subprocess 생성 실패(NotImplementedError) 방지
     if sys.platform.startswith("win"):
         try:
@@ -210,57 +645,183 @@ def crawl_place_tabs(map_url: str, *, timeout_ms: int = 30000, headless: bool =
         except Exception:
             pass
 
-    place_id = extract_place_id(map_url)
-    map_entry_home = f"https://map.naver.com/p/entry/place/{place_id}?placePath=%2Fhome"
+
+def _crawl_in_context(
+    context,
+    map_entry_home: str,
+    budget: _LatencyBudget,
+    *,
+    timeout_ms: int,
+    concurrent_tabs: bool,
+    tab_timeout_ms: int,
+    tabs: frozenset[str],
+) -> tuple[dict[str, str], dict[str, str]]:
+    """주어진 브라우저 컨텍스트에서 홈/탭 텍스트를 수집해 (탭별 텍스트, 탭별 오류)를 반환합니다."""
     result: dict[str, str] = {"home": "", "menu": "", "info": "", "news": ""}
+    tab_errors: dict[str, str] = {}
 
+    page = context.new_page()
+    page.set_default_timeout(timeout_ms)
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=headless)
-            context = browser.new_context(user_agent=USER_AGENT, locale="ko-KR")
-            page = context.new_page()
-            page.set_default_timeout(timeout_ms)
-
-            page.goto(map_entry_home, wait_until="domcontentloaded")
-            page.wait_for_timeout(3500)
-            frame = _get_place_frame(page)
-            if frame is None:
-                raise RuntimeError("네이버 장소 패널 iframe을 찾지 못했습니다.")
-
-            tab_links = _extract_tab_links(frame)
-            label_to_key = {"홈": "home", "메뉴": "menu", "정보": "info", "소식": "news"}
-
-            # 우선 홈은 현재 페이지에서 즉시 수집
-            for _ in range(4):
-                if _expand_business_hours(frame):
-                    page.wait_for_timeout(700)
-                    break
-                page.wait_for_timeout(500)
-            result["home"] = _extract_tab_sections_text(frame) or _extract_visible_panel_text(frame)
-
-            for label, key in label_to_key.items():
-                if key == "home":
-                    continue
-                href = tab_links.get(label)
-                if not href:
-                    # 탭 자체가 없는 장소는 빈 값으로 둡니다.
-                    result[key] = ""
-                    continue
+        with budget.phase("entry_load"):
+            page.goto(map_entry_home, wait_until="domcontentloaded", timeout=budget.cap(timeout_ms))
+        frame = _wait_for_place_frame(page, budget)
+        if frame is None:
+            raise RuntimeError("네이버 장소 패널 iframe을 찾지 못했습니다.")
+
+        if concurrent_tabs:
+            # 다른 탭 로딩을 먼저 걸어 두어야 하므로, 홈 섹션 렌더링 뒤 탭 링크만 먼저 추출합니다.
+            # 홈 수집은 이 대기를 다시 하지 않습니다.
+            _wait_for_sections(frame, budget, "home_sections")
+            tab_urls = _tab_urls(_extract_tab_links(frame), tabs)
+            opened, tab_errors = _open_tab_pages(context, tab_urls, budget, tab_timeout_ms=tab_timeout_ms)
+            if "home" in tabs:
+                result["home"] = _collect_tab_text(frame, "home", budget, wait=False)
+            texts, collect_errors = _collect_tab_pages(opened, budget, tab_timeout_ms=tab_timeout_ms)
+            tab_errors.update(collect_errors)
+        else:
+            # 순차 수집은 홈 추출 결과에 함께 담긴 탭 링크를 써서 evaluate 왕복을 한 번 줄입니다.
+            if "home" in tabs:
+                result["home"], payload = _collect_tab_payload(frame, "home", budget)
+                tab_links = payload.get("tabLinks") or {}
+            else:
+                _wait_for_sections(frame, budget, "home_sections")
+                tab_links = _extract_tab_links(frame)
+            texts, tab_errors = _crawl_tabs_sequentially(
+                page, _tab_urls(tab_links, tabs), budget, timeout_ms=timeout_ms
+            )
+        result.update(texts)
+    finally:
+        # 풀의 컨텍스트는 재사용되므로 실패해도 page를 남기지 않습니다.
+        page.close()
+    return result, tab_errors
+
+
+def _record_crawl(span: Span, data: CrawledPlaceData) -> None:
+    span.set(
+        place_id=data.place_id,
+        fetch_mode=data.fetch_mode,
+        phase_ms=dict(data.wait_timings_ms),
+        tab_errors=len(data.tab_errors),
+        **data.network_stats,
+    )
+
+
+def _traced_crawl(fn: Callable[..., CrawledPlaceData]) -> Callable[..., CrawledPlaceData]:
+    """크롤링 전체 소요 시간과 단계별(phase) 시간, 수집 경로, 요청 차단 수를 "crawl" span으로 남깁니다."""
+
+    @functools.wraps(fn)
+    def wrapper(map_url: str, *args: Any, **kwargs: Any) -> CrawledPlaceData:
+        with get_tracer().span("crawl", map_url=map_url) as span:
+            data = fn(map_url, *args, **kwargs)
+            _record_crawl(span, data)
+            return data
+
+    return wrapper
+
+
+@_traced_crawl
+def crawl_place_tabs(
+    map_url: str,
+    *,
+    timeout_ms: int = 30000,
+    headless: bool = True,
+    concurrent_tabs: bool = True,
+    tab_timeout_ms: int = 20000,
+    latency_budget_ms: int | None = None,
+    pool: BrowserPool | None = None,
+    use_pool: bool = True,
+    tabs: Iterable[str] | None = None,
+    profile: CrawlProfile | None = LEAN_PROFILE,
+    http_fast_path: bool = False,
+    fetch: PageFetcher | None = None,
+    route_context: Callable[[Any], None] | None = None,
+) -> CrawledPlaceData:
+    """네이버 지도 좌측 패널의 홈/메뉴/정보/소식 탭 텍스트를 브라우저 크롤링으로 수집합니다.
+
+    concurrent_tabs=True이면 메뉴/정보/소식 탭을 같은 컨텍스트의 별도 page에서 동시에 수집하며,
+    특정 탭이 실패해도 나머지 결과는 유지하고 오류는 `tab_errors`에 기록합니다.
+    고정 대기 대신 iframe/`.place_section`/네트워크 유휴/영업시간 펼침 신호를 기다리며,
+    latency_budget_ms를 주면 모든 대기가 그 예산 안에서 끝나도록 줄어듭니다.
+    단계별 실제 대기 시간은 `wait_timings_ms`에 기록됩니다.
+
+    headless 모드에서는 기본적으로 프로세스 전역 브라우저 풀(`browser_pool`)의 웜 브라우저를 사용하고,
+    use_pool=False 또는 headless=False이면 호출마다 브라우저를 새로 띄웁니다.
+    tabs로 수집할 탭 키(home/menu/info/news)를 제한할 수 있으며, 제외된 탭은 빈 문자열로 반환됩니다.
+    profile(기본 LEAN_PROFILE)에 따라 이미지/폰트/미디어/트래커 요청을 차단하고 그 결과를
+    `network_stats`에 기록합니다. profile=None이면 모든 요청을 그대로 허용합니다.
+
+    http_fast_path=True이면 먼저 브라우저 없이 HTTP로 서버 렌더링 HTML을 파싱하고(fetch_place_tabs_http),
+    실패했거나 본문을 얻지 못한 탭만 브라우저로 수집합니다. 사용한 경로는 `fetch_mode`에 남습니다.
+    HTTP 경로는 `.place_section` DOM만 읽고 클라이언트 렌더링용 내장 상태(JSON)는 읽지 않으므로,
+    실제 녹화본으로 검증하기 전까지는 기본으로 끕니다(클라이언트 렌더링 탭은 HTTP 왕복 뒤 브라우저 수집까지 하게 됨).
+
+    fetch(HTTP 경로의 PageFetcher)와 route_context(브라우저 컨텍스트에 요청 프로필보다 먼저 설치할
+    route 훅)를 주면 녹화된 fixture만으로 네트워크 없이 실행할 수 있습니다(place_fixtures 참고).
+    """
+    place_id = extract_place_id(map_url)
+    map_entry_home = f"https://map.naver.com/p/entry/place/{place_id}?placePath=%2Fhome"
+    budget = _LatencyBudget(latency_budget_ms)
+    wanted = frozenset(TAB_LABELS.values()) if tabs is None else frozenset(tabs)
+    unknown = wanted - set(TAB_LABELS.values())
+    if unknown:
+        raise ValueError(f"알 수 없는 탭 키입니다: {', '.join(sorted(unknown))}")
+
+    fast: CrawledPlaceData | None = None
+    if http_fast_path:
+        with budget.phase("http_fetch"):
+            try:
+                fast = fetch_place_tabs_http(place_id, tabs=wanted, fetch=fetch)
+            except Exception:
+                fast = None
+        if fast is not None:
+            for key in TAB_LABELS.values():
+                if key in wanted and key not in fast.tab_errors:
+                    budget.emit("tab_finished", key, chars=len(getattr(fast, f"{key}_text")))
+            if not fast.tab_errors:
+                return replace(fast, wait_timings_ms=dict(budget.waits_ms))
+            # HTTP로 얻지 못한 탭만 브라우저로 보완합니다.
+            wanted = frozenset(fast.tab_errors)
+
+    # HTTP 경로만으로 끝나는 호출은 playwright 없이도 동작하므로, 브라우저가 필요할 때만 확인합니다.
+    if sync_playwright is None:
+        raise RuntimeError(
+            "playwright가 설치되어 있지 않습니다. "
+            "`pip install playwright && playwright install chromium` 를 먼저 실행하세요."
+        )
+    _ensure_windows_event_loop_policy()
+
+    stats = _NetworkStats(profile) if profile is not None else None
+
+    def crawl(context) -> tuple[dict[str, str], dict[str, str]]:
+        # Playwright는 나중에 등록한 route부터 실행하므로, 재생 훅을 먼저 걸어야 프로필 차단이 앞에서 적용됩니다.
+        if route_context is not None:
+            route_context(context)
+        if stats is not None:
+            _install_profile(context, stats)
+        return _crawl_in_context(
+            context,
+            map_entry_home,
+            budget,
+            timeout_ms=timeout_ms,
+            concurrent_tabs=concurrent_tabs,
+            tab_timeout_ms=tab_timeout_ms,
+            tabs=wanted,
+        )
 
-                tab_url = urljoin("https://pcmap.place.naver.com", href)
-                page.goto(tab_url, wait_until="domcontentloaded")
-                page.wait_for_timeout(2200)
-                tab_frame = _get_place_frame(page) or page.main_frame
-                if key in {"home", "info"}:
-                    for _ in range(3):
-                        if _expand_business_hours(tab_frame):
-                            page.wait_for_timeout(700)
-                            break
-                        page.wait_for_timeout(400)
-                result[key] = _extract_tab_sections_text(tab_frame) or _extract_visible_panel_text(tab_frame)
-
-            context.close()
-            browser.close()
+    try:
+        if use_pool and headless:
+            shared = pool or get_browser_pool(context_options=_CONTEXT_OPTIONS)
+            result, tab_errors = shared.run(crawl)
+        else:
+            with sync_playwright() as p:
+                browser = p.chromium.launch(headless=headless)
+                context = browser.new_context(**_CONTEXT_OPTIONS)
+                try:
+                    result, tab_errors = crawl(context)
+                finally:
+                    context.close()
+                    browser.close()
     except NotImplementedError as e:
         raise RuntimeError(
             "Playwright 브라우저 프로세스 실행에 실패했습니다. "
@@ -268,6 +829,145 @@ def crawl_place_tabs(map_url: str, *, timeout_ms: int = 30000, headless: bool =
             "터미널에서 `playwright install chromium` 실행 후 앱을 재시작해 주세요."
         ) from e
 
+    fetch_mode = "browser"
+    if fast is not None:
+        fetch_mode = "http+browser"
+        for key in TAB_LABELS.values():
+            if key not in wanted:
+                result[key] = getattr(fast, f"{key}_text")
+
+    return CrawledPlaceData(
+        place_id=place_id,
+        source_url=map_entry_home,
+        home_text=result["home"],
+        menu_text=result["menu"],
+        info_text=result["info"],
+        news_text=result["news"],
+        tab_errors=tab_errors,
+        wait_timings_ms=dict(budget.waits_ms),
+        network_stats=dict(stats.counts) if stats is not None else {},
+        fetch_mode=fetch_mode,
+    )
+
+
+# ---- asyncio 배치 크롤러 --------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class CrawlResult:
+    """crawl_many의 URL별 결과입니다. 실패한 URL은 data=None이고 error에 사유가 담깁니다."""
+
+    map_url: str
+    data: CrawledPlaceData | None = None
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
+
+async def _await_place_frame(page, budget: _LatencyBudget):
+    deadline = time.monotonic() + budget.cap(_PLACE_FRAME_TIMEOUT_MS) / 1000
+    with budget.phase("place_frame"):
+        while True:
+            frame = _get_place_frame(page)
+            if frame is not None or time.monotonic() >= deadline:
+                return frame
+            await asyncio.sleep(0.1)
+
+
+async def _await_sections(frame, budget: _LatencyBudget, phase: str) -> None:
+    with budget.phase(phase):
+        try:
+            await frame.wait_for_selector(
+                ".place_section", state="attached", timeout=budget.cap(_SECTION_TIMEOUT_MS)
+            )
+        except Exception:
+            return
+        try:
+            await frame.wait_for_load_state("networkidle", timeout=budget.cap(_NETWORK_IDLE_TIMEOUT_MS))
+        except Exception:
+            pass
+
+
+async def _acollect_tab_text(frame, key: str, budget: _LatencyBudget, *, wait: bool = True) -> str:
+    if wait:
+        await _await_sections(frame, budget, f"{key}_sections")
+    payload = await frame.evaluate(
+        _EXTRACT_FRAME_SCRIPT,
+        {"expandHours": key in {"home", "info"}, "waitMs": budget.cap(_HOURS_TOGGLE_TIMEOUT_MS)},
+    )
+    text = _payload_text(payload)
+    if text is None:
+        text = _normalize_text(await frame.evaluate(_VISIBLE_PANEL_SCRIPT))
+    budget.collected(key, payload, text)
+    return text
+
+
+async def _acrawl_tab(context, key: str, tab_url: str, budget: _LatencyBudget, *, tab_timeout_ms: int) -> str:
+    tab_page = await context.new_page()
+    tab_page.set_default_timeout(tab_timeout_ms)
+    try:
+        with budget.phase(f"{key}_load"):
+            await tab_page.goto(tab_url, wait_until="domcontentloaded", timeout=budget.cap(tab_timeout_ms))
+        tab_frame = _get_place_frame(tab_page) or tab_page.main_frame
+        return await _acollect_tab_text(tab_frame, key, budget)
+    finally:
+        await tab_page.close()
+
+
+async def _acrawl_place(
+    context,
+    map_url: str,
+    *,
+    timeout_ms: int,
+    tab_timeout_ms: int,
+    latency_budget_ms: int | None,
+    profile: CrawlProfile | None,
+) -> CrawledPlaceData:
+    """crawl_place_tabs와 같은 절차를 async API로 수행합니다. 홈과 나머지 탭은 동시에 수집합니다."""
+    # 단축 URL 해석은 blocking I/O이므로 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+    place_id = await asyncio.to_thread(extract_place_id, map_url)
+    map_entry_home = f"https://map.naver.com/p/entry/place/{place_id}?placePath=%2Fhome"
+    budget = _LatencyBudget(latency_budget_ms)
+    result: dict[str, str] = {"home": "", "menu": "", "info": "", "news": ""}
+    tab_errors: dict[str, str] = {}
+    stats = _NetworkStats(profile) if profile is not None else None
+    if stats is not None:
+        await _ainstall_profile(context, stats)
+
+    page = await context.new_page()
+    page.set_default_timeout(timeout_ms)
+    try:
+        with budget.phase("entry_load"):
+            await page.goto(map_entry_home, wait_until="domcontentloaded", timeout=budget.cap(timeout_ms))
+        frame = await _await_place_frame(page, budget)
+        if frame is None:
+            raise RuntimeError("네이버 장소 패널 iframe을 찾지 못했습니다.")
+
+        # 홈과 다른 탭을 동시에 수집하므로 홈 추출 전에 탭 링크가 필요합니다(홈 결과의 tabLinks는 쓰지 않음).
+        # 홈 수집은 이 섹션 대기를 다시 하지 않습니다.
+        await _await_sections(frame, budget, "home_sections")
+        tab_urls = _tab_urls(await frame.evaluate(_TAB_LINKS_SCRIPT), TAB_LABELS.values())
+
+        keys = ["home", *tab_urls]
+        outcomes = await asyncio.gather(
+            _acollect_tab_text(frame, "home", budget, wait=False),
+            *(
+                _acrawl_tab(context, key, tab_url, budget, tab_timeout_ms=tab_timeout_ms)
+                for key, tab_url in tab_urls.items()
+            ),
+            return_exceptions=True,
+        )
+        for key, outcome in zip(keys, outcomes):
+            if isinstance(outcome, BaseException):
+                tab_errors[key] = f"{type(outcome).__name__}: {outcome}"
+                budget.emit("tab_failed", key, error=tab_errors[key])
+            else:
+                result[key] = outcome
+    finally:
+        await page.close()
+
     return CrawledPlaceData(
         place_id=place_id,
         source_url=map_entry_home,
@@ -275,9 +975,81 @@ def crawl_place_tabs(map_url: str, *, timeout_ms: int = 30000, headless: bool =
         menu_text=result["menu"],
         info_text=result["info"],
         news_text=result["news"],
+        tab_errors=tab_errors,
+        wait_timings_ms=dict(budget.waits_ms),
+        network_stats=dict(stats.counts) if stats is not None else {},
     )
 
 
+async def crawl_many(
+    map_urls: Iterable[str],
+    *,
+    concurrency: int = 4,
+    timeout_ms: int = 30000,
+    tab_timeout_ms: int = 20000,
+    latency_budget_ms: int | None = None,
+    headless: bool = True,
+    profile: CrawlProfile | None = LEAN_PROFILE,
+) -> AsyncIterator[CrawlResult]:
+    """여러 네이버 지도 URL을 하나의 브라우저에서 동시에 크롤링하고, 끝나는 순서대로 결과를 yield합니다.
+
+    동시에 진행하는 장소 수는 concurrency로 제한하며, 장소마다 새 컨텍스트를 씁니다.
+    한 URL이 실패해도 배치는 계속되고, 해당 URL은 error가 채워진 CrawlResult로 보고됩니다.
+
+    사용 예:
+        async for item in crawl_many(urls, concurrency=8):
+            print(item.map_url, item.ok)
+    """
+    if async_playwright is None:
+        raise RuntimeError(
+            "playwright가 설치되어 있지 않습니다. "
+            "`pip install playwright && playwright install chromium` 를 먼저 실행하세요."
+        )
+    if concurrency < 1:
+        raise ValueError("concurrency는 1 이상이어야 합니다.")
+
+    _ensure_windows_event_loop_policy()
+    semaphore = asyncio.Semaphore(concurrency)
+    map_urls = list(map_urls)
+    # 단축 URL을 먼저 한 번에 해석해 캐시에 채워 두면, 장소별 extract_place_id는 캐시만 읽습니다.
+    # 해석 실패는 여기서 무시하고 각 장소 크롤링에서 오류로 보고됩니다.
+    await asyncio.to_thread(resolve_place_ids, map_urls, max_workers=concurrency)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+
+        async def crawl_one(map_url: str) -> CrawlResult:
+            async with semaphore:
+                context = await browser.new_context(**_CONTEXT_OPTIONS)
+                try:
+                    with get_tracer().span("crawl", map_url=map_url, batch=True) as span:
+                        data = await _acrawl_place(
+                            context,
+                            map_url,
+                            timeout_ms=timeout_ms,
+                            tab_timeout_ms=tab_timeout_ms,
+                            latency_budget_ms=latency_budget_ms,
+                            profile=profile,
+                        )
+                        _record_crawl(span, data)
+                    return CrawlResult(map_url=map_url, data=data)
+                except Exception as e:
+                    return CrawlResult(map_url=map_url, error=f"{type(e).__name__}: {e}")
+                finally:
+                    await context.close()
+
+        tasks = [asyncio.create_task(crawl_one(url)) for url in map_urls]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # 소비자가 중간에 멈추면 남은 작업을 정리합니다.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await browser.close()
+
+
 def _guess_place_name(text: str) -> str:
     for line in text.splitlines():
         line = line.strip()
@@ -297,6 +1069,38 @@ def _guess_business_hours(text: str) -> str:
     return " / ".join(candidates[:3]).strip()
 
 
+# 탭별 기본 글자수 예산. 프롬프트 입력 토큰을 줄이기 위해 크롤링 원문을 이 이하로 자릅니다.
+# 앱과 일괄 생성은 AppConfig.tab_char_budget(TAB_CHAR_BUDGET)을 넘깁니다.
+DEFAULT_TAB_CHAR_BUDGET = AppConfig.tab_char_budget
+
+
+def compact_crawled_data(
+    crawled: CrawledPlaceData,
+    *,
+    max_chars_per_tab: int | None = DEFAULT_TAB_CHAR_BUDGET,
+    max_tokens_per_tab: int | None = None,
+) -> tuple[CrawledPlaceData, dict[str, dict[str, int]]]:
+    """탭 텍스트의 중복 섹션/상투 문구를 제거하고 탭별 예산으로 자릅니다.
+
+    반환값은 (정리된 CrawledPlaceData, {탭 키: 제거 내역})입니다.
+    """
+    texts: dict[str, str] = {}
+    report: dict[str, dict[str, int]] = {}
+    for key in TAB_LABELS.values():
+        texts[key], tab_report = compact_text(
+            getattr(crawled, f"{key}_text"), max_chars=max_chars_per_tab, max_tokens=max_tokens_per_tab
+        )
+        report[key] = tab_report.as_dict()
+    compacted = replace(
+        crawled,
+        home_text=texts["home"],
+        menu_text=texts["menu"],
+        info_text=texts["info"],
+        news_text=texts["news"],
+    )
+    return compacted, report
+
+
 def merge_blog_input_with_crawl(input_dict: dict[str, str], crawled: CrawledPlaceData) -> dict[str, str]:
     """기존 사용자 입력을 유지하며, 비어 있는 필드를 크롤링 텍스트로 보강합니다."""
     out = dict(input_dict)
@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+# 장소 페이지 fixture를 녹화하고, 오프라인으로 HTTP/브라우저 수집 경로의 속도와 정확도를 비교합니다.
+import argparse
+import difflib
+import html as html_lib
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import urljoin, urlparse
+
+from browser_pool import BrowserPool
+from config import BASE_DIR
+from naver_http import KeepAliveClient, parse_place_html
+from naver_map import (
+    _CONTEXT_OPTIONS,
+    _HTTP_CLIENT,
+    TAB_LABELS,
+    CrawledPlaceData,
+    _clean_section_blocks,
+    _collect_tab_text,
+    _LatencyBudget,
+    crawl_place_tabs,
+    fetch_place_tabs_http,
+    sync_playwright,
+)
+
+
+FIXTURE_DIR = BASE_DIR / "fixtures" / "naver_place"
+
+_TAB_FILES = {"home": "home.html", "menu": "menu.html", "info": "information.html", "news": "feed.html"}
+_ENTRY_FILE = "entry.html"
+
+# 실제 지도 진입 페이지는 JS 번들이 iframe을 만들므로, 녹화본에 iframe이 없으면 같은 구조의 껍데기로 재생합니다.
+# 이 껍데기는 녹화본이 아니라 직접 만든 페이지이므로, 보고서의 "entry" 항목에 "shell"로 표시합니다.
+_ENTRY_SHELL = """<!doctype html>
+<html><head><meta charset="utf-8"><title>네이버 지도</title></head>
+<body><div id="app-root"><iframe id="entryIframe" title="Naver Place Entry" src="{src}"></iframe></div></body>
+</html>
+"""
+
+
+def map_entry_url(place_id: str) -> str:
+    return f"https://map.naver.com/p/entry/place/{place_id}?placePath=%2Fhome"
+
+
+class FixtureFetcher:
+    """manifest.json의 URL -> 파일 매핑으로 녹화된 페이지를 돌려주는 PageFetcher입니다.
+
+    route(context)로 Playwright 컨텍스트에 설치하면 브라우저 경로도 녹화본만으로 재생합니다.
+    """
+
+    def __init__(self, fixture_dir: Path | str) -> None:
+        self.fixture_dir = Path(fixture_dir)
+        self.manifest: dict[str, Any] = json.loads((self.fixture_dir / "manifest.json").read_text(encoding="utf-8"))
+        self.pages: dict[str, dict[str, str]] = {}
+        for url, entry in self.manifest["pages"].items():
+            self.pages[url] = entry
+            self.pages.setdefault(entry["final_url"], entry)
+        # route()로 재생하는 동안 녹화본이 없어 막은 요청 URL
+        self.missed: list[str] = []
+
+    @property
+    def place_id(self) -> str:
+        return self.manifest["place_id"]
+
+    @property
+    def synthetic(self) -> bool:
+        """manifest에 "synthetic": true로 표시된, 손으로 쓴 fixture인지 여부입니다."""
+        return bool(self.manifest.get("synthetic"))
+
+    def provenance(self) -> dict[str, Any]:
+        """보고서에 붙일 출처 정보입니다. 손으로 쓴 fixture의 정확도는 파서 검증이 아니라 회귀 확인일 뿐입니다."""
+        return {
+            "synthetic": self.synthetic,
+            "entry": "recorded" if self._recorded_entry_html() is not None else "shell",
+        }
+
+    def _entry(self, url: str) -> Optional[dict[str, str]]:
+        # 브라우저는 탭 링크에 쿼리(?entry=... 등)를 붙여 요청할 수 있으므로 쿼리를 뗀 URL로도 찾습니다.
+        return self.pages.get(url) or self.pages.get(url.split("#", 1)[0].split("?", 1)[0])
+
+    def read(self, url: str) -> Optional[str]:
+        entry = self._entry(url)
+        if entry is None:
+            return None
+        return (self.fixture_dir / entry["file"]).read_text(encoding="utf-8")
+
+    def _recorded_entry_html(self) -> Optional[str]:
+        recorded = self.manifest.get("entry")
+        if not recorded or not (self.fixture_dir / recorded["file"]).exists():
+            return None
+        html = (self.fixture_dir / recorded["file"]).read_text(encoding="utf-8")
+        if "<iframe" in html and "pcmap.place.naver.com" in html:
+            return html
+        return None
+
+    def entry_html(self) -> str:
+        """지도 진입 페이지. 녹화본에 pcmap iframe이 있으면 그대로, 없으면 iframe 껍데기를 돌려줍니다."""
+        recorded = self._recorded_entry_html()
+        if recorded is not None:
+            return recorded
+        home_url = next(url for url, entry in self.manifest["pages"].items() if entry["tab"] == "home")
+        return _ENTRY_SHELL.format(src=html_lib.escape(home_url))
+
+    def route(self, context) -> None:
+        """녹화된 진입/pcmap 페이지는 fixture로 응답하고, 나머지 요청은 모두 막습니다(네트워크 없음)."""
+
+        def fulfill(route) -> None:
+            url = route.request.url
+            parsed = urlparse(url)
+            if parsed.hostname == "map.naver.com" and parsed.path.startswith("/p/entry/place/"):
+                body: Optional[str] = self.entry_html()
+            else:
+                body = self.read(url)
+            if body is None:
+                self.missed.append(url)
+                route.abort()
+            else:
+                route.fulfill(status=200, content_type="text/html; charset=utf-8", body=body)
+
+        context.route("**/*", fulfill)
+
+    def __call__(self, url: str) -> tuple[str, str]:
+        html = self.read(url)
+        if html is None:
+            raise RuntimeError(f"녹화되지 않은 URL입니다: {url}")
+        return self.pages[url]["final_url"], html
+
+
+def expected_texts(fixture_dir: Path | str) -> dict[str, str]:
+    """expected.json(사람이 검수한 탭별 기대 텍스트)이 있으면 읽습니다."""
+    path = Path(fixture_dir) / "expected.json"
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def record_place_fixtures(
+    place_id: str, out_dir: Path | str | None = None, *, client: KeepAliveClient | None = None
+) -> Path:
+    """실제 pcmap 페이지(홈 + 메뉴/정보/소식 탭)를 HTTP로 받아 fixture 디렉터리로 저장합니다.
+
+    expected.json에는 현재 파서 결과를 초안으로 기록하므로, 커밋 전에 실제 화면과 비교해 검수하세요.
+    """
+    client = client or _HTTP_CLIENT
+    out = Path(out_dir) if out_dir is not None else FIXTURE_DIR / place_id
+    out.mkdir(parents=True, exist_ok=True)
+
+    pages: dict[str, dict[str, str]] = {}
+    entry_final, entry_html = client.get_text(map_entry_url(place_id))
+    (out / _ENTRY_FILE).write_text(entry_html, encoding="utf-8")
+    home_url = f"https://pcmap.place.naver.com/place/{place_id}/home"
+    final_url, html = client.get_text(home_url)
+    (out / _TAB_FILES["home"]).write_text(html, encoding="utf-8")
+    pages[home_url] = {"tab": "home", "file": _TAB_FILES["home"], "final_url": final_url}
+
+    blocks, tab_links = parse_place_html(html)
+    expected = {"home": _clean_section_blocks(blocks)}
+    for label, key in TAB_LABELS.items():
+        href = tab_links.get(label)
+        if key == "home" or not href:
+            continue
+        tab_url = urljoin(final_url, href)
+        tab_final, tab_html = client.get_text(tab_url)
+        (out / _TAB_FILES[key]).write_text(tab_html, encoding="utf-8")
+        pages[tab_url] = {"tab": key, "file": _TAB_FILES[key], "final_url": tab_final}
+        expected[key] = _clean_section_blocks(parse_place_html(tab_html)[0])
+
+    manifest = {
+        "place_id": place_id,
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "entry": {"file": _ENTRY_FILE, "final_url": entry_final},
+        "pages": pages,
+    }
+    (out / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    (out / "expected.json").write_text(json.dumps(expected, ensure_ascii=False, indent=2), encoding="utf-8")
+    return out
+
+
+def _similarity(a: str, b: str) -> float:
+    return round(difflib.SequenceMatcher(None, a, b).ratio(), 4)
+
+
+def _texts(data: CrawledPlaceData) -> dict[str, str]:
+    return {key: getattr(data, f"{key}_text") for key in TAB_LABELS.values()}
+
+
+def _browser_extract(fetcher: FixtureFetcher) -> dict[str, str]:
+    """녹화된 HTML을 Playwright로 열어 브라우저 경로의 추출 함수로 탭 텍스트를 얻습니다(네트워크 차단)."""
+    texts: dict[str, str] = {}
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        context = browser.new_context()
+        fetcher.route(context)
+        page = context.new_page()
+        for entry in fetcher.manifest["pages"].values():
+            page.goto(entry["final_url"], wait_until="domcontentloaded")
+            texts[entry["tab"]] = _collect_tab_text(page.main_frame, entry["tab"], _LatencyBudget(3000))
+        context.close()
+        browser.close()
+    return texts
+
+
+def compare_fetch_paths(fixture_dir: Path | str, *, repeat: int = 5) -> dict[str, Any]:
+    """한 fixture에 대해 HTTP/브라우저 경로의 평균 소요 시간과 기대 텍스트 대비 유사도를 계산합니다."""
+    fetcher = FixtureFetcher(fixture_dir)
+    expected = expected_texts(fixture_dir)
+    report: dict[str, Any] = {"fixture": str(fixture_dir), "place_id": fetcher.place_id, **fetcher.provenance()}
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        http_texts = _texts(fetch_place_tabs_http(fetcher.place_id, fetch=fetcher))
+    report["http"] = {"avg_ms": round((time.perf_counter() - started) * 1000 / repeat, 2)}
+
+    browser_texts: dict[str, str] = {}
+    if sync_playwright is not None:
+        started = time.perf_counter()
+        try:
+            for _ in range(repeat):
+                browser_texts = _browser_extract(fetcher)
+            report["browser"] = {"avg_ms": round((time.perf_counter() - started) * 1000 / repeat, 2)}
+        except Exception as e:
+            report["browser"] = {"error": f"{type(e).__name__}: {e}"}
+
+    for key in TAB_LABELS.values():
+        if expected:
+            report["http"][f"{key}_accuracy"] = _similarity(http_texts.get(key, ""), expected.get(key, ""))
+            if browser_texts:
+                report["browser"][f"{key}_accuracy"] = _similarity(browser_texts.get(key, ""), expected.get(key, ""))
+        if browser_texts:
+            report.setdefault("agreement", {})[key] = _similarity(http_texts.get(key, ""), browser_texts.get(key, ""))
+    return report
+
+
+# 벤치마크 모드 -> crawl_place_tabs 옵션
+CRAWL_MODES: dict[str, dict[str, bool]] = {
+    "http": {"http_fast_path": True},
+    "browser": {"http_fast_path": False, "concurrent_tabs": True},
+    "browser-seq": {"http_fast_path": False, "concurrent_tabs": False},
+}
+
+
+def benchmark_crawl(
+    fixture_dir: Path | str, *, modes: tuple[str, ...] = ("http", "browser"), repeat: int = 3
+) -> dict[str, Any]:
+    """fixture 재생으로 crawl_place_tabs 전체를 실행해 모드별 소요 시간, 단계별 시간, 정확도, 브라우저 메모리를 잽니다.
+
+    HTTP 경로는 FixtureFetcher를, 브라우저 경로는 route 훅을 통해 같은 fixture를 읽으므로 네트워크가 필요 없습니다.
+    보고서의 synthetic/entry 항목으로 손으로 쓴 fixture인지, 진입 페이지가 녹화본인지 껍데기인지 표시합니다.
+    실제 녹화본(entry.html 포함)이 아니면 수치는 실제 페이지 성능이 아니라 코드 경로의 회귀 확인용입니다.
+    브라우저 모드는 전역 풀과 섞이지 않도록 크기 1의 전용 풀에서 실행하고, 메모리는 풀이 잰 프로세스 트리 RSS입니다.
+    """
+    fetcher = FixtureFetcher(fixture_dir)
+    expected = expected_texts(fixture_dir)
+    map_url = map_entry_url(fetcher.place_id)
+    report: dict[str, Any] = {"fixture": str(fixture_dir), "place_id": fetcher.place_id, **fetcher.provenance()}
+    needs_browser = any(not CRAWL_MODES[mode]["http_fast_path"] for mode in modes)
+    pool = BrowserPool(size=1, context_options=_CONTEXT_OPTIONS) if needs_browser and sync_playwright else None
+    try:
+        for mode in modes:
+            options = CRAWL_MODES[mode]
+            if not options["http_fast_path"] and pool is None:
+                report[mode] = {"error": "playwright가 설치되어 있지 않습니다."}
+                continue
+            walls: list[float] = []
+            phases: dict[str, list[int]] = {}
+            try:
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    data = crawl_place_tabs(map_url, fetch=fetcher, route_context=fetcher.route, pool=pool, **options)
+                    walls.append((time.perf_counter() - started) * 1000)
+                    for phase, ms in data.wait_timings_ms.items():
+                        phases.setdefault(phase, []).append(ms)
+            except Exception as e:
+                report[mode] = {"error": f"{type(e).__name__}: {e}"}
+                continue
+            row: dict[str, Any] = {
+                "fetch_mode": data.fetch_mode,
+                "avg_ms": round(statistics.fmean(walls), 2),
+                "max_ms": round(max(walls), 2),
+                "phase_avg_ms": {phase: round(statistics.fmean(v), 1) for phase, v in phases.items()},
+            }
+            if data.tab_errors:
+                row["tab_errors"] = data.tab_errors
+            if data.network_stats:
+                row["network"] = data.network_stats
+            if expected:
+                row["accuracy"] = {
+                    key: _similarity(text, expected.get(key, "")) for key, text in _texts(data).items()
+                }
+            report[mode] = row
+        if pool is not None:
+            memory = [slot["memory_mb"] for slot in pool.stats() if slot["memory_mb"] is not None]
+            report["browser_rss_mb"] = round(max(memory), 1) if memory else None
+    finally:
+        if pool is not None:
+            pool.close()
+    if fetcher.missed:
+        report["unrecorded_requests"] = sorted(set(fetcher.missed))
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="네이버 장소 페이지 fixture 녹화/비교 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="placeId의 pcmap 페이지를 fixture로 저장합니다.")
+    rec.add_argument("place_id")
+    rec.add_argument("--out", default=None)
+    cmp_ = sub.add_parser("compare", help="fixture로 HTTP/브라우저 경로를 비교합니다.")
+    cmp_.add_argument("fixtures", nargs="*", help="fixture 디렉터리(기본: fixtures/naver_place/*)")
+    cmp_.add_argument("--repeat", type=int, default=5)
+    bench = sub.add_parser("bench", help="fixture 재생으로 crawl_place_tabs 단계별 시간/정확도/메모리를 잽니다.")
+    bench.add_argument("fixtures", nargs="*", help="fixture 디렉터리(기본: fixtures/naver_place/*)")
+    bench.add_argument("--modes", default="http,browser", help=f"쉼표 구분({', '.join(CRAWL_MODES)})")
+    bench.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        print(record_place_fixtures(args.place_id, args.out))
+        return
+
+    dirs = [Path(d) for d in args.fixtures] or sorted(p.parent for p in FIXTURE_DIR.glob("*/manifest.json"))
+    if args.command == "bench":
+        # 재생 크롤이 실제 지표 파일(.cache/metrics.jsonl)에 섞이지 않게 합니다.
+        os.environ.setdefault("METRICS_JSONL", "")
+        modes = tuple(m.strip() for m in args.modes.split(",") if m.strip())
+        unknown = [m for m in modes if m not in CRAWL_MODES]
+        if unknown:
+            parser.error(f"알 수 없는 모드입니다: {', '.join(unknown)}")
+        for fixture_dir in dirs:
+            print(json.dumps(benchmark_crawl(fixture_dir, modes=modes, repeat=args.repeat), ensure_ascii=False, indent=2))
+        return
+    for fixture_dir in dirs:
+        print(json.dumps(compare_fetch_paths(fixture_dir, repeat=args.repeat), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+# 크롤러와 파이프라인이 내보내는 진행 이벤트(단계 시작/종료, Agent 단계, 도구 호출, 생성 글자수)를 전달합니다.
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """source: "crawl" 또는 Agent 이름, kind: 이벤트 종류, name: 단계/탭/도구 이름.
+
+    kind 목록
+    - crawl: phase_started / phase_finished(elapsed_ms), hours_expanded(waited_ms),
+      tab_finished(chars), tab_failed(error) — 탭 이벤트의 name은 탭 키(home/menu/info/news)
+    - Agent: stage_started, cache_hit(chars), agent_step, tool_call(도구 이름), tokens(chars), stage_finished(elapsed_ms)
+    """
+
+    source: str
+    kind: str
+    name: str = ""
+    data: dict[str, Any] = field(default_factory=dict)
+    at: float = field(default_factory=time.time)
+
+
+ProgressListener = Callable[[ProgressEvent], None]
+
+_listener: ContextVar[Optional[ProgressListener]] = ContextVar("progress_listener", default=None)
+
+
+@contextmanager
+def progress_listener(listener: ProgressListener) -> Iterator[None]:
+    """블록 안(과 그 안에서 시작한 asyncio 태스크)에서 발생하는 진행 이벤트를 listener로 받습니다."""
+    token = _listener.set(listener)
+    try:
+        yield
+    finally:
+        _listener.reset(token)
+
+
+def progress_emitter(source: str) -> Callable[..., None]:
+    """현재 컨텍스트의 listener를 붙잡은 emit(kind, name="", **data) 함수를 반환합니다.
+
+    브라우저 풀 스레드처럼 컨텍스트가 이어지지 않는 곳에서도 같은 listener로 보낼 수 있습니다.
+    listener가 없으면 아무 일도 하지 않습니다.
+    """
+    listener = _listener.get()
+
+    def emit(kind: str, name: str = "", **data: Any) -> None:
+        if listener is None:
+            return
+        try:
+            listener(ProgressEvent(source, kind, name, data))
+        except Exception:
+            # 진행 표시 실패가 본 작업을 깨뜨리지 않도록 합니다.
+            logging.getLogger("blog_agent.progress").exception("progress listener 실패")
+
+    return emit
+
+
+def emit_progress(source: str, kind: str, name: str = "", **data: Any) -> None:
+    progress_emitter(source)(kind, name, **data)
+
+
+class ProgressLog:
+    """진행 이벤트를 모아 화면 표시용 상태(현재 단계, 단계별 소요 시간, 생성 글자수 등)로 요약합니다."""
+
+    def __init__(self, max_events: int = 500) -> None:
+        self.max_events = max_events
+        self.events: list[ProgressEvent] = []
+        self.phase_ms: dict[str, int] = {}
+        self.current = ""
+        self.chars = 0
+        self.agent_steps = 0
+        self.tool_calls: list[str] = []
+        self.cache_hits = 0
+        self.tabs_done: list[str] = []
+        self.tabs_failed: list[str] = []
+        self.started_at = time.time()
+        self.updated_at = self.started_at
+        self.first_token_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, event: ProgressEvent) -> None:
+        with self._lock:
+            if len(self.events) < self.max_events:
+                self.events.append(event)
+            self.updated_at = event.at
+            kind, name = event.kind, event.name
+            if kind == "phase_started":
+                self.current = name
+            elif kind == "phase_finished":
+                self.phase_ms[name] = self.phase_ms.get(name, 0) + int(event.data.get("elapsed_ms", 0))
+            elif kind == "hours_expanded":
+                self.phase_ms[f"{name}_hours"] = self.phase_ms.get(f"{name}_hours", 0) + int(
+                    event.data.get("waited_ms", 0)
+                )
+            elif kind == "tab_finished":
+                self.tabs_done.append(name)
+            elif kind == "tab_failed":
+                self.tabs_failed.append(name)
+            elif kind == "stage_started":
+                self.current = event.source
+            elif kind == "agent_step":
+                self.agent_steps += 1
+            elif kind == "tool_call":
+                self.tool_calls.append(name)
+            elif kind in ("tokens", "cache_hit"):
+                # 캐시 응답은 한 번에 전체 글자수가 들어옵니다.
+                self.cache_hits += kind == "cache_hit"
+                if self.first_token_at is None:
+                    self.first_token_at = event.at
+                self.chars += int(event.data.get("chars", 0))
+            elif kind == "stage_finished":
+                self.phase_ms[event.source] = self.phase_ms.get(event.source, 0) + int(
+                    event.data.get("elapsed_ms", 0)
+                )
+
+    def status(self, labels: Optional[dict[str, str]] = None) -> str:
+        """진행 막대 옆에 붙일 한 줄 상태입니다. labels로 단계/Agent 이름을 화면용 이름으로 바꿉니다."""
+        labels = labels or {}
+        with self._lock:
+            parts = []
+            if self.current:
+                parts.append(labels.get(self.current, self.current))
+            if self.tabs_done:
+                parts.append(f"탭 {len(self.tabs_done)}개 완료")
+            if self.tabs_failed:
+                parts.append(f"탭 {len(self.tabs_failed)}개 실패")
+            if self.agent_steps:
+                parts.append(f"모델 호출 {self.agent_steps}회")
+            if self.tool_calls:
+                parts.append(f"도구 {self.tool_calls[-1]}")
+            if self.chars:
+                parts.append(f"{self.chars:,}자 생성")
+            return " · ".join(parts)
+
+    def summary(self, labels: Optional[dict[str, str]] = None, *, total_seconds: Optional[float] = None) -> str:
+        """끝난 실행이 어디에 시간을 썼는지 보여 주는 한 줄 요약입니다(오래 걸린 단계 순).
+
+        total_seconds를 주지 않으면 마지막 이벤트까지의 시간을 총 시간으로 씁니다.
+        """
+        labels = labels or {}
+        with self._lock:
+            total = self.updated_at - self.started_at if total_seconds is None else total_seconds
+            parts = [f"총 {total:.1f}초"]
+            if self.first_token_at is not None:
+                parts.append(f"첫 글자까지 {self.first_token_at - self.started_at:.1f}초")
+            for name, ms in sorted(self.phase_ms.items(), key=lambda item: item[1], reverse=True)[:6]:
+                parts.append(f"{labels.get(name, name)} {ms / 1000:.1f}초")
+            if self.tool_calls:
+                parts.append(f"도구 호출 {len(self.tool_calls)}회")
+            if self.cache_hits:
+                parts.append(f"캐시 적중 {self.cache_hits}회")
+            return " · ".join(parts)
@@ -1,6 +1,9 @@
 ﻿from __future__ import annotations
 # 사용자 입력을 구조화하고, 프롬프트 생성 규칙을 정의합니다.
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
+from typing import Optional
+
+from text_budget import compact_text, estimate_tokens
 
 @dataclass
 class BlogInput:
@@ -18,6 +21,10 @@ class BlogInput:
     tone: str
     target_keyword: str
 
+
+# UI 선택지이자 톤별 비교 생성의 기본 톤 목록
+TONES = ("정보형", "경험담", "스토리텔링", "마케팅")
+
 PROMPT_BUILDER_SYSTEM = """
 너는 전문 블로그 에디터다.
 역할은 ‘블로그 본문을 직접 작성하는 것’이 아니라, 블로그 작성 모델에게 전달할 최종 작성 지시 프롬프트를 설계하는 것이다.
@@ -114,8 +121,7 @@ COMMENT_WRITER_SYSTEM = """
 - 번호 목록으로 출력
 """.strip()
 
-def format_user_facts(payload: BlogInput) -> str:
-    """사용자 입력을 에이전트 전달용 메모 문자열로 정리합니다."""
+def _render_user_facts(payload: BlogInput) -> str:
     return (
         f"- 네이버 지도 URL: {payload.map_url}\n"
         f"- 장소: {payload.place_name}\n"
@@ -131,3 +137,89 @@ def format_user_facts(payload: BlogInput) -> str:
         f"- 글 톤: {payload.tone}\n"
         f"- 핵심 키워드: {payload.target_keyword}"
     )
+
+
+# 예산을 넘을 때 줄여도 되는 크롤링 필드(중요한 순서). 나머지 사용자 작성 필드는 항상 그대로 둡니다.
+CRAWLED_FIELD_PRIORITY = ("menu_tab_info", "info_tab_info", "home_tab_info", "news_tab_info")
+DEFAULT_FACTS_TOKEN_BUDGET = 3000
+# 1차로 각 크롤링 필드를 이 토큰 수까지 줄이고, 그래도 넘치면 낮은 우선순위 필드부터 비웁니다.
+_CRAWLED_FIELD_FLOOR_TOKENS = 200
+
+
+@dataclass
+class FactsCompaction:
+    budget_tokens: int
+    original_tokens: int = 0
+    final_tokens: int = 0
+    trimmed_chars: dict[str, int] = field(default_factory=dict)
+    dropped_fields: list[str] = field(default_factory=list)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.final_tokens > self.budget_tokens
+
+    def summary(self) -> str:
+        if not self.trimmed_chars and not self.dropped_fields:
+            return ""
+        parts = [f"{name} -{chars:,}자" for name, chars in self.trimmed_chars.items() if chars]
+        if self.dropped_fields:
+            parts.append("제외: " + ", ".join(self.dropped_fields))
+        return f"입력 {self.original_tokens:,} → {self.final_tokens:,} 토큰(추정) / " + ", ".join(parts)
+
+
+def compact_user_facts(payload: BlogInput, *, max_tokens: int = DEFAULT_FACTS_TOKEN_BUDGET) -> tuple[BlogInput, FactsCompaction]:
+    """facts 블록이 max_tokens(추정) 안에 들도록 크롤링 필드만 줄인 BlogInput과 내역을 반환합니다.
+
+    LLM 호출 없이 로컬에서 처리합니다.
+    1) 크롤링 필드끼리 중복 섹션 제거(우선순위가 높은 필드에 남김)
+    2) 낮은 우선순위 필드부터 _CRAWLED_FIELD_FLOOR_TOKENS까지 섹션·줄 경계로 자름
+    3) 그래도 넘치면 낮은 우선순위 필드부터 비움
+    사용자 작성 필드가 그 자체로 예산을 넘으면 그대로 두고 over_budget으로 알립니다.
+    처음부터 예산 안이면 아무것도 바꾸지 않고 빈 내역(summary() == "")을 반환합니다.
+    """
+    report = FactsCompaction(budget_tokens=max_tokens, original_tokens=estimate_tokens(_render_user_facts(payload)))
+    if report.original_tokens <= max_tokens:
+        report.final_tokens = report.original_tokens
+        return payload, report
+    original = {name: getattr(payload, name) for name in CRAWLED_FIELD_PRIORITY}
+    texts: dict[str, str] = {}
+    seen: set[str] = set()
+    for name in CRAWLED_FIELD_PRIORITY:
+        texts[name], _ = compact_text(original[name], seen=seen)
+
+    def total() -> int:
+        return estimate_tokens(_render_user_facts(replace(payload, **texts)))
+
+    for name in reversed(CRAWLED_FIELD_PRIORITY):
+        overflow = total() - max_tokens
+        if overflow <= 0:
+            break
+        current = estimate_tokens(texts[name])
+        target = max(_CRAWLED_FIELD_FLOOR_TOKENS, current - overflow)
+        if target < current:
+            texts[name], _ = compact_text(texts[name], max_tokens=target)
+
+    for name in reversed(CRAWLED_FIELD_PRIORITY):
+        if total() <= max_tokens:
+            break
+        if texts[name]:
+            texts[name] = ""
+            report.dropped_fields.append(name)
+
+    for name in CRAWLED_FIELD_PRIORITY:
+        removed = len(original[name]) - len(texts[name])
+        if removed and name not in report.dropped_fields:
+            report.trimmed_chars[name] = removed
+    compacted = replace(payload, **texts)
+    report.final_tokens = estimate_tokens(_render_user_facts(compacted))
+    return compacted, report
+
+
+def format_user_facts(payload: BlogInput, *, max_tokens: Optional[int] = None) -> str:
+    """사용자 입력을 에이전트 전달용 메모 문자열로 정리합니다.
+
+    max_tokens를 주면 compact_user_facts로 크롤링 필드를 예산에 맞춰 줄인 뒤 정리합니다.
+    """
+    if max_tokens is not None:
+        payload, _ = compact_user_facts(payload, max_tokens=max_tokens)
+    return _render_user_facts(payload)
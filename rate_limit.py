@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+# Gemini 호출 앞단의 프로세스 전역 스케줄러(RPM/TPM 제한, 재시도, 적응형 동시성, 세션별 공정성)입니다.
+import argparse
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+_current_session: ContextVar[str] = ContextVar("gemini_session", default="default")
+
+# 429/쿼터 초과로 보는 예외 클래스 이름(google-genai, google-api-core, langchain 공통)
+_THROTTLE_ERROR_NAMES = {"GoogleRateLimitError", "ModelRateLimitError", "ResourceExhausted", "TooManyRequests"}
+
+
+@contextmanager
+def scheduler_session(session_id: str) -> Iterator[None]:
+    """이 블록(과 여기서 만든 스레드/태스크)의 Gemini 호출을 session_id 몫으로 셉니다."""
+    token = _current_session.set(session_id)
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+
+def set_scheduler_session(session_id: str) -> None:
+    """현재 컨텍스트의 세션을 지정합니다(Streamlit 스크립트 실행처럼 블록으로 감싸기 어려운 경우)."""
+    _current_session.set(session_id)
+
+
+def current_scheduler_session() -> str:
+    return _current_session.get()
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    if any(cls.__name__ in _THROTTLE_ERROR_NAMES for cls in type(exc).__mro__):
+        return True
+    if getattr(exc, "status_code", None) == 429 or getattr(exc, "code", None) == 429:
+        return True
+    text = str(exc)
+    return "RESOURCE_EXHAUSTED" in text or "429" in text.split(":", 1)[0]
+
+
+class _Lease:
+    __slots__ = ("session", "entry")
+
+    def __init__(self, session: str, entry: list[float]) -> None:
+        self.session = session
+        self.entry = entry  # 토큰 창의 [시각, 토큰] 항목(실제 사용량으로 보정)
+
+
+class GeminiScheduler:
+    """RPM/TPM 한도 안에서 Gemini 호출 슬롯을 나눠 주는 스케줄러입니다.
+
+    - 최근 60초의 요청 수와 (추정 후 실제 사용량으로 보정한) 토큰 수가 rpm/tpm을 넘지 않게 대기시킵니다.
+    - 동시 실행 수 한도는 AIMD로 조정합니다: 스로틀(429)이면 절반으로, 연속 성공이 한도만큼 쌓이면 +1.
+    - 공정성: 대기 중인 다른 세션이 자신보다 실행 중인 요청이 적으면 그 세션에 먼저 양보합니다.
+      따라서 배치 세션이 슬롯을 모두 쓰고 있어도 대화형 세션의 다음 요청이 먼저 들어갑니다.
+    - 스로틀 오류는 지터를 넣은 지수 백오프로 max_retries번까지 다시 시도하고, 그동안 새 요청도 잠시 멈춥니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        rpm: int = 60,
+        tpm: int = 1_000_000,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        window_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rpm < 1 or tpm < 1 or max_concurrency < 1:
+            raise ValueError("rpm, tpm, max_concurrency는 1 이상이어야 합니다.")
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = max(1, min(min_concurrency, max_concurrency))
+        self.concurrency_limit = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._requests: deque[float] = deque()
+        self._tokens: deque[list[float]] = deque()  # [시각, 토큰] (release 때 실제 값으로 보정)
+        self._in_flight: dict[str, int] = {}
+        self._waiting: dict[str, int] = {}
+        self._cooldown_until = 0.0
+        self._successes = 0
+        self.stats = {"granted": 0, "throttled": 0, "retries": 0, "failed": 0, "wait_seconds": 0.0}
+
+    # ---- 슬롯 계산 -------------------------------------------------------------
+
+    def _prune(self, now: float) -> None:
+        while self._requests and now - self._requests[0] >= self.window_seconds:
+            self._requests.popleft()
+        while self._tokens and now - self._tokens[0][0] >= self.window_seconds:
+            self._tokens.popleft()
+
+    def _delay_for(self, session: str, tokens: int, now: float) -> float:
+        """지금 슬롯을 줄 수 있으면 0, 아니면 다시 확인할 때까지의 대기 시간(초)을 반환합니다."""
+        self._prune(now)
+        if now < self._cooldown_until:
+            return self._cooldown_until - now
+        if sum(self._in_flight.values()) >= self.concurrency_limit:
+            return 0.05
+        mine = self._in_flight.get(session, 0)
+        if any(self._in_flight.get(other, 0) < mine for other in self._waiting if other != session):
+            return 0.05
+        if len(self._requests) >= self.rpm:
+            return self.window_seconds - (now - self._requests[0])
+        used = sum(t for _, t in self._tokens)
+        # 한 요청이 tpm보다 크면 창이 빌 때만 보냅니다(영원히 막히지 않도록).
+        if used + tokens > self.tpm and self._tokens:
+            return self.window_seconds - (now - self._tokens[0][0])
+        return 0.0
+
+    def _grant(self, session: str, tokens: int, now: float) -> _Lease:
+        self._requests.append(now)
+        entry = [now, float(tokens)]
+        self._tokens.append(entry)
+        self._in_flight[session] = self._in_flight.get(session, 0) + 1
+        self.stats["granted"] += 1
+        return _Lease(session, entry)
+
+    def _try_acquire(self, session: str, tokens: int) -> tuple[Optional[_Lease], float]:
+        with self._cond:
+            now = self.clock()
+            delay = self._delay_for(session, tokens, now)
+            if delay > 0:
+                return None, delay
+            return self._grant(session, tokens, now), 0.0
+
+    def acquire(self, tokens: int = 0, *, session: Optional[str] = None) -> _Lease:
+        session = session or _current_session.get()
+        started = time.monotonic()
+        with self._cond:
+            self._waiting[session] = self._waiting.get(session, 0) + 1
+            try:
+                while True:
+                    now = self.clock()
+                    delay = self._delay_for(session, tokens, now)
+                    if delay <= 0:
+                        lease = self._grant(session, tokens, now)
+                        self.stats["wait_seconds"] += time.monotonic() - started
+                        return lease
+                    self._cond.wait(timeout=min(delay, 1.0))
+            finally:
+                self._leave_waiting(session)
+
+    async def aacquire(self, tokens: int = 0, *, session: Optional[str] = None) -> _Lease:
+        session = session or _current_session.get()
+        started = time.monotonic()
+        with self._cond:
+            self._waiting[session] = self._waiting.get(session, 0) + 1
+        try:
+            while True:
+                lease, delay = self._try_acquire(session, tokens)
+                if lease is not None:
+                    with self._cond:
+                        self.stats["wait_seconds"] += time.monotonic() - started
+                    return lease
+                await asyncio.sleep(min(delay, 1.0))
+        finally:
+            with self._cond:
+                self._leave_waiting(session)
+
+    def _leave_waiting(self, session: str) -> None:
+        count = self._waiting.get(session, 0) - 1
+        if count > 0:
+            self._waiting[session] = count
+        else:
+            self._waiting.pop(session, None)
+
+    def release(self, lease: _Lease, *, used_tokens: Optional[int] = None, throttled: bool = False) -> None:
+        with self._cond:
+            count = self._in_flight.get(lease.session, 0) - 1
+            if count > 0:
+                self._in_flight[lease.session] = count
+            else:
+                self._in_flight.pop(lease.session, None)
+            if used_tokens is not None:
+                lease.entry[1] = float(used_tokens)
+            if throttled:
+                self.stats["throttled"] += 1
+                self._successes = 0
+                self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit // 2)
+            else:
+                self._successes += 1
+                if self._successes >= self.concurrency_limit and self.concurrency_limit < self.max_concurrency:
+                    self.concurrency_limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: [0, min(max_delay, base * 2^attempt)]
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _pause_all(self, delay: float) -> None:
+        with self._cond:
+            self._cooldown_until = max(self._cooldown_until, self.clock() + delay)
+
+    # ---- 호출 래퍼 -------------------------------------------------------------
+
+    def call(self, fn: Callable[[], T], *, tokens: int = 0, usage: Optional[Callable[[T], Optional[int]]] = None) -> T:
+        """슬롯을 얻어 fn()을 실행하고, 스로틀 오류면 백오프 후 다시 시도합니다."""
+        for attempt in range(self.max_retries + 1):
+            lease = self.acquire(tokens)
+            try:
+                result = fn()
+            except Exception as e:
+                throttled = is_throttle_error(e)
+                self.release(lease, throttled=throttled)
+                if not throttled or attempt >= self.max_retries:
+                    with self._cond:
+                        self.stats["failed"] += 1
+                    raise
+                delay = self._backoff(attempt)
+                self._pause_all(delay)
+                with self._cond:
+                    self.stats["retries"] += 1
+                time.sleep(delay)
+                continue
+            except BaseException:
+                # 스트리밍 제너레이터가 도중에 닫히거나(GeneratorExit) 중단되어도 슬롯을 돌려줍니다.
+                self.release(lease)
+                raise
+            self.release(lease, used_tokens=usage(result) if usage is not None else None)
+            return result
+        raise AssertionError("unreachable")
+
+    async def acall(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        *,
+        tokens: int = 0,
+        usage: Optional[Callable[[T], Optional[int]]] = None,
+    ) -> T:
+        """call의 async 버전입니다. 대기/백오프 동안 이벤트 루프를 막지 않습니다."""
+        for attempt in range(self.max_retries + 1):
+            lease = await self.aacquire(tokens)
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                self.release(lease)
+                raise
+            except Exception as e:
+                throttled = is_throttle_error(e)
+                self.release(lease, throttled=throttled)
+                if not throttled or attempt >= self.max_retries:
+                    with self._cond:
+                        self.stats["failed"] += 1
+                    raise
+                delay = self._backoff(attempt)
+                self._pause_all(delay)
+                with self._cond:
+                    self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+                continue
+            self.release(lease, used_tokens=usage(result) if usage is not None else None)
+            return result
+        raise AssertionError("unreachable")
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._cond:
+            self._prune(self.clock())
+            return {
+                **self.stats,
+                "concurrency_limit": self.concurrency_limit,
+                "in_flight": dict(self._in_flight),
+                "requests_in_window": len(self._requests),
+                "tokens_in_window": int(sum(t for _, t in self._tokens)),
+            }
+
+
+_shared_scheduler: Optional[GeminiScheduler] = None
+_shared_scheduler_lock = threading.Lock()
+
+
+def get_gemini_scheduler() -> GeminiScheduler:
+    """프로세스 전역 스케줄러를 반환합니다. 한도는 GEMINI_RPM/GEMINI_TPM/GEMINI_MAX_CONCURRENCY로 조정합니다."""
+    global _shared_scheduler
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = GeminiScheduler(
+                rpm=int(os.getenv("GEMINI_RPM", "60")),
+                tpm=int(os.getenv("GEMINI_TPM", "1000000")),
+                max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")),
+            )
+        return _shared_scheduler
+
+
+# ---- 오프라인 점검 ---------------------------------------------------------------
+
+class FakeRateLimitError(RuntimeError):
+    """가짜 모델이 일부러 내는 429 오류입니다."""
+
+    status_code = 429
+
+
+class FakeThrottlingModel:
+    """동시에 capacity개를 넘거나 throttle_rate 확률에 걸리면 429를 내는 가짜 모델 호출입니다."""
+
+    def __init__(self, *, capacity: int = 3, throttle_rate: float = 0.1, latency: float = 0.05) -> None:
+        self.capacity = capacity
+        self.throttle_rate = throttle_rate
+        self.latency = latency
+        self.calls = 0
+        self.rejected = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    async def __call__(self) -> str:
+        with self._lock:
+            self.calls += 1
+            self._active += 1
+            overloaded = self._active > self.capacity
+        try:
+            await asyncio.sleep(self.latency)
+            if overloaded or random.random() < self.throttle_rate:
+                with self._lock:
+                    self.rejected += 1
+                raise FakeRateLimitError("429 RESOURCE_EXHAUSTED (fake)")
+            return "ok"
+        finally:
+            with self._lock:
+                self._active -= 1
+
+
+async def simulate(
+    *, requests: int = 60, sessions: int = 2, capacity: int = 3, throttle_rate: float = 0.1, rpm: int = 600
+) -> dict[str, Any]:
+    """가짜 모델로 여러 세션의 요청을 동시에 보내 스케줄러 동작(재시도, 동시성 조정, 세션별 완료 시간)을 확인합니다."""
+    scheduler = GeminiScheduler(rpm=rpm, max_concurrency=8, base_delay=0.05, max_delay=0.5)
+    model = FakeThrottlingModel(capacity=capacity, throttle_rate=throttle_rate)
+    finished: dict[str, list[float]] = {}
+    started = time.perf_counter()
+
+    async def one(session: str) -> None:
+        with scheduler_session(session):
+            await scheduler.acall(model)
+        finished.setdefault(session, []).append(time.perf_counter() - started)
+
+    # 첫 세션은 배치처럼 요청을 대부분 보내고, 나머지 세션은 소수만 보냅니다.
+    jobs = [f"s{0 if i % 10 else i // 10 % sessions}" for i in range(requests)]
+    await asyncio.gather(*(one(s) for s in jobs), return_exceptions=True)
+    return {
+        "elapsed_s": round(time.perf_counter() - started, 2),
+        "model_calls": model.calls,
+        "model_rejected": model.rejected,
+        "scheduler": scheduler.snapshot(),
+        "session_done_avg_s": {s: round(sum(v) / len(v), 2) for s, v in sorted(finished.items())},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="가짜 스로틀링 모델로 Gemini 스케줄러를 점검합니다.")
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--sessions", type=int, default=2)
+    parser.add_argument("--capacity", type=int, default=3)
+    parser.add_argument("--throttle-rate", type=float, default=0.1)
+    args = parser.parse_args()
+    print(
+        asyncio.run(
+            simulate(
+                requests=args.requests,
+                sessions=args.sessions,
+                capacity=args.capacity,
+                throttle_rate=args.throttle_rate,
+            )
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+# naver.me 단축 URL을 placeId로 해석하고, 해석 결과를 메모리(LRU)와 디스크(SQLite)에 캐시합니다.
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+from config import CACHE_DIR
+from naver_http import KeepAliveClient
+
+
+PLACE_ID_PATTERNS = (
+    r"/entry/place/(\d+)",
+    r"/place/(\d+)",
+    r"placeId=(\d+)",
+)
+
+
+def match_place_id(url: str) -> Optional[str]:
+    """URL 문자열에 placeId가 들어 있으면 반환합니다(네트워크 요청 없음)."""
+    for p in PLACE_ID_PATTERNS:
+        m = re.search(p, url)
+        if m:
+            return m.group(1)
+    return None
+
+
+def is_short_link(url: str) -> bool:
+    return "naver.me" in urlsplit(url.strip()).netloc.lower()
+
+
+def _cache_key(url: str) -> str:
+    # http/https, 끝 슬래시 차이는 같은 단축 링크로 취급합니다.
+    parts = urlsplit(url.strip())
+    return f"{parts.netloc.lower()}{parts.path.rstrip('/')}"
+
+
+class ShortLinkResolver:
+    """단축 URL -> placeId 해석기입니다.
+
+    리다이렉트는 KeepAliveClient.resolve로 본문 없이 따라가며, placeId가 보이는 URL에 도달하면 바로 멈춥니다.
+    결과는 최대 max_entries개의 LRU와 SQLite(path)에 저장하며, path=None이면 메모리 캐시만 씁니다.
+    resolve_many는 해석기와 수명을 같이하는 max_workers 크기의 스레드 풀을 쓰므로, 스레드마다 맺은
+    keep-alive 연결이 호출 사이에도 유지됩니다. 다 쓴 해석기는 close()로 풀을 정리합니다.
+    """
+
+    def __init__(
+        self,
+        client: KeepAliveClient,
+        *,
+        max_entries: int = 1024,
+        path: Path | str | None = CACHE_DIR / "short_links.sqlite3",
+        max_workers: int = 8,
+    ) -> None:
+        self.client = client
+        self.max_entries = max_entries
+        self.max_workers = max(1, max_workers)
+        self.path = Path(path) if path is not None else None
+        self.hits = 0
+        self.misses = 0
+        self._lru: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_ready = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        assert self.path is not None
+        if not self._db_ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(self.path, timeout=10)) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS short_links ("
+                    "short_key TEXT PRIMARY KEY, place_id TEXT NOT NULL, resolved_at REAL NOT NULL)"
+                )
+            self._db_ready = True
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _remember(self, key: str, place_id: str) -> None:
+        with self._lock:
+            self._lru[key] = place_id
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def lookup(self, url: str) -> Optional[str]:
+        """네트워크 요청 없이 캐시(LRU -> 디스크)에서만 placeId를 찾습니다."""
+        key = _cache_key(url)
+        with self._lock:
+            place_id = self._lru.get(key)
+            if place_id is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return place_id
+        if self.path is None:
+            return None
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT place_id FROM short_links WHERE short_key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._remember(key, row[0])
+        with self._lock:
+            self.hits += 1
+        return row[0]
+
+    def resolve(self, url: str) -> str:
+        """단축 URL을 placeId로 해석합니다. placeId를 찾지 못하면 ValueError."""
+        place_id = self.lookup(url)
+        if place_id is not None:
+            return place_id
+        with self._lock:
+            self.misses += 1
+        final_url = self.client.resolve(url.strip(), until=lambda u: match_place_id(u) is not None)
+        place_id = match_place_id(final_url)
+        if place_id is None:
+            raise ValueError("URL에서 placeId를 찾지 못했습니다.")
+        key = _cache_key(url)
+        self._remember(key, place_id)
+        if self.path is not None:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO short_links (short_key, place_id, resolved_at) VALUES (?, ?, ?)",
+                    (key, place_id, time.time()),
+                )
+        return place_id
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="short-links")
+            return self._executor
+
+    def close(self) -> None:
+        """resolve_many의 스레드 풀을 정리합니다. 이후 resolve_many를 다시 부르면 새 풀을 만듭니다."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def resolve_many(
+        self, urls: Iterable[str], *, max_workers: Optional[int] = None
+    ) -> tuple[dict[str, str], dict[str, str]]:
+        """여러 단축 URL을 한 번에 해석해 ({URL: placeId}, {URL: 오류})를 반환합니다.
+
+        캐시에 있는 URL은 바로 채우고, 나머지는 중복을 제거한 뒤 해석기의 스레드 풀에서 나눠 해석합니다.
+        max_workers(기본과 상한: 해석기의 max_workers)로 이번 호출의 동시 해석 수를 줄일 수 있습니다.
+        풀의 스레드는 호출 사이에도 살아 있어 자기 keep-alive 연결을 계속 재사용하며,
+        같은 호스트로의 연결 수는 풀 크기로 제한됩니다.
+        """
+        resolved: dict[str, str] = {}
+        errors: dict[str, str] = {}
+        pending: list[str] = []
+        for url in dict.fromkeys(urls):
+            place_id = self.lookup(url)
+            if place_id is not None:
+                resolved[url] = place_id
+            else:
+                pending.append(url)
+        if not pending:
+            return resolved, errors
+
+        queue = deque(pending)
+
+        def work() -> list[tuple[str, Optional[str], str]]:
+            # 작업자마다 큐에서 URL을 꺼내 처리하므로 동시 해석 수가 작업자 수로 제한됩니다.
+            done = []
+            while True:
+                try:
+                    url = queue.popleft()
+                except IndexError:
+                    return done
+                try:
+                    done.append((url, self.resolve(url), ""))
+                except Exception as e:
+                    done.append((url, None, f"{type(e).__name__}: {e}"))
+
+        limit = min(self.max_workers if max_workers is None else max(1, max_workers), self.max_workers, len(pending))
+        pool = self._pool()
+        for future in [pool.submit(work) for _ in range(limit)]:
+            for url, place_id, error in future.result():
+                if place_id is not None:
+                    resolved[url] = place_id
+                else:
+                    errors[url] = error
+        return resolved, errors
@@ -0,0 +1,8 @@
+import os
+import sys
+from pathlib import Path
+
+# 저장소 루트의 평면 모듈(rate_limit, prompt, ...)을 테스트에서 바로 가져올 수 있게 합니다.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# 테스트가 만든 span이 .cache/metrics.jsonl에 섞이지 않도록 파일 sink를 끕니다.
+os.environ.setdefault("METRICS_JSONL", "")
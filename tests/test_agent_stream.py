@@ -0,0 +1,57 @@
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+from bench_pipeline import build_bench_pipeline
+from fake_llm import DEFAULT_RESPONSES, ScriptedChatModel
+
+PREAMBLE = "형식을 먼저 확인하겠습니다."
+
+
+class PreambleModel(ScriptedChatModel):
+    """도구 호출 메시지에 짧은 머리말 텍스트를 붙이는 모델입니다(Gemini가 종종 이렇게 응답합니다)."""
+
+    def _reply(self, messages):
+        message = super()._reply(messages)
+        if message.tool_calls:
+            return AIMessage(content=PREAMBLE, tool_calls=message.tool_calls, usage_metadata=message.usage_metadata)
+        return message
+
+    def _chunks(self, message):
+        if message.tool_calls:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=str(message.content)))
+        yield from super()._chunks(message)
+
+
+def _drain(generator):
+    parts = []
+    while True:
+        try:
+            parts.append(next(generator))
+        except StopIteration as stop:
+            return parts, stop.value
+
+
+@pytest.mark.parametrize("call_tools", [True, False])
+def test_tool_bound_agent_streams_answer_without_preamble(tmp_path, call_tools):
+    pipeline = build_bench_pipeline(PreambleModel(call_tools=call_tools), tmp_path, style_mode="tool")
+    blog = DEFAULT_RESPONSES["blog_writer_agent"]
+
+    parts, returned = _drain(pipeline.stream_comments(blog, use_cache=True))
+
+    # 댓글 Agent는 도구가 연결되어 있어도 답변을 조각 단위로 내보냅니다.
+    assert len(parts) > 1
+    assert "".join(parts) == returned == DEFAULT_RESPONSES["comment_writer_agent"]
+    assert PREAMBLE not in returned
+    # 캐시에는 머리말 없는 최종 답변만 저장됩니다.
+    assert pipeline.write_comments(blog, use_cache=True) == returned
+
+
+def test_blog_stream_matches_invoke_in_tool_mode(tmp_path):
+    pipeline = build_bench_pipeline(PreambleModel(), tmp_path, style_mode="tool")
+    prompt = DEFAULT_RESPONSES["prompt_builder_agent"]
+
+    parts, returned = _drain(pipeline.stream_blog(prompt, use_cache=False))
+
+    assert len(parts) > 1
+    assert "".join(parts) == returned == pipeline.write_blog(prompt, use_cache=False)
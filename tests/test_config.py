@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+import config
+
+KEYS = ("GOOGLE_API_KEY", "GOOGLE_MODEL", "GOOGLE_TEMPERATURE", "STYLE_CORPUS_MODE", "FACTS_TOKEN_BUDGET", "TAB_CHAR_BUDGET")
+
+
+def _load_dotenv_keeping_bom(dotenv_path, override=False):
+    """BOM을 벗기지 않는 예전 python-dotenv처럼 첫 키 이름에 \ufeff가 붙은 채로 환경변수를 채웁니다."""
+    for line in dotenv_path.read_text(encoding="utf-8").splitlines():
+        key, _, value = line.partition("=")
+        if key and (override or key not in os.environ):
+            os.environ[key] = value
+    return True
+
+
+@pytest.fixture
+def env_dir(tmp_path, monkeypatch):
+    """tmp_path의 .env를 읽게 하고, load_dotenv가 채운 환경변수는 테스트가 끝나면 되돌립니다."""
+    monkeypatch.setattr(config, "BASE_DIR", tmp_path)
+    monkeypatch.setattr(config, "load_dotenv", _load_dotenv_keeping_bom)
+    for key in (*KEYS, *(f"\ufeff{key}" for key in KEYS)):
+        # 없던 변수도 setenv로 기록해 두어야 테스트 후 지워집니다.
+        monkeypatch.setenv(key, "")
+        monkeypatch.delenv(key)
+    return tmp_path
+
+
+@pytest.mark.parametrize("first_key", KEYS)
+def test_bom_prefixed_env_keeps_every_setting(env_dir, first_key):
+    values = {
+        "GOOGLE_API_KEY": "secret",
+        "GOOGLE_MODEL": "gemini-test",
+        "GOOGLE_TEMPERATURE": "0.2",
+        "STYLE_CORPUS_MODE": "tool",
+        "FACTS_TOKEN_BUDGET": "1200",
+        "TAB_CHAR_BUDGET": "900",
+    }
+    ordered = [first_key, *(key for key in KEYS if key != first_key)]
+    lines = [f"{key}={values[key]}" for key in ordered]
+    (env_dir / ".env").write_bytes(("\n".join(lines) + "\n").encode("utf-8-sig"))
+
+    cfg = config.load_config()
+
+    assert cfg.google_api_key == "secret"
+    assert cfg.google_model == "gemini-test"
+    assert cfg.temperature == 0.2
+    assert cfg.style_mode == "tool"
+    assert cfg.facts_token_budget == 1200
+    assert cfg.tab_char_budget == 900
+
+
+def test_missing_api_key_is_allowed_only_when_not_required(env_dir):
+    (env_dir / ".env").write_text("TAB_CHAR_BUDGET=700\n", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        config.load_config()
+    cfg = config.load_config(require_api_key=False)
+    assert cfg.google_api_key == ""
+    assert cfg.tab_char_budget == 700
+    assert cfg.style_mode == "context"
@@ -0,0 +1,147 @@
+import threading
+import time
+
+import pytest
+
+from crawl_cache import CrawlCache, cached_crawl_place_tabs
+from naver_map import CrawledPlaceData
+
+MAP_URL = "https://map.naver.com/p/entry/place/123"
+TTLS = {"home": 100, "menu": 100, "info": 100, "news": 10}
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCrawl:
+    """crawl_place_tabs 대신 요청받은 탭만 "<탭>@<호출 번호>"로 채워 반환합니다."""
+
+    def __init__(self, errors=None):
+        self.calls = []
+        self.errors = errors or {}
+        self.called = threading.Event()
+
+    def __call__(self, map_url, *, tabs=None, **kwargs):
+        self.calls.append(set(tabs))
+        n = len(self.calls)
+        texts = {key: f"{key}@{n}" if key in tabs and key not in self.errors else "" for key in TTLS}
+        self.called.set()
+        return CrawledPlaceData(
+            place_id="123",
+            source_url=map_url,
+            home_text=texts["home"],
+            menu_text=texts["menu"],
+            info_text=texts["info"],
+            news_text=texts["news"],
+            tab_errors={key: msg for key, msg in self.errors.items() if key in tabs},
+        )
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return CrawlCache(tmp_path / "crawl.sqlite3", tab_ttls=TTLS, stale_seconds=50, clock=clock)
+
+
+def _ages(**ages):
+    return {key: (f"{key} text", age) for key, age in ages.items()}
+
+
+def test_classify_fresh_stale_expired(cache):
+    # 경계값: TTL과 같으면 fresh, TTL + stale_seconds와 같으면 아직 stale입니다.
+    stale, expired = cache.classify(_ages(home=100, menu=101, info=150, news=61))
+    assert stale == {"menu", "info"}
+    assert expired == {"news"}
+    stale, expired = cache.classify(_ages(home=151, menu=0))
+    assert stale == set()
+    # 저장되지 않은 탭은 만료로 취급합니다.
+    assert expired == {"home", "info", "news"}
+
+
+def test_load_reports_age_from_injected_clock(cache, clock):
+    cache.store(FakeCrawl()(MAP_URL, tabs={"home", "news"}), {"home", "news"})
+    clock.now += 30
+    source_url, tabs = cache.load("123")
+    assert source_url == MAP_URL
+    assert tabs == {"home": ("home@1", 30.0), "news": ("news@1", 30.0)}
+
+
+def test_fresh_hit_does_not_crawl(cache, clock):
+    crawl = FakeCrawl()
+    first = cached_crawl_place_tabs(MAP_URL, cache=cache, crawl=crawl)
+    assert crawl.calls == [{"home", "menu", "info", "news"}]
+    clock.now += 5
+    second = cached_crawl_place_tabs(MAP_URL, cache=cache, crawl=crawl)
+    assert len(crawl.calls) == 1
+    assert second.news_text == first.news_text == "news@1"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_stale_returns_cached_and_refreshes_in_background(cache, clock):
+    crawl = FakeCrawl()
+    cached_crawl_place_tabs(MAP_URL, cache=cache, crawl=crawl)
+    crawl.called.clear()
+    clock.now += 20  # news만 TTL(10) 초과, stale 구간(10 + 50) 안
+
+    data = cached_crawl_place_tabs(MAP_URL, cache=cache, crawl=crawl)
+    assert data.news_text == "news@1"
+    assert crawl.called.wait(5)
+    assert crawl.calls[1] == {"news"}
+    deadline = time.monotonic() + 5
+    while cache._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    _, tabs = cache.load("123")
+    assert tabs["news"] == ("news@2", 0.0)
+    assert tabs["home"] == ("home@1", 20.0)
+
+
+def test_expired_recrawls_expired_and_stale_tabs_and_merges(cache, clock):
+    crawl = FakeCrawl()
+    cached_crawl_place_tabs(MAP_URL, cache=cache, crawl=crawl)
+    clock.now += 120  # news 만료(>60), home/menu/info stale(>100)
+    crawl.errors = {"menu": "TimeoutError: menu"}
+
+    data = cached_crawl_place_tabs(MAP_URL, cache=cache, crawl=crawl)
+    assert crawl.calls[1] == {"home", "menu", "info", "news"}
+    assert data.news_text == "news@2"
+    assert data.home_text == "home@2"
+    # 다시 수집에 실패한 탭은 캐시 값을 유지하고 오류도 함께 돌려줍니다.
+    assert data.menu_text == "menu@1"
+    assert data.tab_errors == {"menu": "TimeoutError: menu"}
+
+    _, tabs = cache.load("123")
+    assert tabs["menu"] == ("menu@1", 120.0)
+    assert tabs["news"] == ("news@2", 0.0)
+
+
+def test_partial_recrawl_only_fetches_expired_tabs(cache, clock):
+    crawl = FakeCrawl()
+    cached_crawl_place_tabs(MAP_URL, cache=cache, crawl=crawl)
+    clock.now += 80  # news만 만료, 나머지는 fresh
+
+    data = cached_crawl_place_tabs(MAP_URL, cache=cache, crawl=crawl)
+    assert crawl.calls[1] == {"news"}
+    assert (data.home_text, data.menu_text, data.info_text, data.news_text) == (
+        "home@1",
+        "menu@1",
+        "info@1",
+        "news@2",
+    )
+
+
+def test_refresh_ignores_cache(cache):
+    crawl = FakeCrawl()
+    cached_crawl_place_tabs(MAP_URL, cache=cache, crawl=crawl)
+    data = cached_crawl_place_tabs(MAP_URL, cache=cache, crawl=crawl, refresh=True)
+    assert crawl.calls[1] == {"home", "menu", "info", "news"}
+    assert data.home_text == "home@2"
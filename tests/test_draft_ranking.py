@@ -0,0 +1,59 @@
+import pytest
+
+from draft_ranking import DraftScore, rank_drafts, score_draft
+
+GOOD = "\n\n".join(
+    [
+        "안녕하세요. 가평 카페 다녀온 후기입니다.",
+        "영업시간은 10시부터 22시까지예요.",
+        "주차는 건물 뒤편에 가능합니다.",
+        "메뉴는 아메리카노와 라떼가 대표예요.",
+        "분위기가 조용해서 좋았어요!",
+    ]
+)
+
+
+def test_well_formed_draft_scores_full_marks_at_target_length():
+    score = score_draft(GOOD, tone="정보형", target_keyword="가평 카페", target_chars=len(GOOD))
+    assert (score.length_score, score.keyword_score, score.structure_score) == (1.0, 1.0, 1.0)
+    assert score.total == 100.0
+    assert score.issues == ()
+    assert score.non_space_chars == len(GOOD.replace(" ", "").replace("\n", ""))
+
+
+def test_length_score_falls_linearly_and_floors_at_zero():
+    assert score_draft("가" * 150, target_chars=100).length_score == 0.5
+    assert score_draft("가" * 50, target_chars=100).length_score == 0.5
+    assert score_draft("가" * 300, target_chars=100).length_score == 0.0
+    issues = score_draft("가" * 50, target_chars=100).issues
+    assert "글자수 50자(목표 100자)" in issues
+
+
+def test_keyword_matches_ignoring_spaces_then_partial_words():
+    assert score_draft("가평카페 방문", target_keyword="가평 카페").keyword_score == 1.0
+    score = score_draft("가평 여행", target_keyword="가평 카페 추천")
+    assert score.keyword_score == pytest.approx(0.333)
+    assert "키워드 누락: 카페, 추천" in score.issues
+    assert score_draft("아무 글", target_keyword="  ").keyword_score == 1.0
+
+
+def test_structure_issues_are_reported():
+    text = "# 가평 카페\n\n메뉴 소개!!!!"
+    score = score_draft(text)
+    # 6개 점검 중 메뉴 정보만 통과
+    assert score.structure_score == pytest.approx(0.167)
+    assert {"인사로 시작하지 않음", "영업시간 정보 없음", "주차 정보 없음", "느낌표 4개", "문단 2개"} <= set(score.issues)
+    # 제목 기호(#)를 떼고 인사 여부를 봅니다.
+    assert "인사로 시작하지 않음" not in score_draft("## 안녕하세요\n본문").issues
+
+
+def test_total_uses_weights():
+    score = DraftScore("t", 0, 0, length_score=0.5, keyword_score=1.0, structure_score=0.0, issues=())
+    assert score.total == 50.0
+
+
+def test_rank_drafts_orders_by_total_and_keeps_input_order_on_ties():
+    drafts = {"경험담": "짧은 글", "정보형": GOOD, "마케팅": "짧은 글"}
+    ranked = rank_drafts(drafts, target_keyword="가평 카페", target_chars=len(GOOD))
+    assert [s.tone for s in ranked] == ["정보형", "경험담", "마케팅"]
+    assert ranked[0].total > ranked[1].total == ranked[2].total
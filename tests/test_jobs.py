@@ -0,0 +1,72 @@
+import subprocess
+import sys
+import types
+from pathlib import Path
+
+import jobs
+import ui
+from cancellation import JobCancelled
+from jobs import JobManager
+
+
+def test_get_with_owner_token_hides_other_owners_jobs():
+    manager = JobManager(max_workers=1)
+    try:
+        job = manager.submit("crawl", lambda job: "ok", owner_token="mine")
+        assert job.wait(5)
+        assert manager.get(job.id) is job
+        assert manager.get(job.id, owner_token="mine") is job
+        assert manager.get(job.id, owner_token="theirs") is None
+        # 토큰 없이 제출한 작업은 토큰으로 찾을 수 없습니다.
+        anonymous = manager.submit("crawl", lambda job: "ok")
+        assert manager.get(anonymous.id, owner_token="") is None
+    finally:
+        manager.shutdown()
+
+
+def test_jobs_module_reexports_cancellation_exception():
+    assert jobs.JobCancelled is JobCancelled
+    manager = JobManager(max_workers=1)
+    try:
+        def work(job):
+            job.cancel()
+            job.check_cancelled()
+
+        job = manager.submit("crawl", work)
+        assert job.wait(5)
+        assert job.status == "cancelled"
+    finally:
+        manager.shutdown()
+
+
+def test_metrics_does_not_import_job_manager():
+    code = "import sys, metrics; print('jobs' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=Path(__file__).resolve().parents[1])
+    assert out.stdout.strip() == "False"
+
+
+def test_xsrf_secret_is_stable_across_masks():
+    token = bytes(range(16))
+    first = "2|01020304|" + bytes(b ^ m for b, m in zip(token, b"\x01\x02\x03\x04" * 4)).hex() + "|1700000000"
+    second = "2|0a0b0c0d|" + bytes(b ^ m for b, m in zip(token, b"\x0a\x0b\x0c\x0d" * 4)).hex() + "|1700000000"
+    assert first != second
+    assert ui._xsrf_secret(first) == ui._xsrf_secret(second) == token
+    assert ui._xsrf_secret(token.hex()) == token
+    assert ui._xsrf_secret("2|zz|yy|1") == b""
+
+
+def test_query_params_only_reattach_own_jobs(monkeypatch):
+    manager = JobManager(max_workers=1)
+    try:
+        mine = manager.submit("crawl", lambda job: "ok", owner_token="mine")
+        theirs = manager.submit("blog", lambda job: "ok", owner_token="theirs")
+        fake_st = types.SimpleNamespace(
+            query_params={"jobs": f"crawl:{mine.id},blog:{theirs.id},prompt:{mine.id}"},
+            session_state=types.SimpleNamespace(job_owner_token="mine"),
+        )
+        monkeypatch.setattr(ui, "st", fake_st)
+        monkeypatch.setattr(ui, "get_job_manager", lambda: manager)
+        # 남의 작업과, 종류가 맞지 않는 ID는 버립니다.
+        assert ui._jobs_from_query_params() == {"crawl": mine.id}
+    finally:
+        manager.shutdown()
@@ -0,0 +1,64 @@
+import gzip
+import zlib
+
+from naver_http import _decode_body, parse_place_html
+
+
+PAGE = """
+<html><head><script>window.__APOLLO_STATE__ = {"a": "<div class='place_section'>x</div>"};</script></head>
+<body>
+  <div role="tablist">
+    <a href="/restaurant/1/home" role="tab"><span>홈</span></a>
+    <a href="/restaurant/1/menu/list" role="tab"><span>메뉴</span></a>
+    <a href="/restaurant/1/menu/other" role="tab">메뉴</a>
+    <a href="#" role="button">펼쳐보기</a>
+    <a role="tab">소식</a>
+  </div>
+  <div class="place_section">
+    <h2 class="place_section_header">대표 메뉴<span class="count">3</span></h2>
+    <h3>두 번째 제목</h3>
+    <ul><li>아메리카노 4,500원</li><li>라떼&nbsp;5,000원</li></ul>
+    <div class="place_section inner">
+      <div class="place_section_title">시즌 메뉴</div>
+      <p>딸기 케이크</p>
+    </div>
+  </div>
+  <div class="place_section"><style>.x{}</style><p>   </p></div>
+</body></html>
+"""
+
+
+def test_parse_place_html_sections_titles_and_tab_links():
+    blocks, tab_links = parse_place_html(PAGE)
+
+    assert [block["title"] for block in blocks] == ["대표 메뉴3", "시즌 메뉴"]
+    # 중첩 섹션은 innerText처럼 바깥 섹션 텍스트에도 포함되고, 제목은 섹션마다 첫 제목 요소만 씁니다.
+    assert blocks[0]["text"].splitlines() == [
+        "대표 메뉴3",
+        "두 번째 제목",
+        "아메리카노 4,500원",
+        "라떼 5,000원",
+        "시즌 메뉴",
+        "딸기 케이크",
+    ]
+    assert blocks[1]["text"] == "시즌 메뉴\n딸기 케이크"
+    # 같은 라벨은 첫 링크를, href 없는 탭과 role=button 링크는 건너뜁니다.
+    assert tab_links == {"홈": "/restaurant/1/home", "메뉴": "/restaurant/1/menu/list"}
+
+
+def test_parse_place_html_ignores_script_and_unclosed_tags():
+    blocks, _ = parse_place_html('<div class="place_section"><p>영업 중<br>21:00에 영업 종료</div><p>밖</p>')
+
+    assert blocks == [{"title": "", "text": "영업 중\n21:00에 영업 종료"}]
+
+
+def test_decode_body_handles_gzip_zlib_raw_deflate_and_empty():
+    data = "본문".encode() * 20
+    raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    raw_deflate = raw.compress(data) + raw.flush()
+
+    assert _decode_body(gzip.compress(data), "gzip") == data
+    assert _decode_body(zlib.compress(data), "deflate") == data
+    assert _decode_body(raw_deflate, "deflate") == data
+    assert _decode_body(b"", "gzip") == b""
+    assert _decode_body(data, "") == data
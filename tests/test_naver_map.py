@@ -0,0 +1,205 @@
+import pytest
+
+import naver_map
+from naver_map import crawl_place_tabs
+
+PLACE_ID = "1234567890"
+MAP_URL = f"https://map.naver.com/p/entry/place/{PLACE_ID}"
+HOME_URL = f"https://pcmap.place.naver.com/place/{PLACE_ID}/home"
+
+HOME_HTML = """
+<a href="/restaurant/1234567890/menu/list" role="tab">메뉴</a>
+<a href="/restaurant/1234567890/information" role="tab">정보</a>
+<a href="/restaurant/1234567890/feed" role="tab">소식</a>
+<div class="place_section"><h2>기본 정보</h2><p>경기 가평군 설악면 유명로 1234, 매일 10:00 - 21:00</p></div>
+"""
+MENU_HTML = '<div class="place_section"><h2>메뉴</h2><p>아메리카노 4,500원, 라떼 5,000원</p></div>'
+# 정보 탭은 클라이언트 렌더링이라 서버 HTML에 본문이 없습니다.
+INFO_HTML = '<div id="app-root"></div>'
+
+
+def fetch(url):
+    if url == HOME_URL:
+        return f"https://pcmap.place.naver.com/restaurant/{PLACE_ID}/home", HOME_HTML
+    if url.endswith("/menu/list"):
+        return url, MENU_HTML
+    if url.endswith("/information"):
+        return url, INFO_HTML
+    raise ConnectionError(f"offline: {url}")
+
+
+class FakePool:
+    def run(self, fn):
+        return fn(object())
+
+
+@pytest.fixture
+def browser(monkeypatch):
+    """브라우저 수집(_crawl_in_context)을 대신하고, 어떤 탭을 요청받았는지 기록합니다."""
+    calls = []
+
+    def crawl_in_context(context, map_entry_home, budget, *, tabs, **_):
+        calls.append(set(tabs))
+        result = {"home": "", "menu": "", "info": "", "news": ""}
+        for key in tabs:
+            result[key] = f"browser {key}"
+        return result, {}
+
+    monkeypatch.setattr(naver_map, "sync_playwright", object())
+    monkeypatch.setattr(naver_map, "_crawl_in_context", crawl_in_context)
+    return calls
+
+
+def test_http_fast_path_is_off_by_default(browser):
+    data = crawl_place_tabs(MAP_URL, fetch=fetch, pool=FakePool(), profile=None)
+
+    assert browser == [{"home", "menu", "info", "news"}]
+    assert data.fetch_mode == "browser"
+    assert data.menu_text == "browser menu"
+
+
+def test_partial_http_result_is_merged_with_browser_fallback(browser):
+    data = crawl_place_tabs(MAP_URL, http_fast_path=True, fetch=fetch, pool=FakePool(), profile=None)
+
+    # HTTP로 본문을 얻지 못한 탭(빈 정보 탭, 가져오기에 실패한 소식 탭)만 브라우저로 다시 수집합니다.
+    assert browser == [{"info", "news"}]
+    assert data.fetch_mode == "http+browser"
+    assert "유명로 1234" in data.home_text
+    assert "아메리카노" in data.menu_text
+    assert data.info_text == "browser info"
+    assert data.news_text == "browser news"
+    assert data.tab_errors == {}
+
+
+def test_http_fast_path_skips_browser_when_all_tabs_found(browser, monkeypatch):
+    monkeypatch.setattr(naver_map, "sync_playwright", None)
+
+    def full_fetch(url):
+        return (url, MENU_HTML) if url != HOME_URL else fetch(url)
+
+    data = crawl_place_tabs(MAP_URL, http_fast_path=True, fetch=full_fetch, pool=FakePool(), profile=None)
+
+    # playwright가 없어도 HTTP 경로만으로 끝나면 오류 없이 반환합니다.
+    assert browser == []
+    assert data.fetch_mode == "http"
+    assert "아메리카노" in data.info_text
+
+
+def test_http_failure_falls_back_to_full_browser_crawl(browser):
+    def offline(url):
+        raise ConnectionError(url)
+
+    data = crawl_place_tabs(MAP_URL, http_fast_path=True, fetch=offline, pool=FakePool(), profile=None)
+
+    assert browser == [{"home", "menu", "info", "news"}]
+    assert data.fetch_mode == "browser"
+
+
+class FakeFrame:
+    url = "https://pcmap.place.naver.com/restaurant/1234567890/home"
+
+    def __init__(self, text="홈 본문 텍스트입니다. 충분히 깁니다.", fail=False):
+        self.text = text
+        self.fail = fail
+        self.section_waits = 0
+
+    def wait_for_selector(self, *args, **kwargs):
+        self.section_waits += 1
+
+    def wait_for_load_state(self, *args, **kwargs):
+        pass
+
+    def evaluate(self, script, arg=None):
+        if self.fail:
+            raise RuntimeError("frame detached")
+        links = {"메뉴": "/restaurant/1234567890/menu/list", "정보": "/restaurant/1234567890/information"}
+        if script is naver_map._TAB_LINKS_SCRIPT:
+            return links
+        return {"sections": [{"title": "", "text": self.text}], "tabLinks": links, "fallback": ""}
+
+
+class FakePage:
+    def __init__(self, owner, frame):
+        self.owner = owner
+        self.frames = [frame]
+        self.main_frame = frame
+        self.closed = False
+
+    def set_default_timeout(self, ms):
+        pass
+
+    def goto(self, url, **kwargs):
+        if url in self.owner.broken:
+            raise TimeoutError(f"goto timeout: {url}")
+        self.frames = [self.owner.frames.get(url, self.main_frame)]
+        self.main_frame = self.frames[0]
+
+    def wait_for_load_state(self, *args, **kwargs):
+        pass
+
+    def wait_for_timeout(self, ms):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, home, frames=None, broken=()):
+        self.home = home
+        self.frames = frames or {}
+        self.broken = set(broken)
+        self.pages = []
+
+    def new_page(self):
+        page = FakePage(self, self.home)
+        self.pages.append(page)
+        return page
+
+
+MENU_URL = "https://pcmap.place.naver.com/restaurant/1234567890/menu/list"
+INFO_URL = "https://pcmap.place.naver.com/restaurant/1234567890/information"
+
+
+def _crawl(context, *, concurrent_tabs):
+    return naver_map._crawl_in_context(
+        context,
+        MAP_URL,
+        naver_map._LatencyBudget(None),
+        timeout_ms=1000,
+        concurrent_tabs=concurrent_tabs,
+        tab_timeout_ms=1000,
+        tabs=frozenset(naver_map.TAB_LABELS.values()),
+    )
+
+
+def test_concurrent_crawl_waits_for_home_sections_once():
+    home = FakeFrame()
+    context = FakeContext(home, {MENU_URL: FakeFrame("메뉴 본문 텍스트입니다."), INFO_URL: FakeFrame("정보 본문 텍스트입니다.")})
+
+    result, errors = _crawl(context, concurrent_tabs=True)
+
+    assert home.section_waits == 1
+    assert errors == {}
+    assert result["menu"] == "메뉴 본문 텍스트입니다."
+    assert all(page.closed for page in context.pages)
+
+
+@pytest.mark.parametrize("concurrent_tabs", [True, False])
+def test_failing_tab_is_reported_without_losing_others(concurrent_tabs):
+    context = FakeContext(FakeFrame(), {MENU_URL: FakeFrame("메뉴 본문 텍스트입니다.")}, broken={INFO_URL})
+
+    result, errors = _crawl(context, concurrent_tabs=concurrent_tabs)
+
+    assert list(errors) == ["info"]
+    assert "goto timeout" in errors["info"]
+    assert result["menu"] == "메뉴 본문 텍스트입니다."
+    assert result["home"].startswith("홈 본문")
+
+
+def test_entry_page_is_closed_when_home_extraction_fails():
+    context = FakeContext(FakeFrame(fail=True))
+
+    with pytest.raises(RuntimeError):
+        _crawl(context, concurrent_tabs=True)
+    assert context.pages and all(page.closed for page in context.pages)
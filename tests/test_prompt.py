@@ -0,0 +1,94 @@
+from dataclasses import replace
+
+from prompt import BlogInput, _render_user_facts, compact_user_facts
+from text_budget import estimate_tokens
+
+EMPTY = BlogInput(
+    map_url="https://map.naver.com/p/entry/place/1",
+    place_name="cafe",
+    business_hours="10-22",
+    location_info="station",
+    home_tab_info="",
+    menu_tab_info="",
+    info_tab_info="",
+    news_tab_info="",
+    parking_or_tips="",
+    interior_and_menu="",
+    signature_taste="",
+    tone="정보형",
+    target_keyword="cafe",
+)
+BASE_TOKENS = estimate_tokens(_render_user_facts(EMPTY))
+
+
+def _tab(name, sections=40):
+    # 섹션마다 내용이 달라 중복 제거 대상이 되지 않는 약 100토큰짜리 섹션을 만듭니다.
+    return "\n\n".join(f"{name} section {i}\n" + " ".join([f"{name}-{i}"] * 60) for i in range(sections))
+
+
+def _payload(**tabs):
+    return replace(EMPTY, **{f"{key}_tab_info": text for key, text in tabs.items()})
+
+
+def _tokens(payload, key):
+    return estimate_tokens(getattr(payload, f"{key}_tab_info"))
+
+
+def test_under_budget_returns_payload_unchanged():
+    payload = _payload(menu=_tab("menu", 2), news=_tab("news", 2))
+    compacted, report = compact_user_facts(payload, max_tokens=10_000)
+    assert compacted is payload
+    assert report.summary() == ""
+    assert report.final_tokens == report.original_tokens
+
+
+def test_trims_lowest_priority_field_first():
+    payload = _payload(menu=_tab("menu", 5), info=_tab("info", 5), home=_tab("home", 5), news=_tab("news", 5))
+    original = compact_user_facts(payload, max_tokens=10_000)[1].original_tokens
+    compacted, report = compact_user_facts(payload, max_tokens=original - 150)
+    assert not report.over_budget
+    assert list(report.trimmed_chars) == ["news_tab_info"]
+    assert compacted.menu_tab_info == payload.menu_tab_info
+    assert compacted.home_tab_info == payload.home_tab_info
+    assert report.dropped_fields == []
+
+
+def test_trims_to_floor_before_moving_to_next_field():
+    payload = _payload(menu=_tab("menu"), info=_tab("info"), home=_tab("home"), news=_tab("news"))
+    menu, info = _tokens(payload, "menu"), _tokens(payload, "info")
+    # news는 200토큰 바닥까지만 줄고, 나머지 초과분은 home에서 줄입니다.
+    compacted, report = compact_user_facts(payload, max_tokens=BASE_TOKENS + menu + info + 200 + 600)
+    assert not report.over_budget
+    assert 150 < _tokens(compacted, "news") <= 200
+    assert 200 < _tokens(compacted, "home") <= 600
+    assert compacted.menu_tab_info == payload.menu_tab_info
+    assert compacted.info_tab_info == payload.info_tab_info
+    assert report.dropped_fields == []
+
+
+def test_drops_fields_in_reverse_priority_when_floors_do_not_fit():
+    payload = _payload(menu=_tab("menu"), info=_tab("info"), home=_tab("home"), news=_tab("news"))
+    compacted, report = compact_user_facts(payload, max_tokens=BASE_TOKENS + 250)
+    assert report.dropped_fields == ["news_tab_info", "home_tab_info", "info_tab_info"]
+    assert compacted.news_tab_info == compacted.home_tab_info == compacted.info_tab_info == ""
+    assert 0 < _tokens(compacted, "menu") <= 200
+    assert list(report.trimmed_chars) == ["menu_tab_info"]
+    assert not report.over_budget
+    assert "제외: news_tab_info, home_tab_info, info_tab_info" in report.summary()
+
+
+def test_duplicate_sections_stay_in_higher_priority_field():
+    shared = "shared section\n" + " ".join(["same words"] * 40)
+    payload = _payload(menu=shared + "\n\n" + _tab("menu", 3), news=_tab("news", 3) + "\n\n" + shared)
+    original = compact_user_facts(payload, max_tokens=10_000)[1].original_tokens
+    compacted, _ = compact_user_facts(payload, max_tokens=original - 1)
+    assert "shared section" in compacted.menu_tab_info
+    assert "shared section" not in compacted.news_tab_info
+
+
+def test_user_written_fields_over_budget_are_reported_not_cut():
+    payload = replace(_payload(news=_tab("news", 3)), signature_taste="taste " * 2000)
+    compacted, report = compact_user_facts(payload, max_tokens=BASE_TOKENS)
+    assert compacted.signature_taste == payload.signature_taste
+    assert report.dropped_fields == ["news_tab_info"]
+    assert report.over_budget
@@ -0,0 +1,168 @@
+import asyncio
+
+import pytest
+
+import rate_limit
+from rate_limit import FakeRateLimitError, FakeThrottlingModel, GeminiScheduler, scheduler_session
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        # 실제로 기다리지 않고 시계만 앞으로 돌립니다.
+        self.slept.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", fake.sleep)
+    monkeypatch.setattr(rate_limit.random, "uniform", lambda low, high: high)
+    return fake
+
+
+def test_rpm_limit_waits_for_window(clock):
+    scheduler = GeminiScheduler(rpm=2, clock=clock)
+    model = FakeThrottlingModel(throttle_rate=0.0, latency=0.0)
+
+    async def run():
+        for _ in range(3):
+            await scheduler.acall(model)
+
+    asyncio.run(run())
+    assert model.calls == 3
+    # 세 번째 요청은 첫 요청이 60초 창을 벗어날 때까지 기다립니다.
+    assert clock.now == pytest.approx(60.0)
+    assert scheduler.snapshot()["requests_in_window"] == 1
+
+
+def test_tpm_limit_uses_reported_usage(clock):
+    scheduler = GeminiScheduler(tpm=100, clock=clock)
+    model = FakeThrottlingModel(throttle_rate=0.0, latency=0.0)
+
+    async def run():
+        # 추정 10토큰이지만 실제 사용량 80토큰으로 보정되면 다음 요청(추정 30)은 창이 빌 때까지 기다립니다.
+        await scheduler.acall(model, tokens=10, usage=lambda _: 80)
+        clock.now = 5.0
+        await scheduler.acall(model, tokens=30)
+
+    asyncio.run(run())
+    assert clock.now == pytest.approx(60.0)
+    assert scheduler.snapshot()["tokens_in_window"] == 30
+
+
+def test_aimd_halves_on_throttle_and_regrows(clock):
+    scheduler = GeminiScheduler(max_concurrency=8, max_retries=2, base_delay=0.5, clock=clock)
+    throttling = FakeThrottlingModel(throttle_rate=1.0, latency=0.0)
+    healthy = FakeThrottlingModel(throttle_rate=0.0, latency=0.0)
+
+    async def run():
+        with pytest.raises(FakeRateLimitError):
+            await scheduler.acall(throttling)
+        assert scheduler.concurrency_limit == 1  # 8 → 4 → 2 → 1
+        limits = []
+        for _ in range(6):
+            await scheduler.acall(healthy)
+            limits.append(scheduler.concurrency_limit)
+        return limits
+
+    # 한도만큼 연속 성공하면 1씩 늘어납니다: 1회 → 2, 그다음 2회 → 3, 그다음 3회 → 4
+    assert asyncio.run(run()) == [2, 2, 3, 3, 3, 4]
+
+
+def test_retries_with_backoff_then_fails(clock):
+    scheduler = GeminiScheduler(max_retries=3, base_delay=1.0, max_delay=3.0, clock=clock)
+    model = FakeThrottlingModel(throttle_rate=1.0, latency=0.0)
+
+    with pytest.raises(FakeRateLimitError):
+        asyncio.run(scheduler.acall(model))
+
+    assert model.calls == 4
+    assert scheduler.stats["retries"] == 3
+    assert scheduler.stats["failed"] == 1
+    assert scheduler.stats["throttled"] == 4
+    # full jitter의 상한(1, 2, 4→3초 상한)으로 고정한 백오프입니다.
+    assert [d for d in clock.slept if d >= 1.0] == [1.0, 2.0, 3.0]
+    assert scheduler.snapshot()["in_flight"] == {}
+
+
+def test_retry_recovers_after_throttle(clock):
+    scheduler = GeminiScheduler(max_retries=3, base_delay=0.5, clock=clock)
+    attempts = []
+
+    async def flaky():
+        attempts.append(clock.now)
+        if len(attempts) < 3:
+            raise FakeRateLimitError("429 RESOURCE_EXHAUSTED (fake)")
+        return "ok"
+
+    assert asyncio.run(scheduler.acall(flaky)) == "ok"
+    assert len(attempts) == 3
+    assert scheduler.stats["failed"] == 0
+
+
+def test_non_throttle_error_is_not_retried(clock):
+    scheduler = GeminiScheduler(clock=clock)
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        scheduler.call(broken)
+    assert len(calls) == 1
+    assert scheduler.stats["retries"] == 0
+
+
+def test_waiting_session_with_fewer_calls_goes_first():
+    scheduler = GeminiScheduler(max_concurrency=2, min_concurrency=2, clock=lambda: 0.0)
+
+    async def run():
+        with scheduler_session("batch"):
+            held = [await scheduler.aacquire(), await scheduler.aacquire()]
+        order = []
+
+        async def wait_for_slot(session):
+            with scheduler_session(session):
+                lease = await scheduler.aacquire()
+            order.append(session)
+            return lease
+
+        # 배치 세션이 먼저 줄을 서도, 실행 중인 요청이 적은 대화형 세션이 다음 슬롯을 받습니다.
+        batch = asyncio.ensure_future(wait_for_slot("batch"))
+        await asyncio.sleep(0)
+        chat = asyncio.ensure_future(wait_for_slot("chat"))
+        await asyncio.sleep(0)
+        scheduler.release(held.pop())
+        lease = await chat
+        assert order == ["chat"]
+        scheduler.release(lease)
+        scheduler.release(await batch)
+        scheduler.release(held.pop())
+        return order
+
+    assert asyncio.run(run()) == ["chat", "batch"]
+    assert scheduler.snapshot()["in_flight"] == {}
+
+
+@pytest.mark.parametrize("exc_type", [GeneratorExit, KeyboardInterrupt])
+def test_call_releases_slot_on_base_exception(exc_type):
+    scheduler = GeminiScheduler(max_concurrency=1, clock=lambda: 0.0)
+
+    def interrupted():
+        # 스트리밍 제너레이터가 호출 도중 닫히거나 작업이 중단된 경우입니다.
+        raise exc_type()
+
+    with pytest.raises(exc_type):
+        scheduler.call(interrupted)
+    assert scheduler.snapshot()["in_flight"] == {}
+    # 슬롯이 새지 않았으므로 동시성 1에서도 다음 호출이 바로 들어갑니다.
+    assert scheduler.call(lambda: "again") == "again"
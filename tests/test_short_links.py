@@ -0,0 +1,63 @@
+import threading
+import time
+
+from short_links import ShortLinkResolver
+
+
+class FakeClient:
+    """KeepAliveClient처럼 스레드마다 연결을 하나씩 맺는 가짜 클라이언트입니다."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def resolve(self, url, *, until=None):
+        if not getattr(self._local, "conn", False):
+            self._local.conn = True
+            with self._lock:
+                self.connections += 1
+        time.sleep(0.01)
+        if url.endswith("broken"):
+            raise ConnectionError("reset")
+        return f"https://map.naver.com/p/entry/place/{url.rsplit('/', 1)[-1]}"
+
+
+def test_resolve_many_reuses_worker_threads_and_connections():
+    client = FakeClient()
+    resolver = ShortLinkResolver(client, path=None, max_workers=2)
+    try:
+        first, errors = resolver.resolve_many([f"https://naver.me/{i}" for i in range(1, 7)])
+        assert errors == {}
+        assert first["https://naver.me/3"] == "3"
+        second, _ = resolver.resolve_many([f"https://naver.me/{i}" for i in range(7, 13)])
+        assert len(second) == 6
+        # 두 번째 일괄 해석도 같은 스레드(와 그 keep-alive 연결)를 씁니다.
+        assert client.connections == 2
+    finally:
+        resolver.close()
+
+
+def test_resolve_many_reports_errors_and_uses_cache():
+    client = FakeClient()
+    resolver = ShortLinkResolver(client, path=None, max_workers=4)
+    try:
+        resolver.resolve("https://naver.me/42")
+        resolved, errors = resolver.resolve_many(
+            ["https://naver.me/42", "https://naver.me/broken", "https://naver.me/42/"], max_workers=1
+        )
+        assert resolved == {"https://naver.me/42": "42", "https://naver.me/42/": "42"}
+        assert list(errors) == ["https://naver.me/broken"]
+        assert resolver.hits == 2
+    finally:
+        resolver.close()
+
+
+def test_close_shuts_down_pool_and_allows_reuse():
+    resolver = ShortLinkResolver(FakeClient(), path=None, max_workers=2)
+    resolver.resolve_many(["https://naver.me/1"])
+    pool = resolver._executor
+    resolver.close()
+    assert pool is not None and pool._shutdown
+    assert resolver.resolve_many(["https://naver.me/2"])[0] == {"https://naver.me/2": "2"}
+    resolver.close()
@@ -0,0 +1,61 @@
+from text_budget import _truncate, compact_text, estimate_tokens
+
+
+def test_truncate_keeps_whole_sections_then_cuts_boundary_section_by_line():
+    sections = ["가" * 10, "나나나\n다다다\n라라라"]
+
+    # 10 + 2(구분자) + "나나나\n다다다"(7) = 19
+    assert _truncate(sections, 19, None) == "가" * 10 + "\n\n나나나\n다다다"
+    assert _truncate(sections, 11, None) == "가" * 10
+    assert _truncate(sections, 9, None) == ""
+
+
+def test_truncate_token_budget_ignores_separator_whitespace():
+    sections = ["abcd efgh", "ijkl\nmnop"]
+
+    out = _truncate(sections, None, 3)
+    assert out == "abcd efgh\n\nijkl"
+    assert estimate_tokens(out) == 3
+
+
+def test_truncate_scales_linearly_with_line_count():
+    lines = [f"메뉴 {i} 4,500원" for i in range(20000)]
+    out = _truncate(["\n".join(lines)], None, 60000)
+
+    assert estimate_tokens(out) <= 60000
+    assert out.count("\n") + 1 < len(lines)
+
+
+def test_compact_text_removes_boilerplate_and_duplicate_sections():
+    text = "메뉴\n아메리카노 4,500원\n더보기\n\n메뉴\n아메리카노 4,500원\n\n\n아메리카노 4,500원\n\n주차 가능"
+
+    out, report = compact_text(text)
+    assert out == "메뉴\n아메리카노 4,500원\n\n주차 가능"
+    assert report.boilerplate_lines == 1
+    # 같은 섹션 하나, 앞 섹션에 통째로 포함된 섹션 하나
+    assert report.duplicate_sections == 2
+    assert report.truncated_chars == 0
+    assert report.removed_chars == len(text) - len(out)
+
+
+def test_compact_text_shared_seen_drops_sections_from_later_texts():
+    seen = set()
+    first, _ = compact_text("영업시간 10:00-22:00\n\n주차 가능", seen=seen)
+    second, report = compact_text("주차 가능\n\n신메뉴 출시", seen=seen)
+    assert first == "영업시간 10:00-22:00\n\n주차 가능"
+    assert second == "신메뉴 출시"
+    assert report.duplicate_sections == 1
+
+
+def test_compact_text_budgets_cut_at_section_and_line_boundaries():
+    text = "가" * 10 + "\n\n나나나\n다다다\n라라라"
+
+    out, report = compact_text(text, max_chars=19)
+    assert out == "가" * 10 + "\n\n나나나\n다다다"
+    assert report.truncated_chars == 4
+    assert report.final_chars == 19
+
+    out, _ = compact_text("abcd efgh\n\nijkl\nmnop", max_tokens=3)
+    assert out == "abcd efgh\n\nijkl"
+    # 예산 안이면 자르지 않습니다.
+    assert compact_text(text, max_chars=100)[0] == text
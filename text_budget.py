@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+# 크롤링 텍스트의 중복/상투 문구 제거와 글자수·토큰 예산 적용을 담당합니다.
+import hashlib
+import math
+import re
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+
+# 섹션 안에 단독 줄로 남는 버튼/안내 문구(정확히 일치하는 줄만 제거합니다)
+BOILERPLATE_LINES = frozenset(
+    {
+        "펼쳐보기",
+        "접기",
+        "더보기",
+        "내용 더보기",
+        "복사",
+        "길찾기",
+        "지도",
+        "공유",
+        "저장",
+        "알림받기",
+        "거리뷰",
+        "출발",
+        "도착",
+        "이전 페이지",
+        "다음 페이지",
+        "정보 수정 제안하기",
+        "메뉴판 이미지로 보기",
+        "사진 더보기",
+        "이미지 갯수",
+    }
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """LLM 입력 토큰 수를 로컬에서 대략 추정합니다.
+
+    영문/숫자/기호는 약 4자당 1토큰, 한글 등 비ASCII 문자는 약 1.5자당 1토큰으로 계산합니다.
+    정확한 값이 아니라 예산 비교용 상한에 가까운 추정치입니다.
+    """
+    return _tokens(*_char_counts(text))
+
+
+def _char_counts(text: str) -> tuple[int, int]:
+    """(공백 제외 ASCII 글자 수, 비ASCII 글자 수). 두 값 모두 문자열을 이어 붙이면 그대로 더해집니다."""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128 and not ch.isspace())
+    other_chars = sum(1 for ch in text if ord(ch) >= 128)
+    return ascii_chars, other_chars
+
+
+def _tokens(ascii_chars: int, other_chars: int) -> int:
+    return math.ceil(ascii_chars / 4 + other_chars / 1.5)
+
+
+@dataclass
+class CompactionReport:
+    original_chars: int = 0
+    final_chars: int = 0
+    duplicate_sections: int = 0
+    boilerplate_lines: int = 0
+    truncated_chars: int = 0
+
+    @property
+    def removed_chars(self) -> int:
+        return self.original_chars - self.final_chars
+
+    def as_dict(self) -> dict[str, int]:
+        return {**asdict(self), "removed_chars": self.removed_chars}
+
+
+def _section_key(section: str) -> str:
+    return hashlib.sha1(re.sub(r"\s+", " ", section).strip().encode("utf-8")).hexdigest()
+
+
+def _fits(text: str, max_chars: Optional[int], max_tokens: Optional[int]) -> bool:
+    if max_chars is not None and len(text) > max_chars:
+        return False
+    if max_tokens is not None and estimate_tokens(text) > max_tokens:
+        return False
+    return True
+
+
+def _truncate(sections: list[str], max_chars: Optional[int], max_tokens: Optional[int]) -> str:
+    """앞쪽 섹션부터 예산 안에 들어가는 만큼 유지하고, 경계 섹션은 줄 단위로 자릅니다.
+
+    남긴 글자 수와 토큰 추정용 글자 수를 누적하므로, 매 단계 전체 문자열을 다시 재지 않습니다
+    (구분자 "\n\n"/"\n"은 공백이라 토큰 추정에 더해지지 않습니다).
+    """
+    kept: list[str] = []
+    chars = ascii_chars = other_chars = 0
+
+    def fits(extra_chars: int, extra_ascii: int, extra_other: int) -> bool:
+        if max_chars is not None and chars + extra_chars > max_chars:
+            return False
+        if max_tokens is not None and _tokens(ascii_chars + extra_ascii, other_chars + extra_other) > max_tokens:
+            return False
+        return True
+
+    for section in sections:
+        separator = 2 if kept else 0
+        section_ascii, section_other = _char_counts(section)
+        if fits(separator + len(section), section_ascii, section_other):
+            kept.append(section)
+            chars += separator + len(section)
+            ascii_chars += section_ascii
+            other_chars += section_other
+            continue
+        lines: list[str] = []
+        line_chars, line_ascii, line_other = separator, 0, 0
+        for line in section.split("\n"):
+            extra = len(line) + (1 if lines else 0)
+            extra_ascii, extra_other = _char_counts(line)
+            if not fits(line_chars + extra, line_ascii + extra_ascii, line_other + extra_other):
+                break
+            lines.append(line)
+            line_chars += extra
+            line_ascii += extra_ascii
+            line_other += extra_other
+        if lines:
+            kept.append("\n".join(lines))
+        break
+    return "\n\n".join(kept)
+
+
+def compact_text(
+    text: str,
+    *,
+    max_chars: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    seen: Optional[set[str]] = None,
+) -> tuple[str, CompactionReport]:
+    """빈 줄로 구분된 섹션 텍스트를 정리합니다.
+
+    1) 단독 상투 문구 줄 제거
+    2) 내용 해시가 같은 섹션, 앞서 남긴 섹션에 통째로 포함된(중첩 `.place_section`) 섹션 제거
+    3) max_chars/max_tokens 예산 초과분을 섹션·줄 경계에서 잘라냄
+    seen(섹션 해시 집합)을 여러 호출에 넘기면 다른 텍스트에 이미 나온 섹션도 중복으로 제거합니다.
+    """
+    report = CompactionReport(original_chars=len(text))
+    seen = set() if seen is None else seen
+    sections: list[str] = []
+    for raw in re.split(r"\n\s*\n", text):
+        lines = [ln.strip() for ln in raw.split("\n") if ln.strip()]
+        kept_lines = [ln for ln in lines if ln not in BOILERPLATE_LINES]
+        report.boilerplate_lines += len(lines) - len(kept_lines)
+        section = "\n".join(kept_lines)
+        if not section:
+            continue
+        key = _section_key(section)
+        wrapped = f"\n{section}\n"
+        if key in seen or any(wrapped in f"\n{prev}\n" for prev in sections):
+            report.duplicate_sections += 1
+            continue
+        seen.add(key)
+        sections.append(section)
+
+    out = "\n\n".join(sections)
+    if not _fits(out, max_chars, max_tokens):
+        truncated = _truncate(sections, max_chars, max_tokens)
+        report.truncated_chars = len(out) - len(truncated)
+        out = truncated
+    report.final_chars = len(out)
+    return out, report
@@ -1,10 +1,19 @@
 ﻿from __future__ import annotations
 
 # Streamlit UI 구성 및 사용자 상호작용을 담당합니다.
+import hashlib
+import secrets
 import time
+from typing import Any, Callable, Optional
+
 import streamlit as st
 
-from prompt import BlogInput
+from draft_ranking import rank_drafts
+from jobs import Job, get_job_manager
+from metrics import session_summary
+from progress import ProgressLog, progress_listener
+from prompt import TONES, BlogInput
+from rate_limit import current_scheduler_session
 
 
 def apply_custom_style() -> None:
@@ -88,6 +97,31 @@ def init_session_state() -> None:
         st.session_state.crawled_info_text = ""
     if "crawled_news_text" not in st.session_state:
         st.session_state.crawled_news_text = ""
+    if "crawled_tab_errors" not in st.session_state:
+        st.session_state.crawled_tab_errors = {}
+    if "crawled_removed_chars" not in st.session_state:
+        st.session_state.crawled_removed_chars = 0
+    if "facts_compaction" not in st.session_state:
+        st.session_state.facts_compaction = ""
+    if "fused_run" not in st.session_state:
+        st.session_state.fused_run = None
+    if "fused_prompt" not in st.session_state:
+        st.session_state.fused_prompt = None
+    if "fused_applied" not in st.session_state:
+        # 원클릭 실행에서 이미 세션 상태에 반영한 단계 이름
+        st.session_state.fused_applied = []
+    if "blog_variants" not in st.session_state:
+        st.session_state.blog_variants = []
+    if "blog_variant_errors" not in st.session_state:
+        st.session_state.blog_variant_errors = {}
+    if "job_owner_token" not in st.session_state:
+        st.session_state.job_owner_token = _browser_owner_token()
+    if "jobs" not in st.session_state:
+        # 작업 종류 -> 작업 ID. 새 세션(새로고침)이면 URL에 남은 작업 ID 중 이 브라우저가 낸 작업에만 다시 붙습니다.
+        st.session_state.jobs = _jobs_from_query_params()
+    if "job_timings" not in st.session_state:
+        # 작업 종류 -> 마지막 실행의 단계별 소요 시간 요약
+        st.session_state.job_timings = {}
     if "example_place_name" not in st.session_state:
         st.session_state.example_place_name = ""
     if "example_business_hours" not in st.session_state:
@@ -104,6 +138,12 @@ def render_sidebar(total_chars: int = 0, non_space_chars: int = 0) -> tuple[floa
     st.sidebar.header("설정")
     temperature = st.sidebar.slider("창의성(temperature)", 0.0, 1.0, 0.5, 0.1)
     model = st.sidebar.text_input("Google 모델명", value="gemini-2.5-flash-lite")
+    st.sidebar.checkbox(
+        "같은 입력이면 저장된 응답 재사용",
+        value=True,
+        key="use_llm_cache",
+        help="끄면 캐시를 건너뛰고 Gemini로 다시 생성합니다.",
+    )
     st.sidebar.info("API 키는 .env 파일의 GOOGLE_API_KEY를 사용합니다.")
 
     st.sidebar.divider()
@@ -112,9 +152,44 @@ def render_sidebar(total_chars: int = 0, non_space_chars: int = 0) -> tuple[floa
     col1.metric("전체 글자수", f"{total_chars:,}")
     col2.metric("공백 제외", f"{non_space_chars:,}")
 
+    render_session_metrics()
+
     return temperature, model
 
 
+_STAGE_LABELS = {
+    "crawl.cache": "지도 수집(캐시 포함)",
+    "crawl": "지도 크롤링",
+    "prompt_builder_agent": "1단계 프롬프트",
+    "blog_writer_agent": "2단계 블로그",
+    "comment_writer_agent": "3단계 댓글",
+}
+
+
+def render_session_metrics() -> None:
+    """현재 세션의 단계별 소요 시간/토큰/도구 호출/캐시 적중 요약을 사이드바에 표시합니다."""
+    summary = session_summary()
+    with st.sidebar.expander("세션 지표", expanded=False):
+        if not summary:
+            st.caption("아직 기록된 실행이 없습니다.")
+            return
+        rows = [
+            {
+                "단계": _STAGE_LABELS.get(stage, stage),
+                "횟수": int(row["count"]),
+                "평균(ms)": row["avg_ms"],
+                "최대(ms)": row["max_ms"],
+                "입력 토큰": int(row["input_tokens"]),
+                "출력 토큰": int(row["output_tokens"]),
+                "도구 호출": int(row["tool_calls"]),
+                "캐시 적중": int(row["cache_hits"]),
+                "오류": int(row["errors"]),
+            }
+            for stage, row in summary.items()
+        ]
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+
+
 def render_form() -> tuple[BlogInput, bool]:
     left_col, right_col = st.columns(2)
 
@@ -129,6 +204,11 @@ def render_form() -> tuple[BlogInput, bool]:
         run_crawl = st.button("지도 탭 수집 실행", use_container_width=True)
         if st.session_state.crawled_place_id:
             st.caption(f"최근 수집 placeId: {st.session_state.crawled_place_id}")
+            if st.session_state.crawled_removed_chars:
+                st.caption(f"중복/불필요 텍스트 {st.session_state.crawled_removed_chars:,}자를 정리했습니다.")
+        if st.session_state.crawled_tab_errors:
+            failed = ", ".join(sorted(st.session_state.crawled_tab_errors))
+            st.warning(f"일부 탭 수집에 실패했습니다({failed}). 나머지 탭 결과는 반영되었습니다.")
 
         st.text_area(
             "홈 탭 수집 결과(읽기 전용)",
@@ -194,7 +274,7 @@ def render_form() -> tuple[BlogInput, bool]:
             )
             interior_and_menu = st.text_area("매장 내부/먹은 메뉴", height=170, key="interior_and_menu")
             signature_taste = st.text_area("특별히 맛있었던 포인트", height=170, key="signature_taste")
-            tone = st.selectbox("글의 톤", ["정보형", "경험담", "스토리텔링", "마케팅"], key="tone")
+            tone = st.selectbox("글의 톤", list(TONES), key="tone")
         st.markdown("</div>", unsafe_allow_html=True)
 
     return BlogInput(
@@ -214,30 +294,385 @@ def render_form() -> tuple[BlogInput, bool]:
     ), run_crawl
 
 
-def run_prompt_with_progress(pipeline, payload: BlogInput) -> str:
-    """1단계(프롬프트) 실행용 진행 UI"""
-    progress = st.progress(0)
-    with st.spinner("1단계 Prompt Builder Agent 실행 중..."):
-        result = pipeline.build_user_prompt(payload)
-        progress.progress(100)
-    return result
-
-
-def run_blog_with_progress(pipeline, user_prompt: str) -> str:
-    """2단계(블로그) 실행용 진행 UI"""
-    progress = st.progress(0)
-    with st.spinner("2단계 Blog Writer Agent 실행 중..."):
-        result = pipeline.write_blog(user_prompt)
-        progress.progress(100)
-    return result
-
-
-def run_comments_with_progress(pipeline, blog_markdown: str) -> str:
-    """3단계(댓글) 별도 실행용 진행 UI"""
-    progress = st.progress(0)
-    with st.spinner("3단계 Comment Agent 실행 중..."):
-        time.sleep(0.3)
-        progress.progress(35)
-        comments = pipeline.write_comments(blog_markdown)
-        progress.progress(100)
-    return comments
+# ---- 백그라운드 작업(jobs) ---------------------------------------------------------
+
+JOB_LABELS = {
+    "crawl": "네이버 지도 정보 수집",
+    "prompt": "1단계 Prompt Builder Agent",
+    "blog": "2단계 Blog Writer Agent",
+    "comments": "3단계 Comment Agent",
+    "variants": "2단계 톤별 비교 생성",
+}
+_TIMING_LABELS = {**JOB_LABELS, "fused": "원클릭 실행"}
+# 스트리밍 진행률 추정용 기대 글자수(프롬프트 약 1000자, 본문 약 2000자, 댓글 5개 약 300자)
+_EXPECTED_CHARS = {"prompt": 1000, "blog": 2000, "comments": 300}
+# 크롤링 진행률은 끝난 탭 수(홈/메뉴/정보/소식)로 계산합니다.
+_CRAWL_TABS = 4
+# 진행 이벤트의 단계/Agent 이름 -> 화면 표시 이름(크롤링 단계는 "{탭}_{단계}" 형식)
+_TAB_NAMES = {"home": "홈", "menu": "메뉴", "info": "정보", "news": "소식"}
+_TAB_PHASES = {"load": "탭 로딩", "sections": "섹션 대기", "hours": "영업시간 펼침"}
+_PROGRESS_LABELS = {
+    **_STAGE_LABELS,
+    "http_fetch": "HTTP 수집",
+    "entry_load": "지도 페이지 로딩",
+    "place_frame": "장소 패널 대기",
+    **{
+        f"{tab}_{phase}": f"{tab_name} {phase_name}"
+        for tab, tab_name in _TAB_NAMES.items()
+        for phase, phase_name in _TAB_PHASES.items()
+    },
+}
+
+
+# Streamlit이 브라우저마다 심는 XSRF 쿠키. URL과 달리 링크를 공유해도 따라가지 않습니다.
+_BROWSER_COOKIE = "_streamlit_xsrf"
+
+
+def _xsrf_secret(cookie: str) -> bytes:
+    """XSRF 쿠키에서 브라우저마다 고정된 토큰 바이트를 꺼냅니다. 형식을 모르면 b""를 반환합니다.
+
+    v2 쿠키(2|mask|masked_token|timestamp)는 응답마다 mask가 바뀌므로 mask를 벗긴 값을 써야 새로고침 뒤에도 같습니다.
+    """
+    value = cookie.strip("\"'")
+    try:
+        if value.startswith("2|"):
+            _, mask_hex, masked_hex, _ = value.split("|")
+            mask, masked = bytes.fromhex(mask_hex), bytes.fromhex(masked_hex)
+            return bytes(b ^ mask[i % len(mask)] for i, b in enumerate(masked)) if mask else b""
+        return bytes.fromhex(value)
+    except ValueError:
+        return b""
+
+
+def _browser_owner_token() -> str:
+    """작업 소유자 토큰을 만듭니다. 새로고침해도 같은 브라우저면 같은 값이 나오도록 XSRF 토큰의 해시를 씁니다.
+
+    쿠키가 없으면(XSRF 보호 꺼짐) 세션마다 새 토큰을 쓰므로, 새로고침 뒤에는 작업에 다시 붙지 않습니다.
+    """
+    secret = _xsrf_secret(st.context.cookies.get(_BROWSER_COOKIE, "") or "")
+    if secret:
+        return hashlib.sha256(b"jobs:" + secret).hexdigest()
+    return secrets.token_hex(16)
+
+
+def _jobs_from_query_params() -> dict[str, str]:
+    """URL의 ?jobs=kind:id,... 에서 작업 ID를 읽습니다. 새로고침으로 세션이 바뀌어도 작업에 다시 붙기 위함입니다.
+
+    URL은 공유될 수 있으므로 소유자 토큰이 같은 작업만 받고, 다른 브라우저가 낸 작업 ID는 버립니다.
+    """
+    jobs: dict[str, str] = {}
+    manager = get_job_manager()
+    for item in st.query_params.get("jobs", "").split(","):
+        kind, _, job_id = item.partition(":")
+        if kind not in JOB_LABELS or not job_id:
+            continue
+        job = manager.get(job_id, owner_token=st.session_state.job_owner_token)
+        if job is not None and job.kind == kind:
+            jobs[kind] = job_id
+    return jobs
+
+
+def _sync_job_query_params() -> None:
+    value = ",".join(f"{kind}:{job_id}" for kind, job_id in st.session_state.jobs.items())
+    if value:
+        st.query_params["jobs"] = value
+    elif "jobs" in st.query_params:
+        del st.query_params["jobs"]
+
+
+def active_job(kind: str) -> Optional[Job]:
+    job_id = st.session_state.jobs.get(kind)
+    if job_id is None:
+        return None
+    job = get_job_manager().get(job_id, owner_token=st.session_state.job_owner_token)
+    if job is None:
+        # 서버 재시작 또는 보관 기간이 지나 사라진 작업입니다.
+        finish_job(kind)
+    return job
+
+
+def finish_job(kind: str) -> None:
+    st.session_state.jobs.pop(kind, None)
+    _sync_job_query_params()
+
+
+def _with_progress(fn: Callable[[Job], Any]) -> Callable[[Job], Any]:
+    """작업 안에서 나온 진행 이벤트(크롤링 단계/탭, Agent 단계/도구 호출/글자수)를 job의 progress에 모읍니다."""
+
+    def run(job: Job) -> Any:
+        log = ProgressLog()
+        job.update(progress=log)
+        with progress_listener(log):
+            return fn(job)
+
+    return run
+
+
+def submit_job(kind: str, fn: Callable[[Job], Any]) -> Job:
+    """작업을 백그라운드로 제출하고 세션(과 URL)에 ID를 남깁니다. 같은 종류의 이전 작업은 취소합니다."""
+    previous = active_job(kind)
+    if previous is not None:
+        previous.cancel()
+    job = get_job_manager().submit(
+        kind, _with_progress(fn), owner=current_scheduler_session(), owner_token=st.session_state.job_owner_token
+    )
+    st.session_state.jobs[kind] = job.id
+    _sync_job_query_params()
+    return job
+
+
+def _stream_into(job: Job, chunks) -> str:
+    """텍스트 조각을 job의 부분 결과(text)에 이어 붙이며, 조각마다 취소 요청을 확인합니다.
+
+    결과는 스트림이 반환한 최종 답변(마지막 AI 메시지)입니다.
+    """
+    while True:
+        job.check_cancelled()
+        try:
+            chunk = next(chunks)
+        except StopIteration as stop:
+            return stop.value if stop.value is not None else job.get_partial("text", "")
+        job.append("text", chunk)
+
+
+def start_prompt_job(pipeline, payload: BlogInput, *, use_cache: bool = True) -> Job:
+    """1단계(프롬프트)를 백그라운드로 실행합니다.
+
+    파이프라인이 입력 예산에 맞춰 수집 정보를 줄인 내역은 job의 facts_compaction에 남습니다.
+    """
+    st.session_state.facts_compaction = ""
+
+    def work(job: Job) -> str:
+        chunks = pipeline.stream_user_prompt(
+            payload, use_cache=use_cache, on_facts=lambda report: job.update(facts_compaction=report.summary())
+        )
+        return _stream_into(job, chunks)
+
+    return submit_job("prompt", work)
+
+
+def start_blog_job(pipeline, user_prompt: str, *, use_cache: bool = True) -> Job:
+    """2단계(블로그)를 백그라운드로 실행합니다. 생성 중인 본문은 부분 결과로 볼 수 있습니다."""
+    return submit_job("blog", lambda job: _stream_into(job, pipeline.stream_blog(user_prompt, use_cache=use_cache)))
+
+
+def start_comments_job(pipeline, blog_markdown: str, *, use_cache: bool = True) -> Job:
+    """3단계(댓글)를 백그라운드로 실행합니다."""
+    return submit_job(
+        "comments", lambda job: _stream_into(job, pipeline.stream_comments(blog_markdown, use_cache=use_cache))
+    )
+
+
+def start_variants_job(
+    pipeline, user_prompt: str, tones: list[str], *, target_keyword: str = "", use_cache: bool = True
+) -> Job:
+    """2단계를 톤별로 동시에 실행하고 로컬 채점 순위를 매기는 작업을 제출합니다."""
+
+    def work(job: Job) -> tuple[list[dict[str, Any]], dict[str, str]]:
+        job.update(expected_chars=_EXPECTED_CHARS["blog"] * len(tones))
+        job.check_cancelled()
+        drafts, errors = pipeline.write_blog_variants(
+            user_prompt, tones, use_cache=use_cache, check_cancelled=job.check_cancelled
+        )
+        job.check_cancelled()
+        variants = [
+            {"score": score, "text": drafts[score.tone]}
+            for score in rank_drafts(drafts, target_keyword=target_keyword)
+        ]
+        return variants, errors
+
+    return submit_job("variants", work)
+
+
+def finished_jobs() -> dict[str, Job]:
+    """이 세션의 작업 중 끝난 것을 세션에서 떼어 내 반환합니다. 위젯을 그리기 전에 결과를 반영할 때 씁니다."""
+    finished: dict[str, Job] = {}
+    for kind in list(st.session_state.jobs):
+        job = active_job(kind)
+        if job is not None and job.done:
+            finished[kind] = job
+            finish_job(kind)
+            log = job.get_partial("progress")
+            if job.status == "done" and log is not None:
+                st.session_state.job_timings[kind] = log.summary(_PROGRESS_LABELS, total_seconds=job.elapsed())
+    return finished
+
+
+def render_job_timings() -> None:
+    """마지막으로 끝난 실행들이 어느 단계에 시간을 썼는지 보여줍니다."""
+    timings = st.session_state.job_timings
+    if not timings:
+        return
+    with st.expander("최근 실행 소요 시간", expanded=False):
+        for kind, summary in timings.items():
+            st.caption(f"{_TIMING_LABELS.get(kind, kind)}: {summary}")
+
+
+def render_job_status() -> dict[str, Any]:
+    """진행 중인 작업마다 진행률 막대와 취소 버튼을 그리고 {작업 종류: 진행률 막대}를 반환합니다."""
+    bars: dict[str, Any] = {}
+    for kind, label in JOB_LABELS.items():
+        job = active_job(kind)
+        if job is None:
+            continue
+        bar_col, cancel_col = st.columns([5, 1])
+        if cancel_col.button("취소", key=f"cancel_{job.id}", use_container_width=True):
+            job.cancel()
+        bars[kind] = bar_col.progress(0, text=f"{label} 실행 중...")
+    return bars
+
+
+def _job_percent(kind: str, job: Job, log: Optional[ProgressLog]) -> int:
+    """진행 이벤트로 진행률을 계산합니다. 끝나기 전에는 95%를 넘기지 않습니다."""
+    if log is None:
+        return 0
+    if kind == "crawl":
+        return min(95, int((len(log.tabs_done) + len(log.tabs_failed)) * 100 / _CRAWL_TABS))
+    expected = job.get_partial("expected_chars") or _EXPECTED_CHARS.get(kind)
+    return min(95, int(log.chars * 100 / expected)) if expected else 0
+
+
+def _fused_has_news(fused) -> bool:
+    return fused.done or any(
+        stage not in st.session_state.fused_applied and fused.result(stage) is not None for stage in fused.STAGES
+    )
+
+
+def wait_for_jobs(bars: dict[str, Any], placeholders: dict[str, Any], fused_bar: Any = None) -> bool:
+    """진행 중인 작업을 짧게 폴링하며 부분 결과와 진행 이벤트 기반 진행률을 그립니다. 하나라도 끝나면 True를 반환합니다.
+
+    fused_bar(render_fused_status의 반환값)를 주면 원클릭 실행도 함께 기다리며, 새 단계 결과가 나오면 True입니다.
+    위젯 조작으로 스크립트가 재실행되면 이 대기만 끊기고 작업은 계속되므로, 다음 실행에서 다시 붙습니다.
+    """
+    fused = st.session_state.fused_run if fused_bar is not None else None
+    while bars or fused is not None:
+        if fused is not None:
+            if _fused_has_news(fused):
+                return True
+            fused_bar.progress(_fused_percent(), text=_fused_status_text(fused))
+        for kind, bar in bars.items():
+            job = active_job(kind)
+            if job is None or job.done:
+                return True
+            text = job.get_partial("text", "")
+            if text and kind in placeholders:
+                placeholders[kind].markdown(text)
+            log = job.get_partial("progress")
+            status = log.status(_PROGRESS_LABELS) if log is not None else ""
+            bar.progress(
+                _job_percent(kind, job, log),
+                text=f"{JOB_LABELS[kind]} 실행 중... {job.elapsed():.0f}초" + (f" · {status}" if status else ""),
+            )
+        time.sleep(0.25)
+    return False
+
+
+# ---- 원클릭 실행(FusedRun) -------------------------------------------------------
+
+_FUSED_STAGE_LABELS = {
+    "user_prompt": "1단계 Prompt Builder Agent",
+    "blog_markdown": "2단계 Blog Writer Agent",
+    "comments": "3단계 Comment Agent",
+}
+
+
+def start_fused(fused) -> None:
+    """새 원클릭 실행을 세션에 붙입니다. 진행 중이던 이전 실행은 취소합니다."""
+    previous = st.session_state.fused_run
+    if previous is not None:
+        previous.cancel()
+    st.session_state.fused_run = fused
+    st.session_state.fused_prompt = None
+    st.session_state.fused_applied = []
+
+
+def clear_fused() -> None:
+    st.session_state.fused_run = None
+    st.session_state.fused_prompt = None
+    st.session_state.fused_applied = []
+
+
+def apply_fused_results() -> None:
+    """원클릭 실행의 끝난 단계 결과를 세션 상태에 반영합니다. 결과가 위젯 값이므로 위젯을 그리기 전에 호출합니다.
+
+    1단계 프롬프트는 나오는 즉시 편집 영역에 채우므로, 2/3단계가 진행되는 동안 보고 고칠 수 있습니다.
+    실행이 끝나면 세션에서 떼어 냅니다.
+    """
+    fused = st.session_state.fused_run
+    if fused is None:
+        return
+    # 결과를 확인한 뒤에 끝났는지 보면 그 사이에 나온 마지막 단계를 놓칠 수 있으므로 먼저 읽어 둡니다.
+    done = fused.done
+    applied = st.session_state.fused_applied
+    for stage in fused.STAGES:
+        text = fused.result(stage)
+        if text is None or stage in applied:
+            continue
+        applied.append(stage)
+        if stage == "user_prompt":
+            st.session_state.user_prompt = text
+            st.session_state.editable_user_prompt = text
+            st.session_state.fused_prompt = text
+        elif stage == "blog_markdown":
+            st.session_state.blog_markdown = text
+            st.session_state.comments = ""
+        elif stage == "comments":
+            st.session_state.comments = text
+    if not done:
+        return
+    if fused.cancelled:
+        st.info("원클릭 실행을 취소했습니다.")
+    elif fused.error:
+        st.error(f"원클릭 실행 중 오류가 발생했습니다: {fused.error}")
+    else:
+        st.session_state.job_timings["fused"] = fused.progress.summary(_PROGRESS_LABELS)
+    clear_fused()
+
+
+def _fused_percent() -> int:
+    return int(len(st.session_state.fused_applied) * 100 / len(_FUSED_STAGE_LABELS))
+
+
+def _fused_status_text(fused) -> str:
+    stage = next((s for s in fused.STAGES if s not in st.session_state.fused_applied), fused.STAGES[-1])
+    status = fused.progress.status(_PROGRESS_LABELS)
+    return f"원클릭 실행: {_FUSED_STAGE_LABELS[stage]} 실행 중..." + (f" · {status}" if status else "")
+
+
+def render_fused_status() -> Any:
+    """진행 중인 원클릭 실행의 진행률 막대와 취소 버튼을 그리고 막대를 반환합니다(실행이 없으면 None)."""
+    fused = st.session_state.fused_run
+    if fused is None:
+        return None
+    bar_col, cancel_col = st.columns([5, 1])
+    if cancel_col.button("취소", key="cancel_fused", use_container_width=True):
+        fused.cancel()
+    return bar_col.progress(_fused_percent(), text=_fused_status_text(fused))
+
+
+def render_blog_variants() -> None:
+    """톤별 초안을 점수 순으로 나란히 보여주고, 고른 초안을 2단계 결과로 채택합니다."""
+    variants = st.session_state.blog_variants
+    for tone, error in st.session_state.blog_variant_errors.items():
+        st.warning(f"{tone} 초안 생성 실패: {error}")
+    if not variants:
+        return
+    st.subheader("톤별 초안 비교")
+    for col, (rank, variant) in zip(st.columns(len(variants)), enumerate(variants, start=1)):
+        score = variant["score"]
+        with col:
+            st.metric(f"{rank}위 · {score.tone}", f"{score.total:.1f}점")
+            st.caption(
+                f"{score.chars:,}자(공백 제외 {score.non_space_chars:,}자) · "
+                f"분량 {score.length_score:.2f} / 키워드 {score.keyword_score:.2f} / 구조 {score.structure_score:.2f}"
+            )
+            if score.issues:
+                st.caption("점검: " + ", ".join(score.issues))
+            if st.button("이 초안 사용", key=f"use_variant_{score.tone}", use_container_width=True):
+                st.session_state.blog_markdown = variant["text"]
+                st.session_state.comments = ""
+                st.session_state.blog_variants = []
+                st.session_state.blog_variant_errors = {}
+                st.rerun()
+            with st.container(height=480):
+                st.markdown(variant["text"])